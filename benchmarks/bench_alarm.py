@@ -0,0 +1,91 @@
+"""Eşik indeksli alarm motorunu her tick'te tüm kuralları tarayan yaklaşımla karşılaştırır
+
+Kullanım: python -m benchmarks.bench_alarm --kural 5000 --sembol 300 --tick 50000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from borsa_alarm import TUM_SEMBOLLER, AlarmMotoru
+
+_KOSULLAR = {">": float.__gt__, ">=": float.__ge__, "<": float.__lt__, "<=": float.__le__}
+
+
+def kurallar_uret(rng, kural_sayisi, semboller):
+    ops = (">", ">=", "<", "<=", "crosses above", "crosses below")
+    kurallar = []
+    for i in range(kural_sayisi):
+        if i % 10 == 0:
+            kurallar.append(f"change_percent {rng.choice(ops)} {rng.uniform(-5, 5):.2f}")
+        else:
+            kurallar.append(f"{rng.choice(semboller)} price {rng.choice(ops)} {rng.uniform(80, 120):.2f}")
+    return kurallar
+
+
+def ticklar_uret(rng, tick_sayisi, semboller):
+    fiyatlar = {s: 100.0 for s in semboller}
+    zaman = datetime(2026, 1, 1, 10)
+    for _ in range(tick_sayisi):
+        sembol = rng.choice(semboller)
+        fiyatlar[sembol] *= 1 + rng.gauss(0, 0.01)
+        zaman += timedelta(milliseconds=10)
+        yield {'sembol': sembol, 'zaman': zaman, 'fiyat': fiyatlar[sembol],
+               'değişim': (fiyatlar[sembol] / 100 - 1) * 100, 'hacim': None}
+
+
+def tarayarak(kurallar, ticklar):
+    """Her tick'te tüm kuralları dolaşan referans uygulama; tetik sayısını döndürür"""
+    onceki = {}
+    tetik = 0
+    for tick in ticklar:
+        degerler = {"fiyat": tick['fiyat'], "degisim": tick['değişim']}
+        for kural in kurallar:
+            if kural.sembol not in (tick['sembol'], TUM_SEMBOLLER):
+                continue
+            yeni = degerler[kural.alan]
+            eski = onceki.get((tick['sembol'], kural.alan))
+            kosul = _KOSULLAR[kural.op]
+            if eski is None:
+                tetik += not kural.kesisim and kosul(yeni, kural.esik)
+            elif eski != yeni:
+                tetik += kosul(yeni, kural.esik) and not kosul(eski, kural.esik)
+        for alan, deger in degerler.items():
+            onceki[(tick['sembol'], alan)] = deger
+    return tetik
+
+
+def main():
+    ayrac = argparse.ArgumentParser()
+    ayrac.add_argument("--kural", type=int, default=5000)
+    ayrac.add_argument("--sembol", type=int, default=300)
+    ayrac.add_argument("--tick", type=int, default=50000)
+    ayrac.add_argument("--tarama-tick", type=int, default=2000, help="Tarama yaklaşımında ölçülecek tick sayısı")
+    ayrac.add_argument("--tohum", type=int, default=0)
+    args = ayrac.parse_args()
+
+    rng = random.Random(args.tohum)
+    semboller = [f"SMB{i:03d}.IS" for i in range(args.sembol)]
+    motor = AlarmMotoru(kurallar_uret(rng, args.kural, semboller), tekrar_suresi=0)
+    ticklar = list(ticklar_uret(rng, args.tick, semboller))
+
+    baslangic = time.perf_counter()
+    for tick in ticklar:
+        motor(tick)
+    indeksli = time.perf_counter() - baslangic
+
+    tarama_ticklari = ticklar[:args.tarama_tick]
+    baslangic = time.perf_counter()
+    tarayarak(motor.kurallar(), tarama_ticklari)
+    tarama = time.perf_counter() - baslangic
+
+    ist = motor.istatistik()
+    print(f"{ist['kural']} kural, {args.sembol} sembol")
+    print(f"İndeksli: {len(ticklar) / indeksli:,.0f} tick/sn ({indeksli / len(ticklar) * 1e6:.1f} µs/tick, "
+          f"{ist['tetik']} alarm)")
+    print(f"Tarama  : {len(tarama_ticklari) / tarama:,.0f} tick/sn ({tarama / len(tarama_ticklari) * 1e6:.1f} µs/tick)")
+    print(f"Hızlanma: {(tarama / len(tarama_ticklari)) / (indeksli / len(ticklar)):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Vektörel geri test taramasını sentetik bir evrende ölçer ve bar döngülü referansla karşılaştırır
+
+Kullanım: python -m benchmarks.bench_backtest --sembol 100 --yil 5 [--isci 4]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from borsa_backtest import GeriTestMotoru, parametre_izgarasi
+
+HIZLI = [5, 10, 15, 20, 25, 30, 40, 50, 60, 80]
+YAVAS = [50, 100, 150, 200, 250]
+
+
+def veriler_uret(rng, sembol_sayisi, gun):
+    tarihler = pd.bdate_range(end="2026-01-30", periods=gun)
+    return {
+        f"SMB{i:03d}.IS": pd.DataFrame(
+            {"Close": 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, gun)))}, index=tarihler
+        )
+        for i in range(sembol_sayisi)
+    }
+
+
+def dongu_ile(kapanis, hizli, yavas, maliyet):
+    """Referans: her sembolü bar bar yürüten MA kesişimi; portföy toplam getirisini döndürür"""
+    getiriler = []
+    for j in range(kapanis.shape[1]):
+        seri = kapanis[:, j]
+        pozisyon, sermaye = 0, 1.0
+        for t in range(1, len(seri)):
+            if t >= yavas:
+                sermaye *= 1 + pozisyon * (seri[t] / seri[t - 1] - 1)
+                yeni = int(seri[t - hizli + 1:t + 1].mean() > seri[t - yavas + 1:t + 1].mean())
+                if yeni != pozisyon:
+                    sermaye *= 1 - maliyet
+                    pozisyon = yeni
+        getiriler.append(sermaye - 1)
+    return getiriler
+
+
+def main():
+    ayrac = argparse.ArgumentParser()
+    ayrac.add_argument("--sembol", type=int, default=100)
+    ayrac.add_argument("--yil", type=int, default=5)
+    ayrac.add_argument("--isci", type=int, help="Süreç sayısı (varsayılan: CPU sayısı)")
+    ayrac.add_argument("--tohum", type=int, default=0)
+    args = ayrac.parse_args()
+
+    veriler = veriler_uret(np.random.default_rng(args.tohum), args.sembol, args.yil * 252)
+    motor = GeriTestMotoru(veriler.get, list(veriler), endeks=None)
+    izgara = parametre_izgarasi("MA", {"hizli": HIZLI, "yavas": YAVAS})
+
+    baslangic = time.perf_counter()
+    seri = motor.tarama("MA", izgara, isci=1)
+    seri_sure = time.perf_counter() - baslangic
+    baslangic = time.perf_counter()
+    havuz = motor.tarama("MA", izgara, isci=args.isci)
+    havuz_sure = time.perf_counter() - baslangic
+    anahtar = ["hizli", "yavas"]
+    assert np.allclose(seri.sort_values(anahtar)["sharpe"], havuz.sort_values(anahtar)["sharpe"])
+
+    # Döngü tek parametre seti için ölçülür, tüm ızgaraya oranlanır
+    baslangic = time.perf_counter()
+    dongu_ile(motor.gostergeler.kapanis, 20, 50, motor.maliyet)
+    dongu_sure = (time.perf_counter() - baslangic) * len(izgara)
+
+    print(f"{args.sembol} sembol × {args.yil} yıl × {len(izgara)} parametre seti")
+    print(f"Vektörel, tek süreç : {seri_sure:.2f} s")
+    print(f"Vektörel, süreç havuzu: {havuz_sure:.2f} s")
+    print(f"Bar döngüsü (tahmini): {dongu_sure:.1f} s ({dongu_sure / min(seri_sure, havuz_sure):.0f}x)")
+    en_iyi = havuz.iloc[0]
+    print(f"En iyi: hizli={en_iyi['hizli']:.0f} yavas={en_iyi['yavas']:.0f} sharpe={en_iyi['sharpe']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
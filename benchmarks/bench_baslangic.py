@@ -0,0 +1,82 @@
+"""Uygulama modüllerinin içe aktarma süresini ve önbellekli `quote` komutunun uçtan uca süresini ölçer
+
+Her ölçüm ayrı bir Python süreciyle yapılır; `-X importtime` çıktısından en pahalı modüller raporlanır.
+
+Kullanım: python -m benchmarks.bench_baslangic --tekrar 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UYGULAMA = os.path.join(KOK, "borsa_takip_projesi_database_ile.py")
+MODULLER = ("borsa_takip_projesi_database_ile", "borsa_projesi")
+AGIR_MODULLER = ("pandas", "numpy", "matplotlib", "yfinance", "mysql")
+
+
+def _ortam(onbellek_dosyasi):
+    ortam = dict(os.environ)
+    ortam["BORSA_SAGLAYICI"] = "sentetik"
+    ortam["BORSA_ONBELLEK"] = onbellek_dosyasi
+    ortam["PYTHONPATH"] = KOK + os.pathsep + ortam.get("PYTHONPATH", "")
+    return ortam
+
+
+def ice_aktarma_suresi(modul, ortam):
+    """(toplam_saniye, [(kumulatif_us, modul), ...]) — `-X importtime` çıktısından"""
+    sonuc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modul}"],
+        cwd=KOK, env=ortam, capture_output=True, text=True, check=True,
+    )
+    satirlar = []
+    for satir in sonuc.stderr.splitlines():
+        if not satir.startswith("import time:") or "cumulative" in satir:
+            continue
+        _, kumulatif, ad = (p.strip() for p in satir[len("import time:"):].split("|"))
+        satirlar.append((int(kumulatif), ad))
+    toplam = next(k for k, ad in satirlar if ad == modul) / 1e6
+    return toplam, sorted(satirlar, reverse=True)
+
+
+def komut_suresi(arguman, ortam, tekrar):
+    sureler = []
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        subprocess.run([sys.executable, UYGULAMA] + arguman, cwd=KOK, env=ortam,
+                       stdout=subprocess.DEVNULL, check=True)
+        sureler.append(time.perf_counter() - baslangic)
+    return sureler
+
+
+def main():
+    ayrac = argparse.ArgumentParser()
+    ayrac.add_argument("--tekrar", type=int, default=10)
+    ayrac.add_argument("--ilk", type=int, default=8, help="Her modül için gösterilecek en pahalı içe aktarma sayısı")
+    args = ayrac.parse_args()
+
+    with tempfile.TemporaryDirectory() as dizin:
+        ortam = _ortam(os.path.join(dizin, "bilgi_onbellegi.json"))
+
+        for modul in MODULLER:
+            toplam, satirlar = ice_aktarma_suresi(modul, ortam)
+            agir = sorted({ad.strip().split(".")[0] for _, ad in satirlar} & set(AGIR_MODULLER))
+            print(f"import {modul}: {toplam * 1000:.1f} ms, ağır modüller: {', '.join(agir) or 'yok'}")
+            for kumulatif, ad in satirlar[:args.ilk]:
+                print(f"    {kumulatif / 1000:8.1f} ms  {ad.strip()}")
+
+        semboller = ["THYAO.IS", "GARAN.IS", "AKBNK.IS"]
+        # İlk çağrı önbellek dosyasını doldurur, sonrakiler yalnızca diskten okur
+        soguk = komut_suresi(["quote", "--json"] + semboller, ortam, 1)[0]
+        sicak = komut_suresi(["quote", "--json"] + semboller, ortam, args.tekrar)
+        print(f"\nquote ({len(semboller)} sembol, sentetik sağlayıcı)")
+        print(f"Soğuk önbellek : {soguk * 1000:.0f} ms")
+        print(f"Sıcak önbellek : p50 {statistics.median(sicak) * 1000:.0f} ms, "
+              f"en kötü {max(sicak) * 1000:.0f} ms ({args.tekrar} çalıştırma)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""1 yıllık, 100 sembollük fiyat taramasını gömülü depo ile MySQL yolunda karşılaştırır
+
+Kullanım: python -m benchmarks.bench_depolama --sembol 100 --bar 252 [--mysql]
+MySQL ayarları uygulamadaki MYSQL_* ortam değişkenlerinden okunur.
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from borsa_depolama import GomuluDepo, MySQLDepo
+
+
+def sentetik_gunluk(bar, tohum):
+    index = pd.bdate_range(end=datetime.now().date(), periods=bar, tz="Europe/Istanbul")
+    rng = np.random.default_rng(tohum)
+    kapanis = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bar)))
+    return pd.DataFrame(
+        {
+            "Open": kapanis * (1 + rng.normal(0, 0.005, bar)),
+            "High": kapanis * 1.01,
+            "Low": kapanis * 0.99,
+            "Close": kapanis,
+            "Volume": rng.integers(10_000, 5_000_000, bar).astype(float),
+        },
+        index=index,
+    )
+
+
+def tara(depo, semboller, start, sutunlar):
+    baslangic = time.perf_counter()
+    satir = 0
+    for sembol in semboller:
+        satir += len(depo.fiyat_oku(sembol, start=start, sutunlar=sutunlar))
+    return time.perf_counter() - baslangic, satir
+
+
+def olc(ad, depo, semboller, veriler, start):
+    baslangic = time.perf_counter()
+    for sembol, df in zip(semboller, veriler):
+        depo.fiyat_kaydet(sembol, df)
+    yazma = time.perf_counter() - baslangic
+    print(f"[{ad}] yazma: {yazma:.2f} s")
+    for sutunlar, etiket in ((["Close"], "yalnız Close"), (None, "tüm OHLCV")):
+        sure, satir = tara(depo, semboller, start, sutunlar)
+        print(f"[{ad}] tarama ({etiket}): {sure * 1000:.0f} ms, {satir} satır, {satir / sure:,.0f} satır/s")
+
+
+def main():
+    ayrac = argparse.ArgumentParser()
+    ayrac.add_argument("--sembol", type=int, default=100)
+    ayrac.add_argument("--bar", type=int, default=252)
+    ayrac.add_argument("--mysql", action="store_true", help="MySQL yolunu da ölç (sunucu gerekir)")
+    args = ayrac.parse_args()
+
+    semboller = [f"BENCH{i:03d}.IS" for i in range(args.sembol)]
+    veriler = [sentetik_gunluk(args.bar, i) for i in range(args.sembol)]
+    start = datetime.now() - timedelta(days=366)
+
+    with tempfile.TemporaryDirectory() as dizin:
+        depo = GomuluDepo(dizin)
+        olc("gömülü", depo, semboller, veriler, start)
+        depo.kapat()
+
+    if args.mysql:
+        depo = MySQLDepo()
+        olc("mysql", depo, semboller, veriler, start)
+        depo.kapat()
+
+
+if __name__ == "__main__":
+    main()
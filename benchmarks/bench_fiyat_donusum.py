@@ -0,0 +1,81 @@
+"""_save_price_history için DataFrame -> satır dönüşümünü ölçer (eski iterrows ve sütun bazlı yol)
+
+Kullanım: python -m benchmarks.bench_fiyat_donusum --boyutlar 10000 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from borsa_donusum import fiyat_kayitlari, parcala
+
+
+def sentetik_ohlcv(satir, baslangic="2015-01-01", siklik="min"):
+    index = pd.date_range(baslangic, periods=satir, freq=siklik, tz="Europe/Istanbul")
+    rng = np.random.default_rng(42)
+    kapanis = 100 + rng.standard_normal(satir).cumsum()
+    return pd.DataFrame(
+        {
+            "Open": kapanis + rng.standard_normal(satir) * 0.1,
+            "High": kapanis + 0.5,
+            "Low": kapanis - 0.5,
+            "Close": kapanis,
+            "Volume": rng.integers(1_000, 1_000_000, satir).astype(float),
+        },
+        index=index,
+    )
+
+
+def eski_donusum(symbol_code, df):
+    # user-004 öncesindeki _save_price_history döngüsü
+    records = []
+    for ts, row in df.iterrows():
+        ts_naive = ts.tz_localize(None) if getattr(ts, 'tzinfo', None) else ts
+        records.append(
+            (
+                symbol_code,
+                ts_naive.to_pydatetime() if hasattr(ts_naive, 'to_pydatetime') else ts_naive,
+                float(row.get('Open', None)) if 'Open' in df.columns else None,
+                float(row.get('High', None)) if 'High' in df.columns else None,
+                float(row.get('Low', None)) if 'Low' in df.columns else None,
+                float(row.get('Close', None)) if 'Close' in df.columns else None,
+                float(row.get('Volume', None)) if 'Volume' in df.columns else None,
+            )
+        )
+    return records
+
+
+def yeni_donusum(symbol_code, df):
+    satir = 0
+    for parca in parcala(fiyat_kayitlari(symbol_code, df)):
+        satir += len(parca)
+    return satir
+
+
+def olc(fonksiyon, df):
+    baslangic = time.perf_counter()
+    fonksiyon("BENCH.IS", df)
+    return len(df) / (time.perf_counter() - baslangic)
+
+
+def main():
+    ayrac = argparse.ArgumentParser()
+    ayrac.add_argument("--boyutlar", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ayrac.add_argument("--eski-siniri", type=int, default=1_000_000,
+                       help="Bu satır sayısından büyük çerçevelerde eski yol atlanır")
+    args = ayrac.parse_args()
+
+    print(f"{'satır':>10} {'eski satır/s':>14} {'yeni satır/s':>14} {'hızlanma':>9}")
+    for satir in args.boyutlar:
+        df = sentetik_ohlcv(satir)
+        yeni = olc(yeni_donusum, df)
+        if satir <= args.eski_siniri:
+            eski = olc(eski_donusum, df)
+            print(f"{satir:>10} {eski:>14,.0f} {yeni:>14,.0f} {yeni / eski:>8.1f}x")
+        else:
+            print(f"{satir:>10} {'-':>14} {yeni:>14,.0f} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
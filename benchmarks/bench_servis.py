@@ -0,0 +1,162 @@
+"""Fiyat servisinin HTTP verimini ve WebSocket yayın gecikmesini sahte sağlayıcıyla ölçer
+
+Servis ayrı bir süreçte (sentetik sağlayıcı, depo yok) başlatılır:
+  1. `--baglanti` eşzamanlı istemci `--sure` saniye boyunca /quote ister (önbellekli ve taze=1)
+  2. `--abone` WebSocket istemcisi bağlanır, tick zamanından alınana kadar geçen süre ölçülür
+
+Kullanım: python -m benchmarks.bench_servis --abone 1000 --sure 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import aiohttp
+
+
+def _yuzdelik(sirali, oran):
+    return sirali[min(len(sirali) - 1, int(oran * len(sirali)))] if sirali else 0.0
+
+
+def _bos_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _hazir_bekle(oturum, adres, zaman_asimi=30.0):
+    bitis = time.monotonic() + zaman_asimi
+    while True:
+        try:
+            async with oturum.get(f"{adres}/stats") as yanit:
+                if yanit.status == 200:
+                    return
+        except aiohttp.ClientError:
+            if time.monotonic() > bitis:
+                raise
+        await asyncio.sleep(0.2)
+
+
+async def http_yuku(oturum, adres, semboller, baglanti, sure, taze):
+    """`baglanti` döngü aynı anda tek sembollü /quote ister; (istek, hata, gecikmeler) döndürür"""
+    gecikmeler = []
+    hatalar = 0
+    bitis = time.perf_counter() + sure
+    sorgu = "&taze=1" if taze else ""
+
+    async def isci(rng):
+        nonlocal hatalar
+        while time.perf_counter() < bitis:
+            baslangic = time.perf_counter()
+            async with oturum.get(f"{adres}/quote?s={rng.choice(semboller)}{sorgu}") as yanit:
+                veri = await yanit.json()
+            if yanit.status != 200 or veri["hatalar"]:
+                hatalar += 1
+            gecikmeler.append(time.perf_counter() - baslangic)
+
+    await asyncio.gather(*(isci(random.Random(i)) for i in range(baglanti)))
+    return len(gecikmeler), hatalar, sorted(gecikmeler)
+
+
+async def yayin_yuku(oturum, adres, semboller, abone, abone_sembol, sure):
+    """`abone` WebSocket istemcisi açar; her biri `abone_sembol` sembole abone olur"""
+    gecikmeler = []
+    alinan = [0]
+    baglanan = []
+    rng = random.Random(0)
+
+    async def dinle(ws):
+        async for mesaj in ws:
+            if mesaj.type != aiohttp.WSMsgType.TEXT:
+                break
+            # Yalnızca zaman alanı için tam ayrıştırmaya gerek yok
+            alinan_zaman = time.time()
+            bas = mesaj.data.index('"zaman": "') + 10
+            zaman = datetime.fromisoformat(mesaj.data[bas:mesaj.data.index('"', bas)]).timestamp()
+            gecikmeler.append(alinan_zaman - zaman)
+            alinan[0] += 1
+
+    baslangic = time.perf_counter()
+    for _ in range(abone):
+        secim = ",".join(rng.sample(semboller, abone_sembol))
+        baglanan.append(await oturum.ws_connect(f"{adres}/ws?s={secim}"))
+    baglanma = time.perf_counter() - baslangic
+    dinleyiciler = [asyncio.ensure_future(dinle(ws)) for ws in baglanan]
+    # İlk turda gelen anlık görüntüler ısınmaya sayılır
+    await asyncio.sleep(2.0)
+    gecikmeler.clear()
+    alinan[0] = 0
+    await asyncio.sleep(sure)
+    toplam = alinan[0]
+    sirali = sorted(gecikmeler)
+    for ws in baglanan:
+        await ws.close()
+    for gorev in dinleyiciler:
+        gorev.cancel()
+    return baglanma, toplam, sirali
+
+
+async def calistir(args):
+    port = _bos_port()
+    adres = f"http://127.0.0.1:{port}"
+    ortam = dict(os.environ, BORSA_SAGLAYICI_GECIKME=str(args.gecikme),
+                 BORSA_ONBELLEK=os.path.join(tempfile.mkdtemp(), "onbellek.json"))
+    servis = subprocess.Popen(
+        [sys.executable, "-m", "borsa_servis", "--port", str(port), "--saglayici", "sentetik", "--depo", "yok",
+         "--canli-aralik", str(args.canli_aralik)],
+        env=ortam, stdout=subprocess.DEVNULL,
+    )
+    semboller = [f"SRV{i:03d}.IS" for i in range(args.sembol)]
+    try:
+        # Varsayılan bağlantı sınırı (100) WebSocket aboneleri için kaldırılır
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as oturum:
+            await _hazir_bekle(oturum, adres)
+            print(f"{args.sembol} sembol, sağlayıcı gecikmesi {args.gecikme * 1000:.0f} ms, "
+                  f"{args.baglanti} eşzamanlı HTTP istemcisi")
+            for taze in (False, True):
+                async with oturum.get(f"{adres}/stats") as yanit:
+                    onceki = (await yanit.json())["onbellek"]["saglayici_cagrisi"]
+                istek, hata, gecikmeler = await http_yuku(oturum, adres, semboller, args.baglanti, args.sure, taze)
+                async with oturum.get(f"{adres}/stats") as yanit:
+                    ist = await yanit.json()
+                cagri = ist["onbellek"]["saglayici_cagrisi"] - onceki
+                print(f"/quote{' taze=1' if taze else ''}: {istek / args.sure:,.0f} istek/sn, "
+                      f"p50 {_yuzdelik(gecikmeler, 0.5) * 1000:.1f} ms / p99 {_yuzdelik(gecikmeler, 0.99) * 1000:.1f} ms, "
+                      f"{hata} hata, {cagri} sağlayıcı çağrısı ({istek} istek)")
+            print(f"Birleşen uçuştaki istek: {ist['birlesen']}")
+
+            baglanma, alinan, gecikmeler = await yayin_yuku(
+                oturum, adres, semboller, args.abone, args.abone_sembol, args.sure)
+            async with oturum.get(f"{adres}/stats") as yanit:
+                ist = await yanit.json()
+            print(f"{args.abone} WebSocket abonesi × {args.abone_sembol} sembol ({baglanma:.2f} s'de bağlandı)")
+            print(f"Yayın: {alinan / args.sure:,.0f} mesaj/sn, gecikme p50 {_yuzdelik(gecikmeler, 0.5) * 1000:.1f} ms / "
+                  f"p99 {_yuzdelik(gecikmeler, 0.99) * 1000:.1f} ms / max {(gecikmeler[-1] if gecikmeler else 0) * 1000:.1f} ms")
+            print(f"Motor: {ist['motor']['tick']} tick, {ist['motor']['istek']} toplu istek, "
+                  f"{ist['onbellek']['saglayici_cagrisi']} sağlayıcı çağrısı, kuyruktan düşen {ist['dusen']}")
+    finally:
+        servis.terminate()
+        servis.wait(30)
+
+
+def main():
+    ayrac = argparse.ArgumentParser()
+    ayrac.add_argument("--sembol", type=int, default=50)
+    ayrac.add_argument("--baglanti", type=int, default=64, help="Eşzamanlı HTTP istemcisi")
+    ayrac.add_argument("--abone", type=int, default=1000, help="WebSocket abonesi")
+    ayrac.add_argument("--abone-sembol", type=int, default=5, help="Abone başına sembol")
+    ayrac.add_argument("--sure", type=float, default=10.0, help="Her aşamanın süresi (saniye)")
+    ayrac.add_argument("--gecikme", type=float, default=0.05, help="Sahte sağlayıcı çağrı gecikmesi (saniye)")
+    ayrac.add_argument("--canli-aralik", type=float, default=1.0)
+    args = ayrac.parse_args()
+    asyncio.run(calistir(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Tarayıcının özellik hesaplama ve tarama sürelerini sentetik bir evren üzerinde ölçer
+
+Tarama, aynı süzgeci sembol sembol Python'da değerlendiren döngüyle karşılaştırılır.
+
+Kullanım: python -m benchmarks.bench_tarayici --sembol 500 --bar 300
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from borsa_tarayici import ozellikleri_hesapla, panel_olustur, tara
+
+SEKTORLER = ("Banks", "Energy", "Industrials", "Technology", "Utilities")
+SUZGEC = "sector == Banks and 20d return > 5% and volume > 1.5x 20d avg"
+
+
+def evren_uret(rng, sembol_sayisi, bar_sayisi):
+    tarihler = pd.bdate_range(end="2026-01-30", periods=bar_sayisi)
+    veriler = {}
+    for i in range(sembol_sayisi):
+        kapanis = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bar_sayisi)))
+        hacim = rng.lognormal(13, 0.5, bar_sayisi)
+        veriler[f"SMB{i:04d}.IS"] = pd.DataFrame({"Close": kapanis, "Volume": hacim}, index=tarihler)
+    meta = pd.DataFrame(
+        {
+            "name": [f"Şirket {i}" for i in range(sembol_sayisi)],
+            "sector": rng.choice(SEKTORLER, sembol_sayisi),
+            "market_cap": rng.integers(10**8, 10**11, sembol_sayisi),
+        },
+        index=pd.Index(list(veriler), name="symbol"),
+    )
+    return veriler, meta
+
+
+def dongu_ile(panel):
+    """Referans: satır satır Python koşulu"""
+    sonuc = []
+    for sembol, satir in panel.iterrows():
+        if satir["sector"] == "Banks" and satir["ret_20d"] > 5 and satir["volume"] > 1.5 * satir["avg_volume_20"]:
+            sonuc.append((satir["ret_20d"], sembol))
+    return sorted(sonuc, reverse=True)
+
+
+def olc(fonksiyon, tekrar):
+    sureler = []
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        fonksiyon()
+        sureler.append(time.perf_counter() - baslangic)
+    return statistics.median(sureler)
+
+
+def main():
+    ayrac = argparse.ArgumentParser()
+    ayrac.add_argument("--sembol", type=int, default=500)
+    ayrac.add_argument("--bar", type=int, default=300)
+    ayrac.add_argument("--tekrar", type=int, default=20)
+    ayrac.add_argument("--tohum", type=int, default=0)
+    args = ayrac.parse_args()
+
+    veriler, meta = evren_uret(np.random.default_rng(args.tohum), args.sembol, args.bar)
+    hesap = olc(lambda: ozellikleri_hesapla(veriler), max(1, args.tekrar // 4))
+    panel = panel_olustur(ozellikleri_hesapla(veriler), meta)
+    vektorel = olc(lambda: tara(panel, SUZGEC, "ret_20d"), args.tekrar)
+    dongu = olc(lambda: dongu_ile(panel), max(1, args.tekrar // 4))
+
+    eslesen = len(tara(panel, SUZGEC, "ret_20d"))
+    assert eslesen == len(dongu_ile(panel))
+    print(f"{args.sembol} sembol × {args.bar} bar, süzgeç: {SUZGEC!r} ({eslesen} eşleşme)")
+    print(f"Özellik hesaplama: {hesap * 1000:.1f} ms")
+    print(f"Vektörel tarama  : {vektorel * 1000:.2f} ms")
+    print(f"Satır döngüsü    : {dongu * 1000:.2f} ms ({dongu / vektorel:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Sıralı ve paralel sembol bilgisi çekmeyi sahte sağlayıcıyla karşılaştırır
+
+Kullanım: python -m benchmarks.bench_toplu_veri --sembol 60 --gecikme 0.2
+"""
+import argparse
+import random
+import time
+
+from borsa_toplu_veri import TopluVeriCekici
+
+
+def sahte_cekici(gecikme, hata_orani=0.0):
+    """Ağ gecikmesini taklit eden, isteğe bağlı hata üreten sağlayıcı"""
+    def cek(sembol):
+        time.sleep(gecikme)
+        if hata_orani and random.random() < hata_orani:
+            raise RuntimeError(f"{sembol}: sahte sağlayıcı hatası")
+        return {
+            "longName": sembol,
+            "regularMarketPrice": 100.0,
+            "regularMarketChangePercent": 0.0,
+        }
+    return cek
+
+
+def main():
+    ayrac = argparse.ArgumentParser()
+    ayrac.add_argument("--sembol", type=int, default=60)
+    ayrac.add_argument("--gecikme", type=float, default=0.2)
+    ayrac.add_argument("--isci", type=int, default=8)
+    ayrac.add_argument("--hata-orani", type=float, default=0.05)
+    args = ayrac.parse_args()
+
+    semboller = [f"SMB{i:03d}.IS" for i in range(args.sembol)]
+    cek = sahte_cekici(args.gecikme, args.hata_orani)
+
+    baslangic = time.perf_counter()
+    for sembol in semboller:
+        try:
+            cek(sembol)
+        except RuntimeError:
+            pass
+    sirali = time.perf_counter() - baslangic
+
+    cekici = TopluVeriCekici(cek, max_isci=args.isci)
+    baslangic = time.perf_counter()
+    sonuclar, hatalar = cekici.getir(semboller)
+    paralel = time.perf_counter() - baslangic
+    cekici.kapat()
+
+    print(f"{args.sembol} sembol, {args.gecikme * 1000:.0f} ms gecikme")
+    print(f"Sıralı : {sirali:.2f} s")
+    print(f"Paralel: {paralel:.2f} s ({args.isci} işçi, {len(sonuclar)} başarılı, {len(hatalar)} hatalı)")
+    print(f"Hızlanma: {sirali / paralel:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Getirme, kaydetme, analiz ve çizim yolları için benchmark takımı
+
+Sahte sağlayıcı (TekrarSaglayici, sentetik veri) ve geçici bir gömülü depo
+üzerinde çalışır; ağ ya da veritabanı sunucusu gerekmez.
+
+  python -m benchmarks.suite calistir --sembol 50 --bar 1000 --cikti sonuc.json
+  python -m benchmarks.suite karsilastir eski.json yeni.json --esik 0.10
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import matplotlib
+matplotlib.use("Agg")  # çizim senaryosu pencere açmadan ölçülür
+import matplotlib.pyplot as plt
+
+from borsa_depolama import GomuluDepo
+from borsa_donusum import fiyat_kayitlari, parcala
+from borsa_portfoy import PortfoyMotoru
+from borsa_saglayici import TekrarSaglayici
+from borsa_takip_projesi_database_ile import BorsaUygulamasi
+
+
+def _yuzdelik(sirali, oran):
+    return sirali[min(len(sirali) - 1, int(oran * len(sirali)))]
+
+
+def olc(is_fonksiyonu, tekrar, birim_sayisi):
+    """is_fonksiyonu'nu `tekrar` kez çalıştırıp gecikme, verim ve tepe bellek döndürür.
+
+    tracemalloc her ayırmayı izleyip çağrıyı yavaşlattığından tepe bellek ayrı bir ek turda ölçülür.
+    """
+    sureler = []
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        is_fonksiyonu()
+        sureler.append(time.perf_counter() - baslangic)
+    tracemalloc.start()
+    try:
+        is_fonksiyonu()
+        tepe = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    sirali = sorted(sureler)
+    return {
+        'tekrar': tekrar,
+        'birim': birim_sayisi,
+        'p50_ms': _yuzdelik(sirali, 0.50) * 1000,
+        'p99_ms': _yuzdelik(sirali, 0.99) * 1000,
+        'ortalama_ms': sum(sureler) / len(sureler) * 1000,
+        'verim_birim_sn': birim_sayisi * len(sureler) / sum(sureler),
+        'tepe_bellek_mb': tepe / 2 ** 20,
+    }
+
+
+def senaryolar(args, dizin):
+    saglayici = TekrarSaglayici(sentetik=True, bar_sayisi=args.bar, tohum=1)
+    semboller = [f"BENCH{i:03d}.IS" for i in range(args.sembol)]
+    veriler = {s: saglayici.history(s, period="max") for s in semboller}
+    # Veri hazırlığı gecikmesiz, ölçülen sağlayıcı çağrıları gecikmeli
+    saglayici.gecikme = args.gecikme
+    depo = GomuluDepo(os.path.join(dizin, "depo"))
+    # Kullanıcının önbellek dosyası okunmaz ve BENCH sembolleriyle kirletilmez
+    uygulama = BorsaUygulamasi(saglayici=saglayici, depo=depo,
+                               onbellek_dosyasi=os.path.join(dizin, "bilgi_onbellegi.json"))
+    toplam_satir = sum(len(df) for df in veriler.values())
+
+    def bilgi_sirali():
+        uygulama.onbellek.fiyat.temizle()
+        for sembol in semboller:
+            uygulama._ticker_info(sembol)
+
+    def bilgi_toplu():
+        uygulama.onbellek.fiyat.temizle()
+        uygulama.hisse_bilgileri_toplu(semboller)
+
+    def donusum():
+        for sembol, df in veriler.items():
+            for _ in parcala(fiyat_kayitlari(sembol, df)):
+                pass
+
+    def fiyat_kaydet():
+        for sembol, df in veriler.items():
+            depo.fiyat_kaydet(sembol, df)
+
+    motor = PortfoyMotoru(veriler.get, endeks=semboller[0])
+    pozisyonlar = [(s, 10 + i) for i, s in enumerate(semboller[1:])]
+
+    def portfoy():
+        motor.analiz(pozisyonlar)
+
+    def grafik():
+        for sembol in semboller[: args.grafik]:
+            uygulama.hisse_grafik_ciz(sembol, "max")
+        plt.close("all")
+
+    return uygulama, [
+        ("bilgi_sirali", bilgi_sirali, len(semboller)),
+        ("bilgi_toplu", bilgi_toplu, len(semboller)),
+        ("donusum", donusum, toplam_satir),
+        ("fiyat_kaydet", fiyat_kaydet, toplam_satir),
+        ("portfoy_degerleme", portfoy, len(pozisyonlar)),
+        ("grafik_cizim", grafik, min(args.grafik, len(semboller))),
+    ]
+
+
+def calistir(args):
+    sonuc = {
+        'meta': {
+            'zaman': datetime.now().isoformat(timespec="seconds"),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'parametreler': {k: v for k, v in vars(args).items() if k != "komut"},
+        },
+        'senaryolar': {},
+    }
+    with tempfile.TemporaryDirectory() as dizin:
+        uygulama, liste = senaryolar(args, dizin)
+        try:
+            for ad, fonksiyon, birim in liste:
+                if args.senaryo and ad not in args.senaryo:
+                    continue
+                olcum = olc(fonksiyon, args.tekrar, birim)
+                sonuc['senaryolar'][ad] = olcum
+                print(f"{ad:<18} p50 {olcum['p50_ms']:>9.1f} ms  p99 {olcum['p99_ms']:>9.1f} ms  "
+                      f"{olcum['verim_birim_sn']:>12,.0f} birim/sn  tepe {olcum['tepe_bellek_mb']:>7.1f} MB")
+        finally:
+            uygulama.kapat()
+    if args.cikti:
+        with open(args.cikti, "w", encoding="utf-8") as f:
+            json.dump(sonuc, f, indent=2, ensure_ascii=False)
+        print(f"Sonuçlar {args.cikti} dosyasına yazıldı.")
+
+
+def karsilastir(args):
+    with open(args.eski, encoding="utf-8") as f:
+        eski = json.load(f)['senaryolar']
+    with open(args.yeni, encoding="utf-8") as f:
+        yeni = json.load(f)['senaryolar']
+    gerileme = False
+    print(f"{'senaryo':<18} {'p50 eski':>10} {'p50 yeni':>10} {'fark':>8} {'verim farkı':>12}")
+    for ad in sorted(set(eski) & set(yeni)):
+        e, y = eski[ad], yeni[ad]
+        p50_fark = y['p50_ms'] / e['p50_ms'] - 1 if e['p50_ms'] else 0.0
+        verim_fark = y['verim_birim_sn'] / e['verim_birim_sn'] - 1 if e['verim_birim_sn'] else 0.0
+        isaret = ""
+        if p50_fark > args.esik or verim_fark < -args.esik:
+            gerileme = True
+            isaret = "  ⚠ gerileme"
+        print(f"{ad:<18} {e['p50_ms']:>10.1f} {y['p50_ms']:>10.1f} {p50_fark:>+8.1%} {verim_fark:>+12.1%}{isaret}")
+    return 1 if gerileme else 0
+
+
+def main():
+    ayrac = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    alt = ayrac.add_subparsers(dest="komut", required=True)
+    c = alt.add_parser("calistir")
+    c.add_argument("--sembol", type=int, default=50)
+    c.add_argument("--bar", type=int, default=1000)
+    c.add_argument("--tekrar", type=int, default=5)
+    c.add_argument("--gecikme", type=float, default=0.0, help="Sahte sağlayıcı çağrı gecikmesi (sn)")
+    c.add_argument("--grafik", type=int, default=5, help="Çizim senaryosunda çizilecek sembol sayısı")
+    c.add_argument("--senaryo", nargs="*", help="Yalnızca bu senaryoları çalıştır")
+    c.add_argument("--cikti", help="JSON sonuç dosyası")
+    k = alt.add_parser("karsilastir")
+    k.add_argument("eski")
+    k.add_argument("yeni")
+    k.add_argument("--esik", type=float, default=0.10, help="Gerileme sayılacak göreli fark")
+    args = ayrac.parse_args()
+    if args.komut == "calistir":
+        calistir(args)
+    else:
+        sys.exit(karsilastir(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""Canlı tick akışı üzerinde değerlendirilen bildirimsel fiyat/gösterge alarm kuralları
+
+Kural örnekleri (sembol verilmezse tüm semboller için geçerlidir):
+
+    THYAO.IS crosses above 300
+    change_percent < -3
+    RSI(14) > 70
+    GARAN.IS vwap <= 95.5
+
+Kurallar (sembol, alan) başına operatöre göre sıralı eşik listelerinde tutulur.
+Bir tick geldiğinde alanın önceki ve yeni değeri arasında kalan eşikler ikili
+aramayla bulunur; yalnızca koşulu yeni sağlanan kurallar tetiklenir (kenar
+tetikleme), böylece tick başına maliyet kural sayısına değil tetiklenen
+kural sayısına bağlıdır.
+"""
+import hashlib
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+TUM_SEMBOLLER = "*"
+# Kuralda yazılabilen alan adları -> iç alan adı
+ALANLAR = {
+    "price": "fiyat", "last": "fiyat", "fiyat": "fiyat",
+    "change_percent": "degisim", "degisim": "degisim", "değişim": "degisim",
+    "volume": "hacim", "hacim": "hacim",
+    "vwap": "vwap",
+}
+GOSTERGELER = {"SMA": 20, "EMA": 20, "RSI": 14}  # tek değer üreten artımlı göstergeler ve varsayılan periyotları
+# operatör metni -> (karşılaştırma, kesişim mi); kesişim kuralları önceki değer bilinmeden tetiklenmez
+OPERATORLER = {
+    ">": (">", False), ">=": (">=", False), "<": ("<", False), "<=": ("<=", False),
+    "crosses above": (">", True), "yukarı keser": (">", True),
+    "crosses below": ("<", True), "aşağı keser": ("<", True),
+}
+
+_KURAL_DESENI = re.compile(
+    r"^(?P<sol>.*?)\s*(?P<op>crosses\s+above|crosses\s+below|yukarı\s+keser|aşağı\s+keser|>=|<=|>|<)"
+    r"\s*(?P<esik>[-+]?\d+(?:[.,]\d+)?)\s*$",
+    re.IGNORECASE,
+)
+_GOSTERGE_DESENI = re.compile(r"([A-Za-z]+)(?:\(?(\d+)\)?)?")
+
+
+class KuralHatasi(ValueError):
+    pass
+
+
+class Kural:
+    __slots__ = ("id", "metin", "sembol", "alan", "op", "esik", "kesisim")
+
+    def __init__(self, sembol, alan, op, esik, kesisim, metin=None):
+        self.sembol = sembol
+        self.alan = alan
+        self.op = op
+        self.esik = float(esik)
+        self.kesisim = kesisim
+        self.metin = metin or self.normal_metin()
+        # Aynı kural yeniden yüklendiğinde aynı kimliği alır; kalıcı kayıtlar bununla tekilleşir
+        self.id = hashlib.sha1(self.normal_metin().encode("utf-8")).hexdigest()[:12]
+
+    def normal_metin(self):
+        op = {">": "crosses above", "<": "crosses below"}[self.op] if self.kesisim else self.op
+        return f"{self.sembol} {self.alan} {op} {self.esik:g}"
+
+    def __repr__(self):
+        return f"Kural({self.normal_metin()!r})"
+
+
+def _alan_ayristir(parca):
+    alan = ALANLAR.get(parca.lower())
+    if alan:
+        return alan
+    eslesme = _GOSTERGE_DESENI.fullmatch(parca)
+    if eslesme and eslesme.group(1).upper() in GOSTERGELER:
+        ad = eslesme.group(1).upper()
+        return f"{ad}({int(eslesme.group(2) or GOSTERGELER[ad])})"
+    return None
+
+
+def kural_ayristir(metin):
+    """'THYAO.IS crosses above 300', 'change_percent < -3', 'RSI(14) > 70' gibi bir metni Kural'a çevirir"""
+    eslesme = _KURAL_DESENI.match(metin.strip())
+    if not eslesme:
+        raise KuralHatasi(f"Kural anlaşılamadı: {metin!r}")
+    op, kesisim = OPERATORLER[" ".join(eslesme.group("op").lower().split())]
+    parcalar = eslesme.group("sol").split()
+    if len(parcalar) == 2:
+        sembol, alan = parcalar[0].upper(), _alan_ayristir(parcalar[1])
+    elif len(parcalar) == 1:
+        alan = _alan_ayristir(parcalar[0])
+        sembol = TUM_SEMBOLLER if alan else parcalar[0].upper()
+        alan = alan or "fiyat"  # yalnızca sembol yazılmışsa fiyat kastedilir
+    else:
+        raise KuralHatasi(f"Kuralda sembol ya da alan eksik: {metin!r}")
+    if alan is None:
+        raise KuralHatasi(f"Bilinmeyen alan: {parcalar[-1]!r}")
+    return Kural(sembol, alan, op, eslesme.group("esik").replace(",", "."), kesisim, metin.strip())
+
+
+def kurallari_oku(dosya_yolu):
+    """Her satırda bir kural bulunan dosyayı okur; # yorumdur"""
+    kurallar = []
+    with open(dosya_yolu, encoding="utf-8") as f:
+        for satir in f:
+            satir = satir.split("#", 1)[0].strip()
+            if satir:
+                kurallar.append(kural_ayristir(satir))
+    return kurallar
+
+
+class _EsikListesi:
+    """Aynı (sembol, alan, operatör, kesişim) için eşiğe göre sıralı kurallar"""
+
+    __slots__ = ("esikler", "kurallar")
+
+    def __init__(self):
+        self.esikler = []
+        self.kurallar = []
+
+    def ekle(self, kural):
+        i = bisect_right(self.esikler, kural.esik)
+        self.esikler.insert(i, kural.esik)
+        self.kurallar.insert(i, kural)
+
+    def cikar(self, kural):
+        i = self.kurallar.index(kural)
+        del self.esikler[i]
+        del self.kurallar[i]
+
+    def eslesenler(self, op, onceki, yeni):
+        """Koşulu önceki değerde sağlanmayıp yeni değerde sağlanan kurallar"""
+        e = self.esikler
+        if onceki is None:
+            # İlk gözlem: şu an koşulu sağlayan tüm kurallar
+            if op == ">":
+                return self.kurallar[:bisect_left(e, yeni)]
+            if op == ">=":
+                return self.kurallar[:bisect_right(e, yeni)]
+            if op == "<":
+                return self.kurallar[bisect_right(e, yeni):]
+            return self.kurallar[bisect_left(e, yeni):]
+        if op == ">":
+            bas, son = bisect_left(e, onceki), bisect_left(e, yeni)    # onceki <= esik < yeni
+        elif op == ">=":
+            bas, son = bisect_right(e, onceki), bisect_right(e, yeni)  # onceki < esik <= yeni
+        elif op == "<":
+            bas, son = bisect_right(e, yeni), bisect_right(e, onceki)  # yeni < esik <= onceki
+        else:
+            bas, son = bisect_left(e, yeni), bisect_left(e, onceki)    # yeni <= esik < onceki
+        return self.kurallar[bas:son] if bas < son else ()
+
+
+class AlarmMotoru:
+    """Canlı takip motoruna abone olup her tick'te yalnızca ilgili kuralları değerlendirir.
+
+    Tetiklenen alarmlar abonelere sözlük olarak iletilir. Aynı (kural, sembol) için
+    `tekrar_suresi` saniye içinde ikinci bir alarm üretilmez. vwap alanı için
+    `tampon` (TickTamponu) verilmelidir; gösterge alanları tick akışı üzerinde
+    artımlı hesaplanır, istenirse `gostergeler.isit` ile geçmiş kapanışlarla ısıtılır.
+    """
+
+    def __init__(self, kurallar=(), tekrar_suresi=300.0, tampon=None):
+        self.tekrar_suresi = tekrar_suresi
+        self.tampon = tampon
+        self.gostergeler = None
+        self._gosterge_tanimlari = set()  # (ad, n)
+        self._kurallar = {}
+        self._indeks = {}  # (sembol, alan) -> {(op, kesisim): _EsikListesi}
+        self._alanlar = {}  # sembol -> {alan: kural sayısı}
+        self._onceki = {}  # (sembol, alan) -> son değer
+        self._son_tetik = {}  # (kural_id, sembol) -> son alarm zamanı
+        self._aboneler = []
+        self._kilit = threading.Lock()
+        self.tick = 0
+        self.tetik = 0
+        self.bastirilan = 0
+        for kural in kurallar:
+            self.ekle(kural)
+
+    def ekle(self, kural):
+        if isinstance(kural, str):
+            kural = kural_ayristir(kural)
+        with self._kilit:
+            if kural.id in self._kurallar:
+                return self._kurallar[kural.id]
+            self._kurallar[kural.id] = kural
+            listeler = self._indeks.setdefault((kural.sembol, kural.alan), {})
+            listeler.setdefault((kural.op, kural.kesisim), _EsikListesi()).ekle(kural)
+            alanlar = self._alanlar.setdefault(kural.sembol, {})
+            alanlar[kural.alan] = alanlar.get(kural.alan, 0) + 1
+            if "(" in kural.alan:
+                ad, n = kural.alan.rstrip(")").split("(")
+                if (ad, int(n)) not in self._gosterge_tanimlari:
+                    self._gosterge_tanimlari.add((ad, int(n)))
+                    self._gostergeleri_kur()
+        return kural
+
+    def cikar(self, kural_id):
+        with self._kilit:
+            kural = self._kurallar.pop(kural_id, None)
+            if kural is None:
+                return False
+            self._indeks[(kural.sembol, kural.alan)][(kural.op, kural.kesisim)].cikar(kural)
+            alanlar = self._alanlar[kural.sembol]
+            alanlar[kural.alan] -= 1
+            if not alanlar[kural.alan]:
+                del alanlar[kural.alan]
+            return True
+
+    def kurallar(self):
+        with self._kilit:
+            return list(self._kurallar.values())
+
+    def _gostergeleri_kur(self):
+        # Kilit altında çağrılmalı; yeni gösterge eklenince artımlı durumlar sıfırdan başlar
+        from borsa_indikator import CanliIndikatorler
+        self.gostergeler = CanliIndikatorler([(ad, {"n": n}) for ad, n in sorted(self._gosterge_tanimlari)])
+
+    def isit(self, sembol, kapanis, son_bar=None):
+        """Sembolün gösterge alanlarını geçmiş günlük kapanışlarla başlatır; gösterge kuralı yoksa bir şey yapmaz"""
+        with self._kilit:
+            if self.gostergeler is not None:
+                self.gostergeler.isit(sembol, kapanis, son_bar)
+
+    def abone_ol(self, geri_cagirim):
+        """Her alarm için geri_cagirim(alarm) çağrılır"""
+        with self._kilit:
+            self._aboneler.append(geri_cagirim)
+        return geri_cagirim
+
+    def _deger(self, tick, alan):
+        if alan == "fiyat":
+            return tick.get('fiyat')
+        if alan == "degisim":
+            return tick.get('değişim')
+        if alan == "hacim":
+            return tick.get('hacim')
+        if alan == "vwap":
+            return self.tampon.vwap(tick['sembol']) if self.tampon is not None else None
+        ad, n = alan.rstrip(")").split("(")
+        return self.gostergeler.deger(tick['sembol'], ad, n=int(n))
+
+    def __call__(self, tick):
+        if tick.get('fiyat') is None:
+            return
+        sembol = tick['sembol']
+        alarmlar = []
+        with self._kilit:
+            self.tick += 1
+            if self.gostergeler is not None:
+                self.gostergeler(tick)
+            alanlar = self._alanlar.get(sembol, {})
+            genel = self._alanlar.get(TUM_SEMBOLLER, {})
+            for alan in (alanlar.keys() | genel.keys()) if alanlar and genel else (alanlar or genel):
+                yeni = self._deger(tick, alan)
+                if yeni is None:
+                    continue
+                yeni = float(yeni)
+                onceki = self._onceki.get((sembol, alan))
+                self._onceki[(sembol, alan)] = yeni
+                if onceki == yeni:
+                    continue
+                for anahtar in ((sembol, alan), (TUM_SEMBOLLER, alan)):
+                    for (op, kesisim), liste in self._indeks.get(anahtar, {}).items():
+                        if kesisim and onceki is None:
+                            continue
+                        for kural in liste.eslesenler(op, onceki, yeni):
+                            alarm = self._alarm(kural, tick, yeni)
+                            if alarm is not None:
+                                alarmlar.append(alarm)
+            aboneler = list(self._aboneler)
+        for alarm in alarmlar:
+            for abone in aboneler:
+                abone(alarm)
+
+    def _alarm(self, kural, tick, deger):
+        # Kilit altında çağrılmalı
+        zaman = tick.get('zaman') or datetime.now()
+        anahtar = (kural.id, tick['sembol'])
+        son = self._son_tetik.get(anahtar)
+        if son is not None and (zaman - son).total_seconds() < self.tekrar_suresi:
+            self.bastirilan += 1
+            return None
+        self._son_tetik[anahtar] = zaman
+        self.tetik += 1
+        return {
+            'kural': kural.id,
+            'metin': kural.metin,
+            'sembol': tick['sembol'],
+            'zaman': zaman,
+            'alan': kural.alan,
+            'deger': deger,
+            'esik': kural.esik,
+        }
+
+    def istatistik(self):
+        with self._kilit:
+            return {
+                'kural': len(self._kurallar),
+                'tick': self.tick,
+                'tetik': self.tetik,
+                'bastirilan': self.bastirilan,
+            }
@@ -0,0 +1,327 @@
+"""Sembol evreni için parça parça, kaldığı yerden devam edebilen geçmiş veri doldurma
+
+Her (sembol, aralık) çifti tarih pencerelerine bölünür; pencereler sırayla
+çekilir → normalleştirilir → depoya yazılır ve hemen bırakılır. Bellekte en
+fazla işçi sayısı kadar pencere bulunur, sembol dosyası da satır satır okunur.
+Tamamlanan son pencere kontrol noktası dosyasına yazılır; kesilen bir doldurma
+aynı dosyayla yeniden başlatıldığında kaldığı pencereden (bir gün örtüşmeyle) devam eder,
+sonraki çalıştırmalar da yalnızca yeni barları çeker.
+
+Kullanım: python -m borsa_backfill semboller.txt --aralik 1d,1h,5m --isci 4 --hiz 2
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+from borsa_metrik import metrikler
+
+GUNLUK = "1d"
+VARSAYILAN_BASLANGIC = datetime(2000, 1, 1)
+# aralık -> (sağlayıcının geriye verdiği en fazla gün, pencere günü); None: sınırsız
+ARALIKLAR = {
+    "1m": (29, 7),
+    "2m": (59, 30),
+    "5m": (59, 30),
+    "15m": (59, 30),
+    "30m": (59, 30),
+    "60m": (729, 90),
+    "1h": (729, 90),
+    "1d": (None, 366),
+}
+
+
+def sembolleri_oku(dosya_yolu):
+    """Sembol dosyasını satır satır okur (izleme listesi biçimi: 'SEMBOL[,aralık]', # yorumdur)"""
+    with open(dosya_yolu, encoding="utf-8") as f:
+        for satir in f:
+            satir = satir.split("#", 1)[0].strip()
+            if satir:
+                yield satir.split(",", 1)[0].strip()
+
+
+def pencereler(interval, baslangic, simdi):
+    """[bas, son) tarih pencerelerini eskiden yeniye üretir"""
+    geri_gun, pencere_gunu = ARALIKLAR[interval]
+    if geri_gun is not None:
+        baslangic = max(baslangic, simdi - timedelta(days=geri_gun))
+    adim = timedelta(days=pencere_gunu)
+    while baslangic < simdi:
+        son = min(baslangic + adim, simdi)
+        yield baslangic, son
+        baslangic = son
+
+
+def normallestir(df):
+    """Saat dilimini yerel duvar saatine indirger, tamamen boş barları ve yinelenen zamanları atar"""
+    if df is None or df.empty:
+        return df
+    if getattr(df.index, 'tz', None) is not None:
+        df = df.tz_localize(None)
+    sutunlar = [s for s in ("Open", "High", "Low", "Close", "Volume") if s in df.columns]
+    df = df[sutunlar].dropna(how="all", subset=[s for s in sutunlar if s != "Volume"] or None)
+    return df[~df.index.duplicated(keep="last")]
+
+
+class JetonKovasi:
+    """Saniyede `hiz` isteğe, en fazla `kapasite` kadar ani çıkışa izin veren iş parçacığı güvenli sınırlayıcı"""
+
+    def __init__(self, hiz, kapasite=None, saat=time.monotonic):
+        self.hiz = float(hiz)
+        self.kapasite = float(kapasite or max(1.0, hiz))
+        self._saat = saat
+        self._jeton = self.kapasite
+        self._son = saat()
+        self._kilit = threading.Lock()
+        self.bekleme = 0.0  # toplam bekletilen süre
+
+    def al(self, durdur_olayi=None):
+        """Bir jeton alana kadar bekler; durdurulursa False döner"""
+        if self.hiz <= 0:
+            return True
+        while True:
+            with self._kilit:
+                simdi = self._saat()
+                self._jeton = min(self.kapasite, self._jeton + (simdi - self._son) * self.hiz)
+                self._son = simdi
+                if self._jeton >= 1:
+                    self._jeton -= 1
+                    return True
+                eksik = (1 - self._jeton) / self.hiz
+                self.bekleme += eksik
+            if durdur_olayi is not None:
+                if durdur_olayi.wait(eksik):
+                    return False
+            else:
+                time.sleep(eksik)
+
+
+class KontrolNoktasi:
+    """(sembol, aralık) başına tamamlanan son pencerenin bitişini JSON dosyasında tutar"""
+
+    def __init__(self, yol, yazma_araligi=2.0):
+        self.yol = yol
+        self.yazma_araligi = yazma_araligi
+        self._kilit = threading.Lock()
+        self._son_yazim = 0.0
+        self._kirli = False
+        self._kayitlar = {}
+        if yol and os.path.exists(yol):
+            with open(yol, encoding="utf-8") as f:
+                self._kayitlar = json.load(f)
+
+    @staticmethod
+    def _anahtar(sembol, interval):
+        return f"{sembol}|{interval}"
+
+    def konum(self, sembol, interval):
+        deger = self._kayitlar.get(self._anahtar(sembol, interval))
+        return datetime.fromisoformat(deger) if deger else None
+
+    def ilerlet(self, sembol, interval, son):
+        with self._kilit:
+            self._kayitlar[self._anahtar(sembol, interval)] = son.isoformat()
+            self._kirli = True
+            if time.monotonic() - self._son_yazim >= self.yazma_araligi:
+                self._yaz()
+
+    def kaydet(self):
+        with self._kilit:
+            if self._kirli:
+                self._yaz()
+
+    def _yaz(self):
+        # Kilit altında çağrılmalı
+        if not self.yol:
+            return
+        gecici = f"{self.yol}.tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(self._kayitlar, f, ensure_ascii=False)
+        os.replace(gecici, self.yol)
+        self._son_yazim = time.monotonic()
+        self._kirli = False
+
+
+class GecmisDoldurucu:
+    """Sembol akışını sınırlı bir işçi havuzunda çek → normalleştir → yaz hattından geçirir.
+
+    Günlük barlar `depo.fiyat_kaydet`, gün içi barlar `depo.barlari_kaydet` ile yazılır.
+    """
+
+    def __init__(self, saglayici, depo, aralik=(GUNLUK,), isci=4, hiz=2.0, kontrol_noktasi=None,
+                 baslangic=VARSAYILAN_BASLANGIC, deneme=3, saat=datetime.now):
+        for interval in aralik:
+            if interval not in ARALIKLAR:
+                raise ValueError(f"Desteklenmeyen aralık: {interval} ({', '.join(ARALIKLAR)})")
+        self.saglayici = saglayici
+        self.depo = depo
+        self.aralik = tuple(aralik)
+        self.isci = max(1, int(isci))
+        self.kova = JetonKovasi(hiz)
+        self.kontrol = KontrolNoktasi(kontrol_noktasi)
+        self.baslangic = baslangic
+        self.deneme = max(1, int(deneme))
+        self._saat = saat
+        self.durdur_olayi = threading.Event()
+        self._kilit = threading.Lock()
+        self.sayac = {'birim': 0, 'devam': 0, 'pencere': 0, 'satir': 0, 'hata': 0}
+        self.hatalar = {}
+
+    def _say(self, **artislar):
+        with self._kilit:
+            for ad, miktar in artislar.items():
+                self.sayac[ad] += miktar
+
+    def _pencere_getir(self, sembol, interval, bas, son):
+        bekleme = 1.0
+        for deneme in range(self.deneme):
+            if not self.kova.al(self.durdur_olayi):
+                return None
+            try:
+                with metrikler.zamanla("backfill.getir", sembol):
+                    return self.saglayici.history(sembol, start=bas, end=son, interval=interval)
+            except Exception:
+                if deneme == self.deneme - 1:
+                    raise
+            # Sağlayıcı geçici hata verdiyse üstel geri çekilmeyle tekrar dene
+            if self.durdur_olayi.wait(bekleme):
+                return None
+            bekleme *= 2
+
+    def _yaz(self, sembol, interval, df):
+        with metrikler.zamanla("backfill.yaz", sembol):
+            if interval == GUNLUK:
+                return self.depo.fiyat_kaydet(sembol, df)
+            return self.depo.barlari_kaydet(sembol, interval, df)
+
+    def birim(self, sembol, interval):
+        """Bir (sembol, aralık) çiftinin pencerelerini sırayla işler, yazılan satır sayısını döndürür"""
+        baslangic = self.baslangic
+        kalinan = self.kontrol.konum(sembol, interval)
+        if kalinan is not None:
+            # Son pencerenin yarım kalmış barı da tazelensin; upsert örtüşmeyi zararsız kılar
+            baslangic = max(baslangic, kalinan - timedelta(days=1))
+            self._say(devam=1)
+        yazilan = 0
+        for bas, son in pencereler(interval, baslangic, self._saat()):
+            if self.durdur_olayi.is_set():
+                break
+            df = self._pencere_getir(sembol, interval, bas, son)
+            if df is None:
+                break
+            df = normallestir(df)
+            satir = self._yaz(sembol, interval, df) if df is not None and not df.empty else 0
+            del df  # pencere belleği bir sonraki çekimden önce bırakılır
+            yazilan += satir
+            self._say(pencere=1, satir=satir)
+            self.kontrol.ilerlet(sembol, interval, son)
+        return yazilan
+
+    def _isler(self, semboller):
+        for sembol in semboller:
+            for interval in self.aralik:
+                yield sembol, interval
+
+    def calistir(self, semboller, ilerleme=None):
+        """Sembol iterable'ını işler; en fazla 2 × isci birim aynı anda kuyrukta bekler"""
+        baslangic = time.perf_counter()
+        havuz = ThreadPoolExecutor(max_workers=self.isci, thread_name_prefix="backfill")
+        bekleyenler = {}
+        try:
+            for is_tanimi in self._isler(semboller):
+                if self.durdur_olayi.is_set():
+                    break
+                if len(bekleyenler) >= self.isci * 2:
+                    self._toparla(bekleyenler, ilerleme)
+                bekleyenler[havuz.submit(self.birim, *is_tanimi)] = is_tanimi
+            while bekleyenler:
+                self._toparla(bekleyenler, ilerleme)
+        except KeyboardInterrupt:
+            # İşçiler pencere sınırında durur, kuyruktaki birimler hiç başlamaz
+            self.durdur_olayi.set()
+            print("\nDurduruluyor, kontrol noktası kaydediliyor...")
+        finally:
+            havuz.shutdown(wait=True, cancel_futures=True)
+            self.kontrol.kaydet()
+        return dict(self.sayac, sure=time.perf_counter() - baslangic, bekleme=self.kova.bekleme)
+
+    def _toparla(self, bekleyenler, ilerleme):
+        bitenler, _ = wait(list(bekleyenler), return_when=FIRST_COMPLETED)
+        for gelecek in bitenler:
+            sembol, interval = bekleyenler.pop(gelecek)
+            try:
+                satir = gelecek.result()
+            except Exception as e:
+                metrikler.hata("backfill", sembol, e)
+                self.hatalar[(sembol, interval)] = e
+                self._say(hata=1)
+                print(f"{sembol} {interval} doldurma hatası: {e}")
+                continue
+            self._say(birim=1)
+            if ilerleme:
+                ilerleme(sembol, interval, satir)
+
+
+def _arguman_ayristirici():
+    ayrac = argparse.ArgumentParser(description="Sembol evreni için parça parça geçmiş veri doldurma")
+    ayrac.add_argument("sembol_dosyasi", help="Her satırda bir sembol (# yorum)")
+    ayrac.add_argument("--aralik", default=GUNLUK, help=f"Virgülle ayrılmış aralıklar ({', '.join(ARALIKLAR)})")
+    ayrac.add_argument("--isci", type=int, default=4)
+    ayrac.add_argument("--hiz", type=float, default=2.0, help="Saniyedeki en fazla sağlayıcı isteği (0: sınırsız)")
+    ayrac.add_argument("--kontrol-noktasi", default="backfill_kontrol.json", metavar="DOSYA")
+    ayrac.add_argument("--baslangic", type=datetime.fromisoformat, default=VARSAYILAN_BASLANGIC,
+                       help="Günlük barlar için ilk tarih (YYYY-AA-GG)")
+    ayrac.add_argument("--depo", help="mysql | gomulu (varsayılan: BORSA_DEPO)")
+    ayrac.add_argument("--ozellik", action=argparse.BooleanOptionalAction, default=True,
+                       help="Bitince yeni barı gelen sembollerin tarama özelliklerini güncelle")
+    ayrac.add_argument("--stats", action="store_true", help="Çıkışta süre ve hata özetini yazdır")
+    return ayrac
+
+
+def main(argv=None):
+    args = _arguman_ayristirici().parse_args(argv)
+    if args.stats:
+        metrikler.acik = True
+    from borsa_depolama import depo_olustur
+    from borsa_saglayici import saglayici_olustur
+
+    depo = depo_olustur(args.depo)
+    doldurucu = GecmisDoldurucu(
+        saglayici_olustur(), depo,
+        aralik=[a.strip() for a in args.aralik.split(",") if a.strip()],
+        isci=args.isci, hiz=args.hiz, kontrol_noktasi=args.kontrol_noktasi, baslangic=args.baslangic,
+    )
+
+    yeni_gunluk = []
+
+    def ilerleme(sembol, interval, satir):
+        print(f"{sembol} {interval}: {satir} satır")
+        if interval == GUNLUK and satir:
+            yeni_gunluk.append(sembol)
+
+    try:
+        sonuc = doldurucu.calistir(sembolleri_oku(args.sembol_dosyasi), ilerleme)
+        if yeni_gunluk and args.ozellik:
+            # Tarayıcının sakladığı özellikler yalnızca yeni günlük barı gelen semboller için tazelenir
+            from borsa_tarayici import Tarayici
+            try:
+                print(f"{Tarayici(depo).guncelle(yeni_gunluk, zorla=True)} sembolün tarama özellikleri güncellendi")
+            except Exception as e:
+                metrikler.hata("tarayici.guncelle", hata=e)
+                print(f"Tarama özellikleri güncellenemedi: {e}")
+    finally:
+        depo.kapat()
+    print(f"\n{sonuc['birim']} birim ({sonuc['devam']} kaldığı yerden), {sonuc['pencere']} pencere, "
+          f"{sonuc['satir']} satır, {sonuc['hata']} hata, {sonuc['sure']:.1f} s "
+          f"(hız sınırında {sonuc['bekleme']:.1f} s beklendi)")
+    if args.stats:
+        print(metrikler.ozet())
+    return 1 if sonuc['hata'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
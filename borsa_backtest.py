@@ -0,0 +1,321 @@
+"""Saklanan fiyat geçmişi üzerinde vektörel geri test: sinyal stratejileri, parametre taraması, işlemler
+
+Kapanışlar tarih × sembol matrisinde hizalanır (borsa_portfoy.fiyat_paneli);
+stratejiler bu matristen tek seferde T × N pozisyon matrisi (0/1, yalnız
+uzun) üretir, getiriler ve maliyetler sütun işlemleriyle hesaplanır — bar
+başına Python döngüsü yoktur. Sinyal t kapanışında oluşur, pozisyon t+1
+getirisini taşır. Portföy, her sembole eşit sermaye ayrılmış dilimlerin
+ortalamasıdır; metrikler portföy raporuyla aynı fonksiyondan gelir.
+
+Parametre ızgaraları süreç havuzunda parçalara bölünür; fiyat matrisi her
+işçiye bir kez gönderilir ve göstergeler (SMA/RSI periyotları) işçi içinde
+önbelleklenir.
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from borsa_indikator import rsi
+from borsa_portfoy import YILLIK_ISLEM_GUNU, fiyat_paneli, portfoy_metrikleri
+
+VARSAYILAN_MALIYET = 0.001  # pozisyon değişimi başına komisyon + kayma (tek yön)
+
+
+class GostergeOnbellegi:
+    """Bir kapanış matrisi için periyot başına bir kez hesaplanan göstergeler"""
+
+    def __init__(self, kapanis):
+        self.kapanis = kapanis
+        self.gecerli = ~np.isnan(kapanis)
+        sifirli = np.where(self.gecerli, kapanis, 0.0)
+        # Kayan ortalamalar birikimli toplamların farkından O(T × N) ile çıkar
+        self._toplam = np.vstack([np.zeros(kapanis.shape[1]), np.cumsum(sifirli, axis=0)])
+        self._sayi = np.vstack([np.zeros(kapanis.shape[1]), np.cumsum(self.gecerli, axis=0)])
+        self._sma = {}
+        self._rsi = {}
+
+    def sma(self, n):
+        if n not in self._sma:
+            sonuc = np.full(self.kapanis.shape, np.nan)
+            if n <= len(self.kapanis):
+                toplam = self._toplam[n:] - self._toplam[:-n]
+                sayi = self._sayi[n:] - self._sayi[:-n]
+                sonuc[n - 1:] = np.where(sayi == n, toplam / n, np.nan)
+            self._sma[n] = sonuc
+        return self._sma[n]
+
+    def rsi(self, n):
+        if n not in self._rsi:
+            self._rsi[n] = rsi(pd.DataFrame(self.kapanis), n).to_numpy()
+        return self._rsi[n]
+
+
+def _ileri_doldur(olaylar):
+    """NaN olmayan son değeri satırlar boyunca taşır; ilk olaydan önceki satırlar 0"""
+    satirlar = np.arange(len(olaylar))[:, None]
+    konum = np.where(~np.isnan(olaylar), satirlar, 0)
+    np.maximum.accumulate(konum, axis=0, out=konum)
+    return np.nan_to_num(olaylar[konum, np.arange(olaylar.shape[1])])
+
+
+def _ma_kontrol(hizli, yavas):
+    if not 0 < hizli < yavas:
+        raise ValueError(f"MA için 0 < hizli < yavas olmalı: {hizli}, {yavas}")
+
+
+def _rsi_kontrol(n, alt, ust):
+    if n < 1 or not 0 < alt < ust < 100:
+        raise ValueError(f"RSI için n >= 1 ve 0 < alt < ust < 100 olmalı: {n}, {alt}, {ust}")
+
+
+def ma_kesisim(gostergeler, hizli=20, yavas=50):
+    """Hızlı SMA yavaş SMA'nın üzerindeyken pozisyonda"""
+    _ma_kontrol(hizli, yavas)
+    with np.errstate(invalid="ignore"):
+        return (gostergeler.sma(hizli) > gostergeler.sma(yavas)).astype(float)
+
+
+def rsi_esik(gostergeler, n=14, alt=30, ust=70):
+    """RSI alt eşiğin altına inince al, üst eşiğin üstüne çıkınca sat"""
+    _rsi_kontrol(n, alt, ust)
+    r = gostergeler.rsi(n)
+    with np.errstate(invalid="ignore"):
+        olaylar = np.where(r < alt, 1.0, np.where(r > ust, 0.0, np.nan))
+    return _ileri_doldur(olaylar)
+
+
+# ad -> (pozisyon fonksiyonu, varsayılan parametreler, parametre kontrolü)
+STRATEJILER = {
+    "MA": (ma_kesisim, {"hizli": 20, "yavas": 50}, _ma_kontrol),
+    "RSI": (rsi_esik, {"n": 14, "alt": 30, "ust": 70}, _rsi_kontrol),
+}
+
+
+def strateji_al(ad):
+    ad = ad.upper()
+    if ad not in STRATEJILER:
+        raise ValueError(f"Bilinmeyen strateji: {ad} (seçenekler: {', '.join(STRATEJILER)})")
+    return ad, STRATEJILER[ad]
+
+
+def pozisyon_hesapla(gostergeler, strateji, parametreler):
+    fonksiyon, varsayilan, _ = STRATEJILER[strateji]
+    pozisyon = fonksiyon(gostergeler, **{**varsayilan, **parametreler})
+    return pozisyon * gostergeler.gecerli  # fiyatı olmayan günlerde pozisyon tutulmaz
+
+
+def getirileri_hesapla(kapanis, pozisyon, maliyet=VARSAYILAN_MALIYET):
+    """(T-1) × N sembol net getirileri ve (T-1) eşit ağırlıklı portföy getirisi.
+
+    pozisyon[t] t+1 getirisini taşır; pozisyon değişimleri değişim günü `maliyet` ile düşülür.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        varlik = kapanis[1:] / kapanis[:-1] - 1
+    gecerli = ~np.isnan(varlik)
+    degisim = np.abs(np.diff(pozisyon, axis=0, prepend=0.0))
+    net = pozisyon[:-1] * np.where(gecerli, varlik, 0.0) - maliyet * degisim[:-1]
+    net = np.where(gecerli, net, np.nan)
+    aktif = gecerli.sum(axis=1)
+    with np.errstate(invalid="ignore"):
+        portfoy = np.where(aktif > 0, np.nansum(net, axis=1) / np.maximum(aktif, 1), np.nan)
+    return net, portfoy
+
+
+def islem_istatistikleri(pozisyon, gecerli):
+    """Toplam işlem (giriş) sayısı ve fiyatı olan günlerde ortalama piyasada kalma oranı"""
+    return {
+        'islem': int((np.diff(pozisyon, axis=0, prepend=0.0) > 0).sum()),
+        'maruziyet': float(pozisyon[gecerli].mean()) if gecerli.any() else 0.0,
+    }
+
+
+def islemleri_cikar(tarihler, semboller, kapanis, pozisyon, maliyet=VARSAYILAN_MALIYET):
+    """Pozisyon geçişlerinden işlem listesi; son günde açık kalan işlem son kapanışla değerlenir"""
+    degisim = np.diff(pozisyon, axis=0, prepend=0.0)
+    kayitlar = []
+    for j, sembol in enumerate(semboller):
+        girisler = np.flatnonzero(degisim[:, j] > 0)
+        if not len(girisler):
+            continue
+        cikislar = np.flatnonzero(degisim[:, j] < 0)
+        acik = len(cikislar) < len(girisler)
+        if acik:
+            cikislar = np.append(cikislar, len(kapanis) - 1)
+        giris_fiyati = kapanis[girisler, j]
+        cikis_fiyati = kapanis[cikislar, j]
+        kesinti = np.full(len(girisler), (1 - maliyet) ** 2)
+        if acik:
+            kesinti[-1] = 1 - maliyet
+        kayitlar.append(pd.DataFrame({
+            'sembol': sembol,
+            'giris_tarihi': tarihler[girisler],
+            'giris_fiyati': giris_fiyati,
+            'cikis_tarihi': tarihler[cikislar],
+            'cikis_fiyati': cikis_fiyati,
+            'getiri': cikis_fiyati / giris_fiyati * kesinti - 1,
+            'bar': cikislar - girisler,
+            'acik': np.arange(len(girisler)) == len(girisler) - 1 if acik else False,
+        }))
+    if not kayitlar:
+        return pd.DataFrame(columns=['sembol', 'giris_tarihi', 'giris_fiyati', 'cikis_tarihi',
+                                     'cikis_fiyati', 'getiri', 'bar', 'acik'])
+    return pd.concat(kayitlar, ignore_index=True).sort_values(['giris_tarihi', 'sembol'], ignore_index=True)
+
+
+def parametre_izgarasi(strateji, araliklar):
+    """{"hizli": [5, 10], "yavas": [50, 100]} -> geçerli parametre sözlükleri (varsayılanlarla tamamlanır)"""
+    _, (_, varsayilan, kontrol) = strateji_al(strateji)
+    bilinmeyen = set(araliklar) - set(varsayilan)
+    if bilinmeyen:
+        raise ValueError(f"{strateji} parametreleri: {', '.join(varsayilan)} (bilinmeyen: {', '.join(sorted(bilinmeyen))})")
+    adlar = list(araliklar)
+    izgara = []
+    for degerler in itertools.product(*(araliklar[ad] for ad in adlar)):
+        parametreler = {**varsayilan, **dict(zip(adlar, degerler))}
+        try:
+            kontrol(**parametreler)
+        except ValueError:
+            continue  # ör. hizli >= yavas birleşimleri taranmaz
+        izgara.append(parametreler)
+    return izgara
+
+
+# --- Süreç havuzu ---------------------------------------------------------
+
+_ISCI = None  # işçi başına (GostergeOnbellegi, maliyet, yillik_gun); matris bir kez gönderilir
+
+
+def _isci_baslat(kapanis, maliyet, yillik_gun):
+    global _ISCI
+    _ISCI = (GostergeOnbellegi(kapanis), maliyet, yillik_gun)
+
+
+def izgara_degerlendir(gostergeler, strateji, izgara, maliyet=VARSAYILAN_MALIYET, yillik_gun=YILLIK_ISLEM_GUNU):
+    """Her parametre seti için portföy metrikleri + işlem istatistikleri: [(parametreler, metrikler), ...]"""
+    sonuclar = []
+    for parametreler in izgara:
+        pozisyon = pozisyon_hesapla(gostergeler, strateji, parametreler)
+        _, portfoy = getirileri_hesapla(gostergeler.kapanis, pozisyon, maliyet)
+        metrikler = portfoy_metrikleri(pd.Series(portfoy), yillik_gun=yillik_gun)
+        metrikler.update(islem_istatistikleri(pozisyon, gostergeler.gecerli))
+        sonuclar.append((parametreler, metrikler))
+    return sonuclar
+
+
+def _izgara_parcasi(is_tanimi):
+    """(strateji, [parametreler, ...]) -> [(parametreler, metrikler), ...]"""
+    strateji, parca = is_tanimi
+    gostergeler, maliyet, yillik_gun = _ISCI
+    return izgara_degerlendir(gostergeler, strateji, parca, maliyet, yillik_gun)
+
+
+class GeriTestMotoru:
+    """Sembol listesi için fiyat panelini bir kez kurar; tek çalıştırma ve parametre taraması yapar.
+
+    fiyat_okuyucu(sembol) OHLCV DataFrame döndürür (PortfoyMotoru ile aynı sözleşme).
+    """
+
+    def __init__(self, fiyat_okuyucu, semboller, endeks="^XU100", maliyet=VARSAYILAN_MALIYET,
+                 yillik_gun=YILLIK_ISLEM_GUNU):
+        panel = fiyat_paneli(fiyat_okuyucu, list(semboller) + ([endeks] if endeks else []))
+        self.endeks_getirisi = None
+        if endeks and endeks in panel.columns:
+            self.endeks_getirisi = panel.pop(endeks).pct_change()
+        self.panel = panel.dropna(how="all")
+        self.maliyet = maliyet
+        self.yillik_gun = yillik_gun
+        self._gostergeler = None
+
+    @property
+    def gostergeler(self):
+        if self._gostergeler is None:
+            self._gostergeler = GostergeOnbellegi(self.panel.to_numpy(dtype=float))
+        return self._gostergeler
+
+    def calistir(self, strateji, **parametreler):
+        """Tek parametre seti için sermaye eğrileri, işlemler ve metrikler"""
+        strateji, (_, varsayilan, kontrol) = strateji_al(strateji)
+        parametreler = {**varsayilan, **parametreler}
+        kontrol(**parametreler)
+        if self.panel.empty:
+            return None
+        gostergeler = self.gostergeler
+        pozisyon = pozisyon_hesapla(gostergeler, strateji, parametreler)
+        net, portfoy = getirileri_hesapla(gostergeler.kapanis, pozisyon, self.maliyet)
+        tarihler = self.panel.index
+        getiri_serisi = pd.Series(portfoy, index=tarihler[1:], name="getiri")
+        sembol_getirileri = pd.DataFrame(net, index=tarihler[1:], columns=self.panel.columns)
+        metrikler = portfoy_metrikleri(getiri_serisi, self.endeks_getirisi, self.yillik_gun)
+        metrikler.update(islem_istatistikleri(pozisyon, gostergeler.gecerli))
+        islemler = islemleri_cikar(tarihler.to_numpy(), list(self.panel.columns), gostergeler.kapanis,
+                                   pozisyon, self.maliyet)
+        if len(islemler):
+            metrikler['kazanma_orani'] = float((islemler['getiri'] > 0).mean())
+        return {
+            'strateji': strateji,
+            'parametreler': parametreler,
+            'sermaye': (1 + getiri_serisi.fillna(0)).cumprod().rename("sermaye"),
+            'sembol_sermayesi': (1 + sembol_getirileri.fillna(0)).cumprod(),
+            'getiri_serisi': getiri_serisi.dropna(),
+            'islemler': islemler,
+            'metrikler': metrikler,
+            'sembol_metrikleri': pd.DataFrame(
+                {s: portfoy_metrikleri(sembol_getirileri[s], yillik_gun=self.yillik_gun)
+                 for s in sembol_getirileri.columns}
+            ).T,
+        }
+
+    def tarama(self, strateji, izgara, isci=None, sirala="sharpe"):
+        """Parametre ızgarasını (sözlük listesi) değerlendirir; her satırı bir birleşim olan tablo döndürür"""
+        strateji, _ = strateji_al(strateji)
+        izgara = list(izgara)
+        if not izgara or self.panel.empty:
+            return pd.DataFrame()
+        isci = isci or min(len(izgara), os.cpu_count() or 1)
+        if isci <= 1 or len(izgara) < 4:
+            # Küçük taramalarda süreç başlatma maliyeti hesaplamadan büyüktür
+            parcalar = [izgara_degerlendir(self.gostergeler, strateji, izgara, self.maliyet, self.yillik_gun)]
+        else:
+            # İşçi başına birkaç parça: dengesiz parametre maliyetlerinde boşta kalan işçi olmaz
+            boyut = max(1, -(-len(izgara) // (isci * 4)))
+            isler = [(strateji, izgara[i:i + boyut]) for i in range(0, len(izgara), boyut)]
+            with ProcessPoolExecutor(max_workers=isci, initializer=_isci_baslat,
+                                     initargs=(self.gostergeler.kapanis, self.maliyet, self.yillik_gun)) as havuz:
+                parcalar = list(havuz.map(_izgara_parcasi, isler))
+        satirlar = [{**parametreler, **metrikler} for parca in parcalar for parametreler, metrikler in parca]
+        tablo = pd.DataFrame(satirlar)
+        if sirala in tablo.columns:
+            tablo = tablo.sort_values(sirala, ascending=False, ignore_index=True)
+        return tablo
+
+
+def _sayi(metin):
+    deger = float(metin)
+    return int(deger) if deger.is_integer() else deger
+
+
+def parametre_araliklari(metinler):
+    """["hizli=5,10,20", "yavas=50:200:50"] -> {"hizli": [5, 10, 20], "yavas": [50, 100, 150, 200]}
+
+    a:b:c biçimi a'dan b'ye (dahil) c adımlı aralıktır.
+    """
+    araliklar = {}
+    for metin in metinler:
+        ad, ayirici, degerler = metin.partition("=")
+        if not ayirici or not degerler.strip():
+            raise ValueError(f"Parametre ad=değerler biçiminde olmalı: {metin}")
+        liste = []
+        for parca in degerler.split(","):
+            parca = parca.strip()
+            if ":" in parca:
+                bas, son, adim = (list(map(_sayi, parca.split(":"))) + [1])[:3]
+                if adim <= 0:
+                    raise ValueError(f"Adım pozitif olmalı: {parca}")
+                liste += [_sayi(round(x, 10)) for x in np.arange(bas, son + adim / 2, adim)]
+            elif parca:
+                liste.append(_sayi(parca))
+        araliklar[ad.strip()] = list(dict.fromkeys(liste))
+    return araliklar
@@ -0,0 +1,239 @@
+"""Çok sembollü, zamanlayıcı tabanlı canlı takip motoru"""
+import heapq
+import os
+import select
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+
+def izleme_listesi_oku(dosya_yolu, varsayilan_aralik=None):
+    """Her satırda 'SEMBOL' ya da 'SEMBOL,aralık_saniye' bulunan dosyayı okur; # yorumdur"""
+    liste = []
+    with open(dosya_yolu, encoding="utf-8") as f:
+        for satir in f:
+            satir = satir.split("#", 1)[0].strip()
+            if not satir:
+                continue
+            parcalar = [p.strip() for p in satir.split(",")]
+            aralik = float(parcalar[1]) if len(parcalar) > 1 and parcalar[1] else varsayilan_aralik
+            liste.append((parcalar[0], aralik))
+    return liste
+
+
+def _yuzdelik(sirali, oran):
+    if not sirali:
+        return 0.0
+    return sirali[min(len(sirali) - 1, int(oran * len(sirali)))]
+
+
+def _girdi_hazir(zaman_asimi):
+    """stdin'de okunacak satır varsa True; bloklamadan en fazla zaman_asimi bekler"""
+    if os.name == "nt":
+        import msvcrt
+        bitis = time.monotonic() + zaman_asimi
+        while time.monotonic() < bitis:
+            if msvcrt.kbhit():
+                return True
+            time.sleep(0.05)
+        return False
+    hazir, _, _ = select.select([sys.stdin], [], [], zaman_asimi)
+    return bool(hazir)
+
+
+class KlavyeDinleyici:
+    """stdin'i arka planda yoklar, 'q' girildiğinde durdurma olayını tetikler.
+
+    Olay başka bir yerden set edildiğinde kısa sürede kendiliğinden biter,
+    böylece takip bittikten sonra menünün girdisini yutmaz.
+    """
+
+    def __init__(self, durdur_olayi, cikis_tusu="q"):
+        self.durdur_olayi = durdur_olayi
+        self.cikis_tusu = cikis_tusu
+        self._is_parcacigi = threading.Thread(target=self._dinle, name="klavye", daemon=True)
+
+    def baslat(self):
+        self._is_parcacigi.start()
+        return self
+
+    def bekle(self, zaman_asimi=1.0):
+        self._is_parcacigi.join(zaman_asimi)
+
+    def _dinle(self):
+        while not self.durdur_olayi.is_set():
+            if not _girdi_hazir(0.2):
+                continue
+            satir = sys.stdin.readline()
+            if not satir or satir.strip().lower() == self.cikis_tusu:
+                self.durdur_olayi.set()
+                return
+
+
+class CanliTakipMotoru:
+    """İzleme listesindeki sembolleri kendi aralıklarıyla sorgulayıp tickleri abonelere dağıtır.
+
+    Aynı anda (birlestirme_penceresi içinde) vadesi gelen semboller tek bir
+    toplu istekle çekilir. `toplu_getir(semboller)` (sonuclar, hatalar)
+    döndürmelidir; sonuç sözlüğünde regularMarketPrice alanları beklenir.
+    """
+
+    def __init__(self, toplu_getir, varsayilan_aralik=5.0, birlestirme_penceresi=0.25,
+                 saat=time.monotonic):
+        self.toplu_getir = toplu_getir
+        self.varsayilan_aralik = varsayilan_aralik
+        self.birlestirme_penceresi = birlestirme_penceresi
+        self._saat = saat
+        self._araliklar = {}
+        self._plan = []  # (vade, sembol, nesil) min-heap
+        self._nesiller = {}  # sembol -> son ekle çağrısının nesli; eski nesilli plan girdileri atlanır
+        self._aboneler = []
+        self._kilit = threading.Lock()
+        self.durdur_olayi = threading.Event()
+        self._is_parcacigi = None
+        self._gecikmeler = deque(maxlen=10000)
+        self._baslangic = None
+        self.tick_sayisi = 0
+        self.hata_sayisi = 0
+        self.istek_sayisi = 0
+        self.abone_hatasi = 0
+
+    def ekle(self, sembol, aralik=None):
+        with self._kilit:
+            yeni = sembol not in self._araliklar
+            self._araliklar[sembol] = aralik or self.varsayilan_aralik
+            if yeni:
+                # Çıkarılıp yeniden eklenen sembolün plandaki eski girdisi yeni nesille geçersizleşir
+                nesil = self._nesiller.get(sembol, 0) + 1
+                self._nesiller[sembol] = nesil
+                heapq.heappush(self._plan, (self._saat(), sembol, nesil))
+
+    def ekle_liste(self, semboller):
+        for oge in semboller:
+            if isinstance(oge, tuple):
+                self.ekle(*oge)
+            else:
+                self.ekle(oge)
+
+    def cikar(self, sembol):
+        # Plandaki girdi, sırası geldiğinde atlanır (yeniden eklenirse nesli eskimiş olur)
+        with self._kilit:
+            self._araliklar.pop(sembol, None)
+
+    def abone_ol(self, geri_cagirim):
+        """Her tick için geri_cagirim(tick) çağrılır; tick bir sözlüktür"""
+        with self._kilit:
+            self._aboneler.append(geri_cagirim)
+        return geri_cagirim
+
+    def abonelikten_cik(self, geri_cagirim):
+        with self._kilit:
+            if geri_cagirim in self._aboneler:
+                self._aboneler.remove(geri_cagirim)
+
+    def _vadesi_gelenler(self, simdi):
+        vadeler = {}
+        with self._kilit:
+            while self._plan and self._plan[0][0] <= simdi + self.birlestirme_penceresi:
+                vade, sembol, nesil = heapq.heappop(self._plan)
+                if sembol in self._araliklar and self._nesiller[sembol] == nesil:
+                    vadeler[sembol] = (vade, nesil)
+        return vadeler
+
+    def _yeniden_planla(self, vadeler, simdi):
+        with self._kilit:
+            for sembol, (vade, nesil) in vadeler.items():
+                aralik = self._araliklar.get(sembol)
+                if aralik is None or self._nesiller[sembol] != nesil:
+                    # Tur sırasında çıkarıldı ya da yeniden eklendi; yeni girdisi zaten planda
+                    continue
+                sonraki = vade + aralik
+                if sonraki <= simdi:
+                    # Çok geride kalındıysa biriken turları art arda çalıştırma
+                    sonraki = simdi + aralik
+                heapq.heappush(self._plan, (sonraki, sembol, nesil))
+
+    def _yayinla(self, tick):
+        with self._kilit:
+            aboneler = list(self._aboneler)
+        for abone in aboneler:
+            try:
+                abone(tick)
+            except Exception as e:
+                self.abone_hatasi += 1
+                print(f"Abone hatası ({tick['sembol']}): {e}")
+
+    def tur(self):
+        """Vadesi gelen sembolleri tek istekte çeker; bir sonraki vadeye kalan süreyi döndürür"""
+        simdi = self._saat()
+        vadeler = self._vadesi_gelenler(simdi)
+        if vadeler:
+            self.istek_sayisi += 1
+            sonuclar, hatalar = self.toplu_getir(list(vadeler))
+            zaman = datetime.now()
+            for sembol, (vade, _) in vadeler.items():
+                self._gecikmeler.append(max(0.0, simdi - vade))
+                if sembol in hatalar or sembol not in sonuclar:
+                    self.hata_sayisi += 1
+                    continue
+                veri = sonuclar[sembol]
+                self.tick_sayisi += 1
+                self._yayinla({
+                    'sembol': sembol,
+                    'zaman': zaman,
+                    'fiyat': veri.get("regularMarketPrice"),
+                    'değişim': veri.get("regularMarketChangePercent"),
+                    'hacim': veri.get("regularMarketVolume"),
+                })
+            self._yeniden_planla(vadeler, self._saat())
+        with self._kilit:
+            if not self._plan:
+                return self.varsayilan_aralik
+            return max(0.0, self._plan[0][0] - self._saat())
+
+    def calistir(self, sure=None):
+        """Durdurulana ya da `sure` saniye dolana kadar çalışır (çağıranı bloklar)"""
+        self.durdur_olayi.clear()
+        self._baslangic = self._saat()
+        bitis = self._baslangic + sure if sure else None
+        try:
+            while not self.durdur_olayi.is_set():
+                bekleme = self.tur()
+                if bitis is not None:
+                    kalan = bitis - self._saat()
+                    if kalan <= 0:
+                        break
+                    bekleme = min(bekleme, kalan)
+                # Event.wait durdurma isteğine anında tepki verir
+                self.durdur_olayi.wait(bekleme)
+        finally:
+            self.durdur_olayi.set()
+
+    def baslat(self, sure=None):
+        """Motoru arka plan iş parçacığında çalıştırır"""
+        self._is_parcacigi = threading.Thread(target=self.calistir, args=(sure,), name="canli-motor", daemon=True)
+        self._is_parcacigi.start()
+        return self._is_parcacigi
+
+    def durdur(self, zaman_asimi=None):
+        self.durdur_olayi.set()
+        if self._is_parcacigi is not None:
+            self._is_parcacigi.join(zaman_asimi)
+            self._is_parcacigi = None
+
+    def istatistik(self):
+        gecen = (self._saat() - self._baslangic) if self._baslangic is not None else 0.0
+        gecikmeler = sorted(self._gecikmeler)
+        return {
+            'sembol': len(self._araliklar),
+            'tick': self.tick_sayisi,
+            'istek': self.istek_sayisi,
+            'hata': self.hata_sayisi,
+            'abone_hatasi': self.abone_hatasi,
+            'tick_saniye': self.tick_sayisi / gecen if gecen > 0 else 0.0,
+            'gecikme_p50': _yuzdelik(gecikmeler, 0.50),
+            'gecikme_p99': _yuzdelik(gecikmeler, 0.99),
+            'gecikme_max': gecikmeler[-1] if gecikmeler else 0.0,
+        }
@@ -0,0 +1,916 @@
+"""Kalıcı depolama arayüzü ve arka uçları (MySQL, gömülü SQLite + Parquet)"""
+import glob
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+import pandas as pd
+
+from borsa_donusum import OZELLIK_SUTUNLARI, bar_kayitlari, fiyat_kayitlari, ozellik_kayitlari, parcala
+from borsa_veritabani import mysql_havuzu, sqlite_havuzu
+
+# yfinance sütun adı -> depo sütun adı
+FIYAT_SUTUN_ESLEME = {
+    "Open": "open_price",
+    "High": "high_price",
+    "Low": "low_price",
+    "Close": "close_price",
+    "Volume": "volume",
+}
+
+
+def _fiyat_cercevesi(rows, sutunlar):
+    """(ts, ...) satırlarını yfinance biçimindeki DataFrame'e çevirir"""
+    df = pd.DataFrame.from_records(rows, columns=["Date"] + list(sutunlar))
+    return df.set_index(pd.DatetimeIndex(df.pop("Date"), name="Date"))
+
+
+def _sembol_cercevesi(rows, sutunlar):
+    """(symbol, ...) satırlarını symbol indeksli DataFrame'e çevirir"""
+    df = pd.DataFrame.from_records(rows, columns=["symbol"] + list(sutunlar))
+    return df.set_index("symbol")
+
+
+def _sembol_kosulu(semboller, yer_tutucu):
+    """İsteğe bağlı sembol süzgeci için WHERE parçası ve parametreleri"""
+    if semboller is None:
+        return "", []
+    semboller = list(semboller)
+    if not semboller:
+        return " WHERE 1 = 0", []
+    return f" WHERE symbol IN ({', '.join([yer_tutucu] * len(semboller))})", semboller
+
+
+class Depo:
+    """Uygulamanın kullandığı depolama işlemleri; arka uçlar bu sınıftan türer"""
+
+    def kullanilabilir(self):
+        return True
+
+    def sembol_kaydet(self, symbol_code, info_dict):
+        raise NotImplementedError
+
+    def fiyat_kaydet(self, symbol_code, df):
+        """Fiyat geçmişini (symbol, ts) anahtarıyla upsert eder, yazılan satır sayısını döndürür"""
+        raise NotImplementedError
+
+    def fiyat_araligi(self, symbol_code):
+        """Depodaki ilk ve son bar zamanı, veri yoksa (None, None)"""
+        raise NotImplementedError
+
+    def fiyat_oku(self, symbol_code, start=None, end=None, sutunlar=None):
+        """Fiyat geçmişini yfinance biçiminde okur; `sutunlar` yalnızca istenen OHLCV sütunlarını yükler"""
+        raise NotImplementedError
+
+    def semboller_oku(self, semboller=None):
+        """symbols tablosunu symbol indeksli (name, sector, market_cap) DataFrame olarak okur"""
+        raise NotImplementedError
+
+    def ozellikleri_kaydet(self, df):
+        """symbol indeksli özellik tablosunu (ts + OZELLIK_SUTUNLARI) symbol_features'a upsert eder"""
+        raise NotImplementedError
+
+    def ozellikleri_oku(self, semboller=None):
+        """Saklanan özellikleri symbol indeksli DataFrame olarak okur; ts son işlenen barın zamanıdır"""
+        raise NotImplementedError
+
+    def barlari_kaydet(self, symbol_code, bar_interval, df):
+        """Gün içi barları (symbol, bar_interval, ts) anahtarıyla price_bars tablosuna upsert eder"""
+        raise NotImplementedError
+
+    def barlari_oku(self, symbol_code, bar_interval, start=None, end=None):
+        """Gün içi barları yfinance biçiminde, TickCount sütunuyla birlikte okur"""
+        raise NotImplementedError
+
+    def tickleri_kaydet(self, records):
+        """(symbol, ts, price, change_percent, volume) listesini tek seferde yazar; volume günlük kümülatif hacimdir"""
+        raise NotImplementedError
+
+    def tick_partisi(self, son_id, limit):
+        """id'si son_id'den büyük en fazla `limit` tick için (id, symbol, ts) listesi, id sırasıyla"""
+        raise NotImplementedError
+
+    def tickleri_oku(self, symbol_code, start, end):
+        """[start, end) aralığındaki tickleri Price/Volume sütunlu, zaman indeksli DataFrame olarak okur"""
+        raise NotImplementedError
+
+    def eski_tickleri_sil(self, sinir, son_id, limit):
+        """ts < sinir ve id <= son_id olan en eski `limit` tick'i siler, silinen sayıyı döndürür"""
+        raise NotImplementedError
+
+    def durum_oku(self, ad):
+        """Arka plan işlerinin (ör. sıkıştırma su seviyesi) kalıcı durum değeri; yoksa None"""
+        raise NotImplementedError
+
+    def durum_yaz(self, ad, deger):
+        raise NotImplementedError
+
+    def portfoy_kaydet(self, items):
+        """(symbol, lot, price, value) satırlarından bir portföy anlık görüntüsü yazar"""
+        raise NotImplementedError
+
+    def alarmlari_kaydet(self, records):
+        """(rule_id, rule_text, symbol, ts, field, value, threshold) listesini yazar; aynı (kural, sembol, ts) yok sayılır"""
+        raise NotImplementedError
+
+    def kapat(self):
+        pass
+
+
+class BosDepo(Depo):
+    """Hiçbir şey saklamayan depo: servis istemcisi yazmaz, geçmişi her seferinde sağlayıcıdan (servisten) alır.
+
+    Yazımlar yok sayılır, okumalar boş döner; `kullanilabilir()` False olduğundan
+    uygulama depoya dayalı yolları zaten atlar.
+    """
+
+    def kullanilabilir(self):
+        return False
+
+    def sembol_kaydet(self, symbol_code, info_dict):
+        pass
+
+    def fiyat_kaydet(self, symbol_code, df):
+        return 0
+
+    def fiyat_araligi(self, symbol_code):
+        return None, None
+
+    def fiyat_oku(self, symbol_code, start=None, end=None, sutunlar=None):
+        return _fiyat_cercevesi([], list(sutunlar or FIYAT_SUTUN_ESLEME))
+
+    def semboller_oku(self, semboller=None):
+        return _sembol_cercevesi([], ["name", "sector", "market_cap"])
+
+    def ozellikleri_kaydet(self, df):
+        return 0
+
+    def ozellikleri_oku(self, semboller=None):
+        df = _sembol_cercevesi([], ("ts",) + OZELLIK_SUTUNLARI)
+        df["ts"] = pd.to_datetime(df["ts"])
+        return df
+
+    def barlari_kaydet(self, symbol_code, bar_interval, df):
+        return 0
+
+    def barlari_oku(self, symbol_code, bar_interval, start=None, end=None):
+        return _fiyat_cercevesi([], list(FIYAT_SUTUN_ESLEME) + ["TickCount"])
+
+    def tickleri_kaydet(self, records):
+        pass
+
+    def tick_partisi(self, son_id, limit):
+        return []
+
+    def tickleri_oku(self, symbol_code, start, end):
+        return _fiyat_cercevesi([], ["Price", "Volume"])
+
+    def eski_tickleri_sil(self, sinir, son_id, limit):
+        return 0
+
+    def durum_oku(self, ad):
+        return None
+
+    def durum_yaz(self, ad, deger):
+        pass
+
+    def portfoy_kaydet(self, items):
+        pass
+
+    def alarmlari_kaydet(self, records):
+        pass
+
+
+class MySQLDepo(Depo):
+    """Bağlantı havuzu üzerinden MySQL/MariaDB'ye yazan satır tabanlı arka uç"""
+
+    def __init__(self, db=None):
+        self.db = db or mysql_havuzu(kurulum=self._ensure_tables)
+        self.db.isit()
+
+    def kullanilabilir(self):
+        return self.db.kullanilabilir()
+
+    def _ensure_tables(self, conn):
+        """Havuz ilk bağlantıyı açtığında çağrılır; hata yukarı iletilir, havuz sonraki bağlantıda yeniden dener"""
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS symbols (
+                    symbol VARCHAR(32) PRIMARY KEY,
+                    name VARCHAR(255),
+                    sector VARCHAR(255),
+                    market_cap BIGINT
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS prices (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    symbol VARCHAR(32),
+                    ts DATETIME,
+                    open_price DOUBLE,
+                    high_price DOUBLE,
+                    low_price DOUBLE,
+                    close_price DOUBLE,
+                    volume DOUBLE,
+                    UNIQUE KEY uq_prices_symbol_ts (symbol, ts)
+                )
+                """
+            )
+            self._ensure_price_unique_key(cursor)
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS price_bars (
+                    symbol VARCHAR(32),
+                    bar_interval VARCHAR(8),
+                    ts DATETIME,
+                    open_price DOUBLE,
+                    high_price DOUBLE,
+                    low_price DOUBLE,
+                    close_price DOUBLE,
+                    volume DOUBLE,
+                    tick_count INT,
+                    PRIMARY KEY (symbol, bar_interval, ts)
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS live_ticks (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    symbol VARCHAR(32),
+                    ts DATETIME,
+                    price DOUBLE,
+                    change_percent DOUBLE,
+                    volume DOUBLE,
+                    INDEX idx_live_symbol_ts (symbol, ts)
+                )
+                """
+            )
+            self._ensure_tick_volume(cursor)
+            cursor.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS symbol_features (
+                    symbol VARCHAR(32) PRIMARY KEY,
+                    ts DATETIME,
+                    {", ".join(f"{ad} DOUBLE" for ad in OZELLIK_SUTUNLARI)}
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_state (
+                    name VARCHAR(64) PRIMARY KEY,
+                    value VARCHAR(255)
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS alerts (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    rule_id VARCHAR(16),
+                    rule_text VARCHAR(255),
+                    symbol VARCHAR(32),
+                    ts DATETIME,
+                    field VARCHAR(32),
+                    value DOUBLE,
+                    threshold DOUBLE,
+                    UNIQUE KEY uq_alerts_rule_symbol_ts (rule_id, symbol, ts)
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    created_at DATETIME,
+                    total_value DOUBLE
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS portfolio_lines (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    snapshot_id BIGINT,
+                    symbol VARCHAR(32),
+                    lot INT,
+                    price DOUBLE,
+                    value DOUBLE,
+                    INDEX idx_snapshot (snapshot_id)
+                )
+                """
+            )
+            conn.commit()
+        except Exception as e:
+            print(f"Tablo oluşturma hatası: {e}")
+            raise
+        finally:
+            cursor.close()
+
+    def _ensure_tick_volume(self, cursor):
+        """Eski kurulumlardaki live_ticks tablosuna hacim sütununu ekler"""
+        cursor.execute(
+            """
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = 'live_ticks' AND column_name = 'volume'
+            """
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute("ALTER TABLE live_ticks ADD COLUMN volume DOUBLE")
+
+    def _ensure_price_unique_key(self, cursor):
+        """Eski kurulumlardaki prices tablosunu tekilleştirip (symbol, ts) tekil anahtarını ekler"""
+        cursor.execute(
+            """
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = 'prices'
+              AND index_name = 'uq_prices_symbol_ts'
+            """
+        )
+        if cursor.fetchone()[0]:
+            return
+        print("prices tablosu tekilleştiriliyor...")
+        cursor.execute(
+            """
+            DELETE p1 FROM prices p1
+            JOIN prices p2 ON p1.symbol = p2.symbol AND p1.ts = p2.ts AND p1.id > p2.id
+            """
+        )
+        cursor.execute("ALTER TABLE prices ADD UNIQUE KEY uq_prices_symbol_ts (symbol, ts)")
+        cursor.execute("ALTER TABLE prices DROP INDEX idx_symbol_ts")
+
+    def sembol_kaydet(self, symbol_code, info_dict):
+        with self.db.imlec() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO symbols (symbol, name, sector, market_cap)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    name = VALUES(name),
+                    sector = VALUES(sector),
+                    market_cap = VALUES(market_cap)
+                """,
+                (
+                    symbol_code,
+                    info_dict.get("longName"),
+                    info_dict.get("sector"),
+                    info_dict.get("marketCap")
+                )
+            )
+
+    def semboller_oku(self, semboller=None):
+        kosul, params = _sembol_kosulu(semboller, "%s")
+
+        def oku(cursor):
+            cursor.execute("SELECT symbol, name, sector, market_cap FROM symbols" + kosul, params)
+            return cursor.fetchall()
+        return _sembol_cercevesi(self.db.calistir(oku), ["name", "sector", "market_cap"])
+
+    def ozellikleri_kaydet(self, df):
+        sutunlar = ", ".join(OZELLIK_SUTUNLARI)
+        guncelle = ", ".join(f"{ad} = VALUES({ad})" for ad in ("ts",) + OZELLIK_SUTUNLARI)
+        yer = ", ".join(["%s"] * (len(OZELLIK_SUTUNLARI) + 2))
+        yazilan = 0
+        with self.db.imlec() as cursor:
+            for records in parcala(ozellik_kayitlari(df)):
+                cursor.executemany(
+                    f"INSERT INTO symbol_features (symbol, ts, {sutunlar}) VALUES ({yer}) "
+                    f"ON DUPLICATE KEY UPDATE {guncelle}",
+                    records
+                )
+                yazilan += len(records)
+        return yazilan
+
+    def ozellikleri_oku(self, semboller=None):
+        kosul, params = _sembol_kosulu(semboller, "%s")
+
+        def oku(cursor):
+            cursor.execute(f"SELECT symbol, ts, {', '.join(OZELLIK_SUTUNLARI)} FROM symbol_features" + kosul, params)
+            return cursor.fetchall()
+        df = _sembol_cercevesi(self.db.calistir(oku), ("ts",) + OZELLIK_SUTUNLARI)
+        df["ts"] = pd.to_datetime(df["ts"])
+        return df
+
+    def fiyat_kaydet(self, symbol_code, df):
+        yazilan = 0
+        with self.db.imlec() as cursor:
+            # Kayıtlar sütun bazlı hazırlanır, sürücüye sabit boyutlu partiler halinde akıtılır
+            for records in parcala(fiyat_kayitlari(symbol_code, df)):
+                cursor.executemany(
+                    """
+                    INSERT INTO prices (symbol, ts, open_price, high_price, low_price, close_price, volume)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE
+                        open_price = VALUES(open_price),
+                        high_price = VALUES(high_price),
+                        low_price = VALUES(low_price),
+                        close_price = VALUES(close_price),
+                        volume = VALUES(volume)
+                    """,
+                    records
+                )
+                yazilan += len(records)
+        return yazilan
+
+    def fiyat_araligi(self, symbol_code):
+        def oku(cursor):
+            cursor.execute("SELECT MIN(ts), MAX(ts) FROM prices WHERE symbol = %s", (symbol_code,))
+            return cursor.fetchone()
+        ilk, son = self.db.calistir(oku)
+        return ilk, son
+
+    def fiyat_oku(self, symbol_code, start=None, end=None, sutunlar=None):
+        sutunlar = list(sutunlar or FIYAT_SUTUN_ESLEME)
+        sql = f"""
+            SELECT ts, {", ".join(FIYAT_SUTUN_ESLEME[s] for s in sutunlar)}
+            FROM prices WHERE symbol = %s
+        """
+        params = [symbol_code]
+        if start is not None:
+            sql += " AND ts >= %s"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts < %s"
+            params.append(end)
+
+        def oku(cursor):
+            cursor.execute(sql + " ORDER BY ts", params)
+            return cursor.fetchall()
+        return _fiyat_cercevesi(self.db.calistir(oku), sutunlar)
+
+    def barlari_kaydet(self, symbol_code, bar_interval, df):
+        yazilan = 0
+        with self.db.imlec() as cursor:
+            for records in parcala(bar_kayitlari(symbol_code, bar_interval, df)):
+                cursor.executemany(
+                    """
+                    INSERT INTO price_bars
+                        (symbol, bar_interval, ts, open_price, high_price, low_price, close_price, volume, tick_count)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE
+                        open_price = VALUES(open_price),
+                        high_price = VALUES(high_price),
+                        low_price = VALUES(low_price),
+                        close_price = VALUES(close_price),
+                        volume = VALUES(volume),
+                        tick_count = VALUES(tick_count)
+                    """,
+                    records
+                )
+                yazilan += len(records)
+        return yazilan
+
+    def barlari_oku(self, symbol_code, bar_interval, start=None, end=None):
+        sql = """
+            SELECT ts, open_price, high_price, low_price, close_price, volume, tick_count
+            FROM price_bars WHERE symbol = %s AND bar_interval = %s
+        """
+        params = [symbol_code, bar_interval]
+        if start is not None:
+            sql += " AND ts >= %s"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts < %s"
+            params.append(end)
+
+        def oku(cursor):
+            cursor.execute(sql + " ORDER BY ts", params)
+            return cursor.fetchall()
+        return _fiyat_cercevesi(self.db.calistir(oku), list(FIYAT_SUTUN_ESLEME) + ["TickCount"])
+
+    def tickleri_kaydet(self, records):
+        def yaz(cursor):
+            cursor.executemany(
+                """
+                INSERT INTO live_ticks (symbol, ts, price, change_percent, volume)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                records
+            )
+        # Çağıran iş parçacığı havuzdan kendi bağlantısını alır; kopmuşsa yenisiyle tekrar dener
+        self.db.calistir(yaz)
+
+    def tick_partisi(self, son_id, limit):
+        def oku(cursor):
+            cursor.execute(
+                "SELECT id, symbol, ts FROM live_ticks WHERE id > %s ORDER BY id LIMIT %s",
+                (son_id, int(limit))
+            )
+            return cursor.fetchall()
+        return self.db.calistir(oku)
+
+    def tickleri_oku(self, symbol_code, start, end):
+        def oku(cursor):
+            cursor.execute(
+                "SELECT ts, price, volume FROM live_ticks WHERE symbol = %s AND ts >= %s AND ts < %s ORDER BY ts, id",
+                (symbol_code, start, end)
+            )
+            return cursor.fetchall()
+        return _fiyat_cercevesi(self.db.calistir(oku), ["Price", "Volume"])
+
+    def eski_tickleri_sil(self, sinir, son_id, limit):
+        def sil(cursor):
+            # Birincil anahtar sırasıyla sınırlı silme; her parti kısa bir işlemdir
+            cursor.execute(
+                "DELETE FROM live_ticks WHERE ts < %s AND id <= %s ORDER BY id LIMIT %s",
+                (sinir, son_id, int(limit))
+            )
+            return cursor.rowcount
+        return self.db.calistir(sil)
+
+    def durum_oku(self, ad):
+        def oku(cursor):
+            cursor.execute("SELECT value FROM job_state WHERE name = %s", (ad,))
+            satir = cursor.fetchone()
+            return satir[0] if satir else None
+        return self.db.calistir(oku)
+
+    def durum_yaz(self, ad, deger):
+        def yaz(cursor):
+            cursor.execute(
+                "INSERT INTO job_state (name, value) VALUES (%s, %s) ON DUPLICATE KEY UPDATE value = VALUES(value)",
+                (ad, str(deger))
+            )
+        self.db.calistir(yaz)
+
+    def portfoy_kaydet(self, items):
+        total_value = sum(item[3] for item in items)
+        with self.db.imlec() as cursor:
+            cursor.execute(
+                "INSERT INTO portfolio_snapshots (created_at, total_value) VALUES (%s, %s)",
+                (datetime.now(), total_value)
+            )
+            snapshot_id = cursor.lastrowid
+            cursor.executemany(
+                """
+                INSERT INTO portfolio_lines (snapshot_id, symbol, lot, price, value)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                [(snapshot_id, symbol_code, lot, price, value) for symbol_code, lot, price, value in items]
+            )
+
+    def alarmlari_kaydet(self, records):
+        def yaz(cursor):
+            cursor.executemany(
+                """
+                INSERT IGNORE INTO alerts (rule_id, rule_text, symbol, ts, field, value, threshold)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """,
+                records
+            )
+        self.db.calistir(yaz)
+
+    def kapat(self):
+        self.db.kapat()
+
+
+class GomuluDepo(Depo):
+    """Sunucusuz arka uç: meta veriler ve tickler SQLite'ta, fiyat geçmişi Parquet'te.
+
+    Fiyatlar sembole göre bölümlenmiş, yıl başına bir dosya olarak tutulur
+    (prices/symbol=THYAO.IS/2024.parquet). Aralık okumaları yalnızca ilgili
+    yılların dosyalarını ve istenen sütunları yükler; yazım yalnızca
+    etkilenen yıl dosyalarını yeniden yazar.
+    """
+
+    def __init__(self, kok=None):
+        self.kok = kok or os.getenv("BORSA_VERI_DIZINI", "borsa_veri")
+        self.fiyat_dizini = os.path.join(self.kok, "prices")
+        os.makedirs(self.fiyat_dizini, exist_ok=True)
+        self.db = sqlite_havuzu(os.path.join(self.kok, "borsa.sqlite"), kurulum=self._ensure_tables)
+        self._sembol_kilitleri = defaultdict(threading.Lock)
+
+    def kullanilabilir(self):
+        return self.db.kullanilabilir()
+
+    def _ensure_tables(self, conn):
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS symbols (
+                symbol TEXT PRIMARY KEY,
+                name TEXT,
+                sector TEXT,
+                market_cap INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS live_ticks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT,
+                ts TEXT,
+                price REAL,
+                change_percent REAL,
+                volume REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_live_symbol_ts ON live_ticks (symbol, ts);
+            CREATE TABLE IF NOT EXISTS price_bars (
+                symbol TEXT,
+                bar_interval TEXT,
+                ts TEXT,
+                open_price REAL,
+                high_price REAL,
+                low_price REAL,
+                close_price REAL,
+                volume REAL,
+                tick_count INTEGER,
+                PRIMARY KEY (symbol, bar_interval, ts)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS symbol_features (
+                symbol TEXT PRIMARY KEY,
+                ts TEXT,
+                %s
+            );
+            CREATE TABLE IF NOT EXISTS job_state (
+                name TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                rule_id TEXT,
+                rule_text TEXT,
+                symbol TEXT,
+                ts TEXT,
+                field TEXT,
+                value REAL,
+                threshold REAL,
+                UNIQUE (rule_id, symbol, ts)
+            );
+            CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT,
+                total_value REAL
+            );
+            CREATE TABLE IF NOT EXISTS portfolio_lines (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                snapshot_id INTEGER,
+                symbol TEXT,
+                lot INTEGER,
+                price REAL,
+                value REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_snapshot ON portfolio_lines (snapshot_id);
+            """ % ", ".join(f"{ad} REAL" for ad in OZELLIK_SUTUNLARI)
+        )
+        # Eski kurulumlardaki live_ticks tablosuna hacim sütunu eklenir
+        if "volume" not in [satir[1] for satir in conn.execute("PRAGMA table_info(live_ticks)")]:
+            conn.execute("ALTER TABLE live_ticks ADD COLUMN volume REAL")
+        conn.commit()
+
+    def _sembol_dizini(self, symbol_code):
+        return os.path.join(self.fiyat_dizini, f"symbol={symbol_code}")
+
+    def _yil_dosyalari(self, symbol_code, ilk_yil=None, son_yil=None):
+        dosyalar = []
+        for yol in sorted(glob.glob(os.path.join(self._sembol_dizini(symbol_code), "*.parquet"))):
+            yil = int(os.path.splitext(os.path.basename(yol))[0])
+            if (ilk_yil is None or yil >= ilk_yil) and (son_yil is None or yil <= son_yil):
+                dosyalar.append(yol)
+        return dosyalar
+
+    def sembol_kaydet(self, symbol_code, info_dict):
+        with self.db.imlec() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO symbols (symbol, name, sector, market_cap)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(symbol) DO UPDATE SET
+                    name = excluded.name,
+                    sector = excluded.sector,
+                    market_cap = excluded.market_cap
+                """,
+                (
+                    symbol_code,
+                    info_dict.get("longName"),
+                    info_dict.get("sector"),
+                    info_dict.get("marketCap")
+                )
+            )
+
+    def semboller_oku(self, semboller=None):
+        kosul, params = _sembol_kosulu(semboller, "?")
+
+        def oku(cursor):
+            cursor.execute("SELECT symbol, name, sector, market_cap FROM symbols" + kosul, params)
+            return cursor.fetchall()
+        return _sembol_cercevesi(self.db.calistir(oku), ["name", "sector", "market_cap"])
+
+    def ozellikleri_kaydet(self, df):
+        sutunlar = ", ".join(OZELLIK_SUTUNLARI)
+        guncelle = ", ".join(f"{ad} = excluded.{ad}" for ad in ("ts",) + OZELLIK_SUTUNLARI)
+        yer = ", ".join(["?"] * (len(OZELLIK_SUTUNLARI) + 2))
+        yazilan = 0
+        with self.db.imlec() as cursor:
+            for records in parcala(ozellik_kayitlari(df)):
+                cursor.executemany(
+                    f"INSERT INTO symbol_features (symbol, ts, {sutunlar}) VALUES ({yer}) "
+                    f"ON CONFLICT(symbol) DO UPDATE SET {guncelle}",
+                    [(s, ts.isoformat(sep=" "), *degerler) for s, ts, *degerler in records]
+                )
+                yazilan += len(records)
+        return yazilan
+
+    def ozellikleri_oku(self, semboller=None):
+        kosul, params = _sembol_kosulu(semboller, "?")
+
+        def oku(cursor):
+            cursor.execute(f"SELECT symbol, ts, {', '.join(OZELLIK_SUTUNLARI)} FROM symbol_features" + kosul, params)
+            return cursor.fetchall()
+        df = _sembol_cercevesi(self.db.calistir(oku), ("ts",) + OZELLIK_SUTUNLARI)
+        df["ts"] = pd.to_datetime(df["ts"])
+        return df
+
+    def fiyat_kaydet(self, symbol_code, df):
+        index = df.index.tz_localize(None) if getattr(df.index, 'tz', None) is not None else df.index
+        yeni = pd.DataFrame({"ts": pd.DatetimeIndex(index).astype("datetime64[ns]")})
+        for kaynak, hedef in FIYAT_SUTUN_ESLEME.items():
+            yeni[hedef] = df[kaynak].to_numpy(dtype=float) if kaynak in df.columns else float("nan")
+        dizin = self._sembol_dizini(symbol_code)
+        os.makedirs(dizin, exist_ok=True)
+        with self._sembol_kilitleri[symbol_code]:
+            for yil, parca in yeni.groupby(yeni["ts"].dt.year):
+                yol = os.path.join(dizin, f"{yil}.parquet")
+                if os.path.exists(yol):
+                    parca = pd.concat([pd.read_parquet(yol), parca], ignore_index=True)
+                parca = parca.drop_duplicates("ts", keep="last").sort_values("ts")
+                gecici = yol + ".tmp"
+                parca.to_parquet(gecici, index=False)
+                os.replace(gecici, yol)  # okuyucular yarım dosya görmez
+        return len(yeni)
+
+    def fiyat_araligi(self, symbol_code):
+        dosyalar = self._yil_dosyalari(symbol_code)
+        if not dosyalar:
+            return None, None
+        ilk = pd.read_parquet(dosyalar[0], columns=["ts"])["ts"].min()
+        son = pd.read_parquet(dosyalar[-1], columns=["ts"])["ts"].max()
+        return ilk.to_pydatetime(), son.to_pydatetime()
+
+    def fiyat_oku(self, symbol_code, start=None, end=None, sutunlar=None):
+        sutunlar = list(sutunlar or FIYAT_SUTUN_ESLEME)
+        depo_sutunlari = [FIYAT_SUTUN_ESLEME[s] for s in sutunlar]
+        dosyalar = self._yil_dosyalari(
+            symbol_code,
+            start.year if start is not None else None,
+            end.year if end is not None else None,
+        )
+        if not dosyalar:
+            return _fiyat_cercevesi([], sutunlar)
+        df = pd.concat(
+            [pd.read_parquet(yol, columns=["ts"] + depo_sutunlari) for yol in dosyalar],
+            ignore_index=True,
+        )
+        if start is not None:
+            df = df[df["ts"] >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df["ts"] < pd.Timestamp(end)]
+        df = df.rename(columns={v: k for k, v in FIYAT_SUTUN_ESLEME.items()})
+        return df.set_index(pd.DatetimeIndex(df.pop("ts"), name="Date"))
+
+    def barlari_kaydet(self, symbol_code, bar_interval, df):
+        # Gün içi barlar Parquet yerine SQLite'ta tutulur: pencereler küçük, upsert ve sıkıştırma satır bazlıdır
+        yazilan = 0
+        with self.db.imlec() as cursor:
+            for records in parcala(bar_kayitlari(symbol_code, bar_interval, df)):
+                cursor.executemany(
+                    """
+                    INSERT INTO price_bars
+                        (symbol, bar_interval, ts, open_price, high_price, low_price, close_price, volume, tick_count)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(symbol, bar_interval, ts) DO UPDATE SET
+                        open_price = excluded.open_price,
+                        high_price = excluded.high_price,
+                        low_price = excluded.low_price,
+                        close_price = excluded.close_price,
+                        volume = excluded.volume,
+                        tick_count = excluded.tick_count
+                    """,
+                    [(s, i, ts.isoformat(sep=" "), *degerler) for s, i, ts, *degerler in records]
+                )
+                yazilan += len(records)
+        return yazilan
+
+    def barlari_oku(self, symbol_code, bar_interval, start=None, end=None):
+        sql = """
+            SELECT ts, open_price, high_price, low_price, close_price, volume, tick_count
+            FROM price_bars WHERE symbol = ? AND bar_interval = ?
+        """
+        params = [symbol_code, bar_interval]
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(start.isoformat(sep=" "))
+        if end is not None:
+            sql += " AND ts < ?"
+            params.append(end.isoformat(sep=" "))
+
+        def oku(cursor):
+            cursor.execute(sql + " ORDER BY ts", params)
+            return cursor.fetchall()
+        return _fiyat_cercevesi(self.db.calistir(oku), list(FIYAT_SUTUN_ESLEME) + ["TickCount"])
+
+    def tickleri_kaydet(self, records):
+        def yaz(cursor):
+            cursor.executemany(
+                "INSERT INTO live_ticks (symbol, ts, price, change_percent, volume) VALUES (?, ?, ?, ?, ?)",
+                [(s, ts.isoformat(sep=" "), p, c, v) for s, ts, p, c, v in records]
+            )
+        self.db.calistir(yaz)
+
+    def tick_partisi(self, son_id, limit):
+        def oku(cursor):
+            cursor.execute(
+                "SELECT id, symbol, ts FROM live_ticks WHERE id > ? ORDER BY id LIMIT ?",
+                (son_id, int(limit))
+            )
+            return [(i, s, datetime.fromisoformat(ts)) for i, s, ts in cursor.fetchall()]
+        return self.db.calistir(oku)
+
+    def tickleri_oku(self, symbol_code, start, end):
+        def oku(cursor):
+            cursor.execute(
+                "SELECT ts, price, volume FROM live_ticks WHERE symbol = ? AND ts >= ? AND ts < ? ORDER BY ts, id",
+                (symbol_code, start.isoformat(sep=" "), end.isoformat(sep=" "))
+            )
+            return cursor.fetchall()
+        return _fiyat_cercevesi(self.db.calistir(oku), ["Price", "Volume"])
+
+    def eski_tickleri_sil(self, sinir, son_id, limit):
+        def sil(cursor):
+            # SQLite DELETE ... LIMIT desteklemez; en eski id'ler alt sorguyla sınırlanır
+            cursor.execute(
+                """
+                DELETE FROM live_ticks WHERE id IN (
+                    SELECT id FROM live_ticks WHERE ts < ? AND id <= ? ORDER BY id LIMIT ?
+                )
+                """,
+                (sinir.isoformat(sep=" "), son_id, int(limit))
+            )
+            return cursor.rowcount
+        return self.db.calistir(sil)
+
+    def durum_oku(self, ad):
+        def oku(cursor):
+            cursor.execute("SELECT value FROM job_state WHERE name = ?", (ad,))
+            satir = cursor.fetchone()
+            return satir[0] if satir else None
+        return self.db.calistir(oku)
+
+    def durum_yaz(self, ad, deger):
+        def yaz(cursor):
+            cursor.execute(
+                "INSERT INTO job_state (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (ad, str(deger))
+            )
+        self.db.calistir(yaz)
+
+    def portfoy_kaydet(self, items):
+        total_value = sum(item[3] for item in items)
+        with self.db.imlec() as cursor:
+            cursor.execute(
+                "INSERT INTO portfolio_snapshots (created_at, total_value) VALUES (?, ?)",
+                (datetime.now().isoformat(sep=" "), total_value)
+            )
+            snapshot_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT INTO portfolio_lines (snapshot_id, symbol, lot, price, value) VALUES (?, ?, ?, ?, ?)",
+                [(snapshot_id, symbol_code, lot, price, value) for symbol_code, lot, price, value in items]
+            )
+
+    def alarmlari_kaydet(self, records):
+        def yaz(cursor):
+            cursor.executemany(
+                """
+                INSERT OR IGNORE INTO alerts (rule_id, rule_text, symbol, ts, field, value, threshold)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [(k, m, s, ts.isoformat(sep=" "), a, d, e) for k, m, s, ts, a, d, e in records]
+            )
+        self.db.calistir(yaz)
+
+    def kapat(self):
+        self.db.kapat()
+
+
+DEPOLAR = {
+    "mysql": MySQLDepo,
+    "gomulu": GomuluDepo,
+    "yok": BosDepo,
+}
+
+
+def depo_olustur(tur=None):
+    """BORSA_DEPO ortam değişkenine (mysql | gomulu | yok) göre arka ucu seçer"""
+    tur = (tur or os.getenv("BORSA_DEPO", "mysql")).lower()
+    if tur not in DEPOLAR:
+        raise ValueError(f"Bilinmeyen depo türü: {tur} (seçenekler: {', '.join(DEPOLAR)})")
+    if tur == "gomulu":
+        # Parquet yazımı pyarrow ister; eksikse ilk fiyat yazımında derinde değil, burada belirtilir
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("Gömülü depo (BORSA_DEPO=gomulu) Parquet dosyaları için pyarrow gerektirir: "
+                              "pip install pyarrow") from None
+    return DEPOLAR[tur]()
@@ -0,0 +1,68 @@
+"""Fiyat DataFrame'lerini veritabanı parametrelerine sütun bazlı dönüştürme"""
+from itertools import islice, repeat
+
+import numpy as np
+
+FIYAT_SUTUNLARI = ("Open", "High", "Low", "Close", "Volume")
+# Tarayıcının sembol başına sakladığı özellikler (symbol_features tablosunun sütunları)
+OZELLIK_SUTUNLARI = (
+    "close", "volume", "ret_1d", "ret_5d", "ret_20d", "ret_60d", "ret_250d",
+    "avg_volume_20", "sma_20", "sma_50", "sma_200", "rsi_14", "volatility_20", "high_52w", "low_52w",
+)
+PARTI_BOYUTU = 5000
+
+
+def _sutun_listesi(df, ad):
+    if ad not in df.columns:
+        return repeat(None, len(df))
+    degerler = df[ad].to_numpy(dtype=float, na_value=np.nan)
+    eksik = np.isnan(degerler)
+    if not eksik.any():
+        return degerler.tolist()
+    # Sürücüler NaN kabul etmez, eksik hücreler NULL yazılır
+    nesne = degerler.astype(object)
+    nesne[eksik] = None
+    return nesne.tolist()
+
+
+def fiyat_kayitlari(symbol_code, df):
+    """DataFrame'i (symbol, ts, open, high, low, close, volume) demetlerine çeviren tembel iterator.
+
+    Saat dilimi ve tip dönüşümleri satır başına değil, tüm sütun için bir kez yapılır.
+    """
+    index = df.index
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_localize(None)
+    zamanlar = index.to_pydatetime().tolist() if hasattr(index, 'to_pydatetime') else list(index)
+    sutunlar = [_sutun_listesi(df, ad) for ad in FIYAT_SUTUNLARI]
+    return zip(repeat(symbol_code), zamanlar, *sutunlar)
+
+
+def bar_kayitlari(symbol_code, bar_interval, df):
+    """Gün içi barları (symbol, bar_interval, ts, open, high, low, close, volume, tick_count) demetlerine çevirir.
+
+    `TickCount` sütunu yoksa tick_count NULL yazılır (sağlayıcıdan gelen barlar).
+    """
+    index = df.index
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_localize(None)
+    zamanlar = index.to_pydatetime().tolist() if hasattr(index, 'to_pydatetime') else list(index)
+    sutunlar = [_sutun_listesi(df, ad) for ad in FIYAT_SUTUNLARI + ("TickCount",)]
+    return zip(repeat(symbol_code), repeat(bar_interval), zamanlar, *sutunlar)
+
+
+def ozellik_kayitlari(df):
+    """symbol indeksli özellik tablosunu (symbol, ts, *OZELLIK_SUTUNLARI) demetlerine çevirir"""
+    zamanlar = [ts.to_pydatetime() for ts in df["ts"]]
+    sutunlar = [_sutun_listesi(df, ad) for ad in OZELLIK_SUTUNLARI]
+    return zip(df.index.tolist(), zamanlar, *sutunlar)
+
+
+def parcala(kayitlar, boyut=PARTI_BOYUTU):
+    """Iterable'ı en fazla `boyut` elemanlı listeler halinde verir"""
+    kayitlar = iter(kayitlar)
+    while True:
+        parca = list(islice(kayitlar, boyut))
+        if not parca:
+            return
+        yield parca
@@ -0,0 +1,232 @@
+"""Fiyat grafikleri: ortak çizim, LTTB seyreltme ve pencere açmadan toplu PNG/SVG üretimi
+
+Dosyaya çizim pyplot'a bağlı olmayan `Figure` nesneleriyle yapılır; pencere
+açılmaz, figürler pyplot'un kaydında birikmez. Çıktı dizinindeki grafikler
+(sembol, period, son bar zamanı) imzasıyla saklanır, veri değişmediyse yeniden çizilmez.
+"""
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from borsa_indikator import INDIKATORLER, indikator_hesapla
+
+BOYUT = (12, 6)
+MAX_NOKTA = 2000  # bundan uzun seriler çizimden önce LTTB ile seyreltilir
+BICIMLER = ("png", "svg")
+ONBELLEK_DOSYASI = ".grafik_onbellegi.json"
+
+
+# --- Seyreltme --------------------------------------------------------------
+
+def lttb(x, y, hedef):
+    """Largest-Triangle-Three-Buckets: görünür şekli koruyan `hedef` noktanın konumlarını döndürür"""
+    n = len(y)
+    if hedef >= n or hedef < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    kova = (n - 2) / (hedef - 2)
+    secilen = np.empty(hedef, dtype=np.int64)
+    secilen[0], secilen[-1] = 0, n - 1
+    a = 0
+    for i in range(hedef - 2):
+        bas = int(i * kova) + 1
+        son = int((i + 1) * kova) + 1
+        # Bir sonraki kovanın ortalaması üçgenin üçüncü köşesidir
+        sonraki = slice(son, min(int((i + 2) * kova) + 1, n))
+        ort_x = x[sonraki].mean()
+        ort_y = y[sonraki].mean()
+        alan = np.abs((x[a] - ort_x) * (y[bas:son] - y[a]) - (x[a] - x[bas:son]) * (ort_y - y[a]))
+        a = bas + int(np.argmax(alan))
+        secilen[i + 1] = a
+    return secilen
+
+
+def seyreltme_konumlari(data, max_nokta=MAX_NOKTA):
+    """Kapanış serisine göre çizilecek bar konumları; kısa serilerde None"""
+    if not max_nokta or len(data) <= max_nokta:
+        return None
+    index = data.index
+    x = index.asi8 if isinstance(index, pd.DatetimeIndex) else np.arange(len(index))
+    y = data["Close"].to_numpy(dtype=float)
+    # Boş kapanışlar alanı bozmasın, yalnızca seçimde önceki değerle doldurulur
+    y = pd.Series(y).ffill().bfill().to_numpy()
+    return lttb(x, y, max_nokta)
+
+
+# --- Çizim ------------------------------------------------------------------
+
+def _etiket(ad, parametreler):
+    return ad + "".join(str(v) for v in parametreler.values())
+
+
+def grafik_ciz(fig, hisse_kodu, data, indikatorler=None, hesapla=None, max_nokta=MAX_NOKTA):
+    """Fiyatı ve göstergeleri verilen figüre çizer; figür önce temizlenir.
+
+    `hesapla(ad, **parametreler)` verilmezse göstergeler doğrudan hesaplanır.
+    Göstergeler tam veriyle hesaplanır, yalnızca çizilen noktalar seyreltilir.
+    """
+    indikatorler = indikatorler or []
+    if hesapla is None:
+        hesapla = lambda ad, **p: indikator_hesapla(data, ad, **p)
+    konumlar = seyreltme_konumlari(data, max_nokta)
+    seyrelt = (lambda s: s) if konumlar is None else (lambda s: s.iloc[konumlar])
+
+    fig.clear()
+    osilator_var = any(not INDIKATORLER[ad][1] for ad, _ in indikatorler)
+    if osilator_var:
+        # RSI/MACD/ATR fiyat ölçeğinde değil, alt panelde çizilir
+        axes = fig.add_axes([0.1, 0.38, 0.8, 0.52])
+        alt_axes = fig.add_axes([0.1, 0.1, 0.8, 0.22], sharex=axes)
+        alt_axes.grid(True, alpha=0.3)
+        alt_axes.tick_params(axis='x', labelrotation=45)
+        axes.tick_params(axis='x', labelbottom=False)
+    else:
+        axes = fig.add_axes([0.1, 0.1, 0.8, 0.8])
+        alt_axes = None
+        axes.tick_params(axis='x', labelrotation=45)
+
+    kapanis = seyrelt(data['Close'])
+    axes.plot(kapanis.index, kapanis, linewidth=2, label="Kapanış")
+    for ad, parametreler in indikatorler:
+        sonuc = hesapla(ad, **parametreler)
+        if sonuc is None:
+            continue
+        sonuc = seyrelt(sonuc)
+        eksen = axes if INDIKATORLER[ad][1] else alt_axes
+        etiket = _etiket(ad, parametreler)
+        if isinstance(sonuc, pd.DataFrame):
+            for sutun in sonuc.columns:
+                eksen.plot(sonuc.index, sonuc[sutun], linewidth=1, label=f"{etiket} {sutun}")
+        else:
+            eksen.plot(sonuc.index, sonuc, linewidth=1, label=etiket)
+    for eksen in (axes, alt_axes):
+        if eksen is not None and eksen.get_legend_handles_labels()[0]:
+            eksen.legend(loc="upper left", fontsize=8)
+
+    baslik = f"{hisse_kodu} Hisse Fiyat Grafiği"
+    if konumlar is not None:
+        baslik += f" ({len(data)} bardan {len(konumlar)} nokta)"
+    axes.set_title(baslik)
+    (alt_axes or axes).set_xlabel("Tarih")
+    axes.set_ylabel("Fiyat")
+    axes.grid(True, alpha=0.3)
+    return fig
+
+
+# --- Dosyaya toplu çizim ----------------------------------------------------
+
+def dosya_adi(hisse_kodu, period, bicim):
+    guvenli = re.sub(r"[^A-Za-z0-9._-]", "_", hisse_kodu)
+    return f"{guvenli}_{period}.{bicim}"
+
+
+def grafik_imzasi(hisse_kodu, period, data, indikatorler, bicim, max_nokta):
+    """Grafiğin yeniden çizilmesi gerekip gerekmediğini belirleyen imza.
+
+    Gün içi senkron bugünün barını aynı zaman ve satır sayısıyla yeniden yazar;
+    son barın OHLCV değerlerinin özeti de imzaya girdiğinden grafik tazelenir.
+    """
+    gostergeler = ",".join(_etiket(ad, p) for ad, p in indikatorler or [])
+    son_bar = hashlib.sha1(data.iloc[-1].to_numpy(dtype=float).tobytes()).hexdigest()
+    return [hisse_kodu, period, str(data.index[-1]), len(data), son_bar, gostergeler, bicim, max_nokta]
+
+
+class GrafikOnbellegi:
+    """Çıktı dizinindeki her dosyanın hangi imzayla çizildiğini tutar"""
+
+    def __init__(self, dizin):
+        self.yol = os.path.join(dizin, ONBELLEK_DOSYASI)
+        try:
+            with open(self.yol, encoding="utf-8") as f:
+                self._kayitlar = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._kayitlar = {}
+
+    def gecerli(self, dosya, imza):
+        return self._kayitlar.get(os.path.basename(dosya)) == imza and os.path.exists(dosya)
+
+    def guncelle(self, dosya, imza):
+        self._kayitlar[os.path.basename(dosya)] = imza
+
+    def kaydet(self):
+        gecici = f"{self.yol}.{os.getpid()}.tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(self._kayitlar, f, ensure_ascii=False)
+        os.replace(gecici, self.yol)
+
+
+_FIGUR = None  # süreç başına bir kez oluşturulup her grafikte temizlenerek kullanılır
+
+
+def _figur():
+    global _FIGUR
+    if _FIGUR is None:
+        _FIGUR = Figure(figsize=BOYUT)
+    return _FIGUR
+
+
+def _ciz_ve_kaydet(is_tanimi):
+    """(hisse_kodu, data, indikatorler, dosya, bicim, max_nokta, dpi) -> (hisse_kodu, hata)"""
+    hisse_kodu, data, indikatorler, dosya, bicim, max_nokta, dpi = is_tanimi
+    try:
+        fig = grafik_ciz(_figur(), hisse_kodu, data, indikatorler, max_nokta=max_nokta)
+        # Yarım yazılmış dosya okuyuculara görünmesin
+        gecici = f"{dosya}.{os.getpid()}.tmp"
+        fig.savefig(gecici, format=bicim, dpi=dpi)
+        os.replace(gecici, dosya)
+        return hisse_kodu, None
+    except Exception as e:
+        return hisse_kodu, f"{type(e).__name__}: {e}"
+
+
+def toplu_ciz(veriler, dizin, period, indikatorler=None, bicim="png", isci=None,
+              max_nokta=MAX_NOKTA, dpi=100):
+    """{sembol: DataFrame} için grafikleri `dizin` altına yazar.
+
+    Yalnızca imzası değişen grafikler çizilir; birden fazla iş varsa süreç
+    havuzunda dağıtılır. (çizilen, atlanan, {sembol: hata}) döndürür.
+    """
+    if bicim not in BICIMLER:
+        raise ValueError(f"Desteklenmeyen biçim: {bicim} ({', '.join(BICIMLER)})")
+    os.makedirs(dizin, exist_ok=True)
+    onbellek = GrafikOnbellegi(dizin)
+    isler, imzalar, atlanan, hatalar = [], {}, [], {}
+    for hisse_kodu, data in veriler.items():
+        if data is None or data.empty:
+            hatalar[hisse_kodu] = "veri yok"
+            continue
+        dosya = os.path.join(dizin, dosya_adi(hisse_kodu, period, bicim))
+        imza = grafik_imzasi(hisse_kodu, period, data, indikatorler, bicim, max_nokta)
+        if onbellek.gecerli(dosya, imza):
+            atlanan.append(hisse_kodu)
+            continue
+        imzalar[hisse_kodu] = (dosya, imza)
+        isler.append((hisse_kodu, data, indikatorler, dosya, bicim, max_nokta, dpi))
+
+    isci = isci or min(len(isler), os.cpu_count() or 1)
+    if isci <= 1 or len(isler) <= 1:
+        sonuclar = map(_ciz_ve_kaydet, isler)
+        havuz = None
+    else:
+        havuz = ProcessPoolExecutor(max_workers=isci)
+        sonuclar = havuz.map(_ciz_ve_kaydet, isler, chunksize=max(1, len(isler) // (isci * 4)))
+    cizilen = []
+    try:
+        for hisse_kodu, hata in sonuclar:
+            if hata is None:
+                cizilen.append(hisse_kodu)
+                onbellek.guncelle(*imzalar[hisse_kodu])
+            else:
+                hatalar[hisse_kodu] = hata
+    finally:
+        if havuz is not None:
+            havuz.shutdown()
+        onbellek.kaydet()
+    return cizilen, atlanan, hatalar
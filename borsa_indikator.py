@@ -0,0 +1,379 @@
+"""Teknik göstergeler: OHLCV üzerinde vektörel hesaplama ve bar/tick başına O(1) artımlı güncelleme"""
+import math
+import re
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from borsa_onbellek import TTLOnbellek
+
+
+# --- Vektörel çekirdekler -------------------------------------------------
+
+def sma(seri, n=20):
+    return seri.rolling(n, min_periods=n).mean()
+
+
+def ema(seri, n=20):
+    return seri.ewm(span=n, adjust=False).mean()
+
+
+def _wilder(seri, n):
+    return seri.ewm(alpha=1.0 / n, adjust=False).mean()
+
+
+def rsi(seri, n=14):
+    # Seri ya da (bar × sembol) DataFrame alır; tarayıcı tüm evreni tek çağrıda hesaplar
+    fark = seri.diff()
+    ort_kazanc = _wilder(fark.clip(lower=0), n)
+    ort_kayip = _wilder(-fark.clip(upper=0), n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sonuc = 100 - 100 / (1 + ort_kazanc / ort_kayip)
+    sonuc = sonuc.where(ort_kayip != 0, 100.0)
+    return sonuc.rename(f"RSI{n}") if isinstance(sonuc, pd.Series) else sonuc
+
+
+def macd(seri, hizli=12, yavas=26, sinyal=9):
+    cizgi = ema(seri, hizli) - ema(seri, yavas)
+    sinyal_cizgisi = ema(cizgi, sinyal)
+    return pd.DataFrame({"macd": cizgi, "sinyal": sinyal_cizgisi, "histogram": cizgi - sinyal_cizgisi})
+
+
+def bollinger(seri, n=20, k=2.0):
+    orta = sma(seri, n)
+    sapma = seri.rolling(n, min_periods=n).std(ddof=0)
+    return pd.DataFrame({"orta": orta, "ust": orta + k * sapma, "alt": orta - k * sapma})
+
+
+def atr(df, n=14):
+    onceki = df["Close"].shift(1)
+    gercek_aralik = pd.concat(
+        [df["High"] - df["Low"], (df["High"] - onceki).abs(), (df["Low"] - onceki).abs()],
+        axis=1,
+    ).max(axis=1)
+    return _wilder(gercek_aralik, n).rename(f"ATR{n}")
+
+
+def vwap(df, gunluk_sifirla=False):
+    """Tipik fiyat ağırlıklı ortalama; gün içi veride `gunluk_sifirla` her gün baştan başlatır"""
+    tipik = (df["High"] + df["Low"] + df["Close"]) / 3
+    agirlikli = tipik * df["Volume"]
+    if gunluk_sifirla:
+        gun = df.index.normalize()
+        return (agirlikli.groupby(gun).cumsum() / df["Volume"].groupby(gun).cumsum()).rename("VWAP")
+    return (agirlikli.cumsum() / df["Volume"].cumsum()).rename("VWAP")
+
+
+# Ad -> (fonksiyon, fiyat ekseninde mi, kapanış serisi mi yoksa OHLCV mi alır)
+INDIKATORLER = {
+    "SMA": (sma, True, True),
+    "EMA": (ema, True, True),
+    "BB": (bollinger, True, True),
+    "VWAP": (vwap, True, False),
+    "RSI": (rsi, False, True),
+    "MACD": (macd, False, True),
+    "ATR": (atr, False, False),
+}
+
+
+def indikator_hesapla(df, ad, **parametreler):
+    fonksiyon, _, kapanis_ile = INDIKATORLER[ad]
+    return fonksiyon(df["Close"] if kapanis_ile else df, **parametreler)
+
+
+def indikator_ayristir(metin):
+    """'SMA20,EMA50,RSI,BB' gibi bir metni [(ad, parametreler), ...] listesine çevirir"""
+    tanimlar = []
+    for parca in metin.split(","):
+        parca = parca.strip().upper()
+        if not parca:
+            continue
+        eslesme = re.fullmatch(r"([A-Z]+)(\d+)?", parca)
+        if not eslesme or eslesme.group(1) not in INDIKATORLER:
+            raise ValueError(f"Bilinmeyen gösterge: {parca}")
+        ad, sayi = eslesme.groups()
+        parametreler = {}
+        if sayi:
+            if ad in ("MACD", "VWAP"):
+                raise ValueError(f"{ad} periyot almaz: {parca}")
+            parametreler["n"] = int(sayi)
+        tanimlar.append((ad, parametreler))
+    return tanimlar
+
+
+class IndikatorOnbellegi:
+    """(sembol, gösterge, parametreler) başına sonuçları son bar zamanıyla birlikte saklar.
+
+    Aynı veriyle tekrar istendiğinde yeniden hesaplanmaz. İmza son barın zamanı
+    ve değerlerini içerir; yeni bar geldiğinde ya da günün barı seans içinde
+    tazelendiğinde (aynı zaman, yeni kapanış) girdi kendiliğinden geçersizleşir.
+    """
+
+    def __init__(self, max_boyut=512, ttl=24 * 3600):
+        self.onbellek = TTLOnbellek(max_boyut, ttl)
+
+    def hesapla(self, sembol, df, ad, **parametreler):
+        if df is None or df.empty:
+            return None
+        anahtar = (sembol, ad, tuple(sorted(parametreler.items())))
+        bulundu, kayit = self.onbellek.al(anahtar)
+        imza = (df.index[0], df.index[-1], len(df), df.iloc[-1].to_numpy(dtype=float).tobytes())
+        if bulundu and kayit[0] == imza:
+            return kayit[1]
+        sonuc = indikator_hesapla(df, ad, **parametreler)
+        self.onbellek.koy(anahtar, (imza, sonuc))
+        return sonuc
+
+
+# --- Artımlı (O(1)) durumlar --------------------------------------------
+
+class ArtimliSMA:
+    def __init__(self, n=20):
+        self.n = n
+        self._pencere = deque()
+        self._toplam = 0.0
+        self.deger = None
+
+    def guncelle(self, fiyat):
+        self._pencere.append(fiyat)
+        self._toplam += fiyat
+        if len(self._pencere) > self.n:
+            self._toplam -= self._pencere.popleft()
+        self.deger = self._toplam / self.n if len(self._pencere) == self.n else None
+        return self.deger
+
+    def onizle(self, fiyat):
+        """Sonraki bar `fiyat` ile kapansaydı değer ne olurdu; durum değişmez"""
+        if len(self._pencere) + 1 < self.n:
+            return None
+        eski = self._pencere[0] if len(self._pencere) == self.n else 0.0
+        return (self._toplam + fiyat - eski) / self.n
+
+
+class ArtimliEMA:
+    def __init__(self, n=20, alfa=None):
+        self.alfa = alfa if alfa is not None else 2.0 / (n + 1)
+        self.deger = None
+
+    def guncelle(self, fiyat):
+        if self.deger is None:
+            self.deger = fiyat
+        else:
+            self.deger += self.alfa * (fiyat - self.deger)
+        return self.deger
+
+    def onizle(self, fiyat):
+        return fiyat if self.deger is None else self.deger + self.alfa * (fiyat - self.deger)
+
+
+class ArtimliRSI:
+    def __init__(self, n=14):
+        self._kazanc = ArtimliEMA(alfa=1.0 / n)
+        self._kayip = ArtimliEMA(alfa=1.0 / n)
+        self._onceki = None
+        self.deger = None
+
+    def guncelle(self, fiyat):
+        if self._onceki is not None:
+            fark = fiyat - self._onceki
+            kazanc = self._kazanc.guncelle(max(fark, 0.0))
+            kayip = self._kayip.guncelle(max(-fark, 0.0))
+            self.deger = 100.0 if kayip == 0 else 100 - 100 / (1 + kazanc / kayip)
+        self._onceki = fiyat
+        return self.deger
+
+    def onizle(self, fiyat):
+        if self._onceki is None:
+            return None
+        fark = fiyat - self._onceki
+        kazanc = self._kazanc.onizle(max(fark, 0.0))
+        kayip = self._kayip.onizle(max(-fark, 0.0))
+        return 100.0 if kayip == 0 else 100 - 100 / (1 + kazanc / kayip)
+
+
+class ArtimliMACD:
+    def __init__(self, hizli=12, yavas=26, sinyal=9):
+        self._hizli = ArtimliEMA(hizli)
+        self._yavas = ArtimliEMA(yavas)
+        self._sinyal = ArtimliEMA(sinyal)
+        self.deger = None
+
+    def guncelle(self, fiyat):
+        cizgi = self._hizli.guncelle(fiyat) - self._yavas.guncelle(fiyat)
+        sinyal = self._sinyal.guncelle(cizgi)
+        self.deger = {"macd": cizgi, "sinyal": sinyal, "histogram": cizgi - sinyal}
+        return self.deger
+
+    def onizle(self, fiyat):
+        cizgi = self._hizli.onizle(fiyat) - self._yavas.onizle(fiyat)
+        sinyal = self._sinyal.onizle(cizgi)
+        return {"macd": cizgi, "sinyal": sinyal, "histogram": cizgi - sinyal}
+
+
+class ArtimliBollinger:
+    def __init__(self, n=20, k=2.0):
+        self.n = n
+        self.k = k
+        self._pencere = deque()
+        self._toplam = 0.0
+        self._kare_toplam = 0.0
+        self.deger = None
+
+    def guncelle(self, fiyat):
+        self._pencere.append(fiyat)
+        self._toplam += fiyat
+        self._kare_toplam += fiyat * fiyat
+        if len(self._pencere) > self.n:
+            eski = self._pencere.popleft()
+            self._toplam -= eski
+            self._kare_toplam -= eski * eski
+        if len(self._pencere) < self.n:
+            self.deger = None
+            return None
+        orta = self._toplam / self.n
+        sapma = math.sqrt(max(self._kare_toplam / self.n - orta * orta, 0.0))
+        self.deger = {"orta": orta, "ust": orta + self.k * sapma, "alt": orta - self.k * sapma}
+        return self.deger
+
+    def onizle(self, fiyat):
+        if len(self._pencere) + 1 < self.n:
+            return None
+        eski = self._pencere[0] if len(self._pencere) == self.n else 0.0
+        orta = (self._toplam + fiyat - eski) / self.n
+        kare = self._kare_toplam + fiyat * fiyat - eski * eski
+        sapma = math.sqrt(max(kare / self.n - orta * orta, 0.0))
+        return {"orta": orta, "ust": orta + self.k * sapma, "alt": orta - self.k * sapma}
+
+
+class ArtimliATR:
+    def __init__(self, n=14):
+        self._ortalama = ArtimliEMA(alfa=1.0 / n)
+        self._onceki_kapanis = None
+        self.deger = None
+
+    def guncelle(self, yuksek, dusuk, kapanis):
+        aralik = yuksek - dusuk
+        if self._onceki_kapanis is not None:
+            aralik = max(aralik, abs(yuksek - self._onceki_kapanis), abs(dusuk - self._onceki_kapanis))
+        self._onceki_kapanis = kapanis
+        self.deger = self._ortalama.guncelle(aralik)
+        return self.deger
+
+
+class ArtimliVWAP:
+    def __init__(self):
+        self._hacim = 0.0
+        self._agirlikli = 0.0
+        self.deger = None
+
+    def guncelle(self, fiyat, hacim):
+        if hacim:
+            self._hacim += hacim
+            self._agirlikli += fiyat * hacim
+            self.deger = self._agirlikli / self._hacim
+        return self.deger
+
+
+ARTIMLI_INDIKATORLER = {
+    "SMA": ArtimliSMA,
+    "EMA": ArtimliEMA,
+    "RSI": ArtimliRSI,
+    "MACD": ArtimliMACD,
+    "BB": ArtimliBollinger,
+}
+
+
+def artimli_isit(ad, kapanis, **parametreler):
+    """Geçmiş kapanışlarla ısıtılmış bir artımlı gösterge döndürür; sonrası tick başına O(1)"""
+    gosterge = ARTIMLI_INDIKATORLER[ad](**parametreler)
+    for fiyat in np.asarray(kapanis, dtype=float):
+        if not np.isnan(fiyat):
+            gosterge.guncelle(float(fiyat))
+    return gosterge
+
+
+class CanliIndikatorler:
+    """Canlı takip motoruna abone olup sembol başına artımlı göstergeleri günceller.
+
+    Durumlar tamamlanmış günlük barlarla ilerler. Gün içindeki tickler açık günün
+    barını günceller: değer, son tamamlanmış bara kadarki durum ve canlı fiyatla
+    `onizle` üzerinden hesaplanır, durum değişmez. Gün değişince açık bar son
+    fiyatıyla kapatılıp duruma işlenir; böylece RSI(14) gibi kurallar tick
+    gürültüsüne değil günlük kapanışlara göre değerlendirilir.
+
+    tanimlar: [(ad, parametreler), ...] — yalnızca fiyat alan göstergeler (SMA, EMA, RSI, MACD, BB)
+    """
+
+    def __init__(self, tanimlar):
+        self.tanimlar = [(ad, dict(parametreler)) for ad, parametreler in tanimlar]
+        self._durumlar = {}  # sembol -> {anahtar: gösterge} (tamamlanmış barlar)
+        self._acik_bar = {}  # sembol -> [gün, son fiyat]
+        self._degerler = {}  # sembol -> {anahtar: açık barla değer}
+
+    @staticmethod
+    def anahtar(ad, parametreler):
+        return (ad, tuple(sorted(parametreler.items())))
+
+    def _yeni_durum(self):
+        return {self.anahtar(ad, p): ARTIMLI_INDIKATORLER[ad](**p) for ad, p in self.tanimlar}
+
+    def isit(self, sembol, kapanis, son_bar=None):
+        """Sembolün göstergelerini geçmiş günlük kapanışlarla başlatır.
+
+        `son_bar` son kapanışın günüyse o bar açık sayılır: aynı gün gelen tickler
+        onun kapanışını değiştirir. Verilmezse tüm kapanışlar tamamlanmış sayılır.
+        """
+        kapanis = np.asarray(kapanis, dtype=float)
+        kapanis = kapanis[~np.isnan(kapanis)]
+        self._acik_bar.pop(sembol, None)
+        self._degerler.pop(sembol, None)
+        son = None
+        if son_bar is not None and len(kapanis):
+            kapanis, son = kapanis[:-1], float(kapanis[-1])
+        self._durumlar[sembol] = {
+            self.anahtar(ad, p): artimli_isit(ad, kapanis, **p) for ad, p in self.tanimlar
+        }
+        if son is not None:
+            gun = son_bar.date() if hasattr(son_bar, "date") else son_bar
+            self._acik_bar[sembol] = [gun, son]
+            self._onizle(sembol, son)
+
+    def _onizle(self, sembol, fiyat):
+        self._degerler[sembol] = {
+            anahtar: gosterge.onizle(fiyat) for anahtar, gosterge in self._durumlar[sembol].items()
+        }
+
+    def __call__(self, tick):
+        fiyat = tick.get('fiyat')
+        if fiyat is None:
+            return
+        sembol = tick['sembol']
+        fiyat = float(fiyat)
+        zaman = tick.get('zaman') or datetime.now()
+        gun = zaman.date() if hasattr(zaman, "date") else zaman
+        durumlar = self._durumlar.get(sembol)
+        if durumlar is None:
+            durumlar = self._durumlar[sembol] = self._yeni_durum()
+        acik = self._acik_bar.get(sembol)
+        if acik is not None and gun > acik[0]:
+            # Önceki günün barı kapandı: son fiyatı kapanış olarak işlenir
+            for gosterge in durumlar.values():
+                gosterge.guncelle(acik[1])
+            acik = None
+        if acik is None:
+            self._acik_bar[sembol] = [gun, fiyat]
+        elif gun == acik[0]:
+            acik[1] = fiyat
+        else:
+            return  # açık bardan eski tick
+        self._onizle(sembol, fiyat)
+
+    def deger(self, sembol, ad, **parametreler):
+        anahtar = self.anahtar(ad, parametreler)
+        degerler = self._degerler.get(sembol)
+        if degerler is not None and anahtar in degerler:
+            return degerler[anahtar]
+        gosterge = self._durumlar.get(sembol, {}).get(anahtar)
+        return gosterge.deger if gosterge is not None else None
@@ -0,0 +1,192 @@
+"""Sıcak yollar için zamanlama ve sayaçlar; kapalıyken neredeyse sıfır maliyetli"""
+import json
+import os
+import threading
+import time
+
+# Prometheus histogram kovaları (saniye)
+KOVALAR = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _HataSayaci:
+    """Metrikler kapalıyken zamanla() yerine döner; süre ölçmez, yalnızca çıkan hatayı sayar"""
+    __slots__ = ("metrikler", "islem", "sembol")
+
+    def __init__(self, metrikler, islem, sembol):
+        self.metrikler = metrikler
+        self.islem = islem
+        self.sembol = sembol
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tur, deger, iz):
+        if tur is not None and issubclass(tur, Exception):
+            self.metrikler.hata(self.islem, self.sembol, deger)
+        return False
+
+
+class _Zamanlayici:
+    __slots__ = ("metrikler", "islem", "sembol", "baslangic")
+
+    def __init__(self, metrikler, islem, sembol):
+        self.metrikler = metrikler
+        self.islem = islem
+        self.sembol = sembol
+
+    def __enter__(self):
+        self.baslangic = time.perf_counter()
+        return self
+
+    def __exit__(self, tur, deger, iz):
+        self.metrikler.sure_ekle(self.islem, self.sembol, time.perf_counter() - self.baslangic)
+        if tur is not None and issubclass(tur, Exception):
+            self.metrikler.hata(self.islem, self.sembol, deger)
+        return False
+
+
+class Metrikler:
+    """İşlem ve sembol başına süre dağılımı, sayaç ve hata sayısı tutar"""
+
+    def __init__(self, acik=False):
+        self.acik = acik
+        self._kilit = threading.Lock()
+        self._sureler = {}   # (islem, sembol) -> [adet, toplam, max, kova_sayilari]
+        self._sayaclar = {}  # (ad, sembol) -> değer
+        self._hatalar = {}   # (islem, sembol) -> [adet, son_mesaj]
+
+    def zamanla(self, islem, sembol=None):
+        """`with metrikler.zamanla("saglayici.info", sembol):` — kapalıyken süre ölçülmez, hatalar yine sayılır"""
+        if not self.acik:
+            return _HataSayaci(self, islem, sembol)
+        return _Zamanlayici(self, islem, sembol)
+
+    def sure_ekle(self, islem, sembol, sure):
+        anahtar = (islem, sembol)
+        with self._kilit:
+            kayit = self._sureler.get(anahtar)
+            if kayit is None:
+                kayit = self._sureler[anahtar] = [0, 0.0, 0.0, [0] * len(KOVALAR)]
+            kayit[0] += 1
+            kayit[1] += sure
+            if sure > kayit[2]:
+                kayit[2] = sure
+            for i, sinir in enumerate(KOVALAR):
+                if sure <= sinir:
+                    kayit[3][i] += 1
+                    break
+
+    def say(self, ad, sembol=None, miktar=1):
+        if not self.acik:
+            return
+        anahtar = (ad, sembol)
+        with self._kilit:
+            self._sayaclar[anahtar] = self._sayaclar.get(anahtar, 0) + miktar
+
+    def hata(self, islem, sembol=None, hata=None):
+        """Hataları yutmak yerine sayar; metrikler kapalı olsa da sayılır (ucuz ve nadir).
+
+        zamanla() bağlamından çıkıp aynı anahtarla yeniden bildirilen hata bir kez sayılır.
+        """
+        anahtar = (islem, sembol)
+        if hata is not None:
+            if getattr(hata, "_metrik_anahtari", None) == anahtar:
+                return
+            try:
+                hata._metrik_anahtari = anahtar
+            except AttributeError:
+                pass
+        with self._kilit:
+            kayit = self._hatalar.setdefault(anahtar, [0, None])
+            kayit[0] += 1
+            if hata is not None:
+                kayit[1] = str(hata)
+
+    def sifirla(self):
+        with self._kilit:
+            self._sureler.clear()
+            self._sayaclar.clear()
+            self._hatalar.clear()
+
+    def _islem_toplamlari(self):
+        """Sembol boyutunu toplayıp işlem başına (adet, toplam, max) verir"""
+        toplam = {}
+        for (islem, _), (adet, sure, en_buyuk, _) in self._sureler.items():
+            kayit = toplam.setdefault(islem, [0, 0.0, 0.0])
+            kayit[0] += adet
+            kayit[1] += sure
+            kayit[2] = max(kayit[2], en_buyuk)
+        return toplam
+
+    def ozet(self):
+        """--stats için okunabilir özet"""
+        with self._kilit:
+            satirlar = ["📊 İşlem İstatistikleri", "-" * 72,
+                        f"{'işlem':<28} {'adet':>7} {'toplam sn':>10} {'ort ms':>9} {'max ms':>9} {'hata':>5}"]
+            hatalar = {}
+            for (islem, _), (adet, _) in self._hatalar.items():
+                hatalar[islem] = hatalar.get(islem, 0) + adet
+            toplamlar = self._islem_toplamlari()
+            for islem in sorted(set(toplamlar) | set(hatalar)):
+                adet, sure, en_buyuk = toplamlar.get(islem, (0, 0.0, 0.0))
+                ortalama = sure / adet * 1000 if adet else 0.0
+                satirlar.append(f"{islem:<28} {adet:>7} {sure:>10.3f} {ortalama:>9.1f} {en_buyuk * 1000:>9.1f} {hatalar.get(islem, 0):>5}")
+            if self._sayaclar:
+                satirlar.append("")
+                for (ad, sembol), deger in sorted(self._sayaclar.items(), key=lambda k: (k[0][0], k[0][1] or "")):
+                    satirlar.append(f"{ad + (f' [{sembol}]' if sembol else ''):<40} {deger:>10}")
+            return "\n".join(satirlar)
+
+    @staticmethod
+    def _etiketler(islem, sembol):
+        etiket = f'islem="{islem}"'
+        if sembol:
+            etiket += f',sembol="{sembol}"'
+        return etiket
+
+    def prometheus(self):
+        """Prometheus metin biçimi"""
+        with self._kilit:
+            satirlar = ["# TYPE borsa_islem_suresi_saniye histogram"]
+            for (islem, sembol), (adet, toplam, _, kovalar) in sorted(self._sureler.items(), key=lambda k: (k[0][0], k[0][1] or "")):
+                etiket = self._etiketler(islem, sembol)
+                birikimli = 0
+                for sinir, sayi in zip(KOVALAR, kovalar):
+                    birikimli += sayi
+                    satirlar.append(f'borsa_islem_suresi_saniye_bucket{{{etiket},le="{sinir}"}} {birikimli}')
+                satirlar.append(f'borsa_islem_suresi_saniye_bucket{{{etiket},le="+Inf"}} {adet}')
+                satirlar.append(f"borsa_islem_suresi_saniye_sum{{{etiket}}} {toplam}")
+                satirlar.append(f"borsa_islem_suresi_saniye_count{{{etiket}}} {adet}")
+            satirlar.append("# TYPE borsa_islem_hatalari_toplam counter")
+            for (islem, sembol), (adet, _) in sorted(self._hatalar.items(), key=lambda k: (k[0][0], k[0][1] or "")):
+                satirlar.append(f"borsa_islem_hatalari_toplam{{{self._etiketler(islem, sembol)}}} {adet}")
+            satirlar.append("# TYPE borsa_sayac_toplam counter")
+            for (ad, sembol), deger in sorted(self._sayaclar.items(), key=lambda k: (k[0][0], k[0][1] or "")):
+                satirlar.append(f"borsa_sayac_toplam{{{self._etiketler(ad, sembol)}}} {deger}")
+            return "\n".join(satirlar) + "\n"
+
+    def json_satirlari(self):
+        """Her ölçüm için bir JSON satırı"""
+        zaman = time.time()
+        with self._kilit:
+            satirlar = []
+            for (islem, sembol), (adet, toplam, en_buyuk, _) in self._sureler.items():
+                satirlar.append({"tur": "sure", "islem": islem, "sembol": sembol, "adet": adet,
+                                 "toplam_sn": toplam, "max_sn": en_buyuk, "zaman": zaman})
+            for (islem, sembol), (adet, mesaj) in self._hatalar.items():
+                satirlar.append({"tur": "hata", "islem": islem, "sembol": sembol, "adet": adet,
+                                 "son_hata": mesaj, "zaman": zaman})
+            for (ad, sembol), deger in self._sayaclar.items():
+                satirlar.append({"tur": "sayac", "islem": ad, "sembol": sembol, "deger": deger, "zaman": zaman})
+        return "".join(json.dumps(s, ensure_ascii=False) + "\n" for s in satirlar)
+
+    def disari_aktar(self, yol):
+        """.prom uzantısında Prometheus, diğerlerinde JSON satırları yazar"""
+        icerik = self.prometheus() if yol.endswith(".prom") else self.json_satirlari()
+        kip = "w" if yol.endswith(".prom") else "a"
+        with open(yol, kip, encoding="utf-8") as f:
+            f.write(icerik)
+
+
+# Uygulama genelinde tek kayıt defteri; BORSA_METRIK=1 ya da --stats ile açılır
+metrikler = Metrikler(acik=os.getenv("BORSA_METRIK") == "1")
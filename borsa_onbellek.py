@@ -0,0 +1,213 @@
+"""Sembol bilgileri için süreli (TTL), LRU tahliyeli süreç içi önbellek"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Yukleme:
+    """Aynı anahtar için devam eden tek yükleme; bekleyenler sonucu paylaşır"""
+
+    def __init__(self):
+        self.olay = threading.Event()
+        self.deger = None
+        self.hata = None
+
+
+class TTLOnbellek:
+    """Boyut sınırlı, LRU tahliyeli, girdi başına süreli önbellek.
+
+    `getir` aynı anahtarı eşzamanlı isteyenlerden yalnızca birinin
+    yükleyiciyi çalıştırmasını sağlar, diğerleri onun sonucunu bekler.
+    """
+
+    def __init__(self, max_boyut=1024, varsayilan_ttl=60.0, saat=time.monotonic):
+        self.max_boyut = max(1, int(max_boyut))
+        self.varsayilan_ttl = varsayilan_ttl
+        self._saat = saat
+        self._veri = OrderedDict()  # anahtar -> (son_gecerlilik, deger)
+        self._yuklemeler = {}
+        self._kilit = threading.Lock()
+        self.isabet = 0
+        self.iska = 0
+        self.tahliye = 0
+        self.birlesen = 0  # başka bir yüklemeyi bekleyerek sonuç alan çağrılar
+
+    def __len__(self):
+        return len(self._veri)
+
+    def _bul(self, anahtar):
+        # Kilit altında çağrılmalı
+        kayit = self._veri.get(anahtar)
+        if kayit is None:
+            return False, None
+        son_gecerlilik, deger = kayit
+        if son_gecerlilik <= self._saat():
+            del self._veri[anahtar]
+            return False, None
+        self._veri.move_to_end(anahtar)
+        return True, deger
+
+    def _yaz(self, anahtar, deger, ttl):
+        # Kilit altında çağrılmalı
+        ttl = self.varsayilan_ttl if ttl is None else ttl
+        self._veri[anahtar] = (self._saat() + ttl, deger)
+        self._veri.move_to_end(anahtar)
+        while len(self._veri) > self.max_boyut:
+            self._veri.popitem(last=False)
+            self.tahliye += 1
+
+    def al(self, anahtar, iska_say=True):
+        """(bulundu, deger) döndürür; ıskada ardından `getir` çağrılacaksa `iska_say=False` verilir"""
+        with self._kilit:
+            bulundu, deger = self._bul(anahtar)
+            if bulundu:
+                self.isabet += 1
+            elif iska_say:
+                self.iska += 1
+            return bulundu, deger
+
+    def koy(self, anahtar, deger, ttl=None):
+        with self._kilit:
+            self._yaz(anahtar, deger, ttl)
+
+    def sil(self, anahtar):
+        with self._kilit:
+            self._veri.pop(anahtar, None)
+
+    def temizle(self):
+        with self._kilit:
+            self._veri.clear()
+
+    def getir(self, anahtar, yukleyici, ttl=None):
+        """Önbellekte yoksa `yukleyici(anahtar)` ile yükler; eşzamanlı yüklemeleri birleştirir"""
+        with self._kilit:
+            bulundu, deger = self._bul(anahtar)
+            if bulundu:
+                self.isabet += 1
+                return deger
+            self.iska += 1
+            yukleme = self._yuklemeler.get(anahtar)
+            sahibi = yukleme is None
+            if sahibi:
+                yukleme = _Yukleme()
+                self._yuklemeler[anahtar] = yukleme
+            else:
+                self.birlesen += 1
+
+        if not sahibi:
+            yukleme.olay.wait()
+            if yukleme.hata is not None:
+                raise yukleme.hata
+            return yukleme.deger
+
+        try:
+            yukleme.deger = yukleyici(anahtar)
+        except Exception as e:
+            yukleme.hata = e
+            raise
+        else:
+            with self._kilit:
+                self._yaz(anahtar, yukleme.deger, ttl)
+            return yukleme.deger
+        finally:
+            with self._kilit:
+                self._yuklemeler.pop(anahtar, None)
+            yukleme.olay.set()
+
+    def canli_girdiler(self):
+        """Süresi dolmamış girdiler için (anahtar, kalan_sure, deger) listesi, eskiden yeniye"""
+        with self._kilit:
+            simdi = self._saat()
+            return [(anahtar, son - simdi, deger) for anahtar, (son, deger) in self._veri.items() if son > simdi]
+
+    def istatistik(self):
+        toplam = self.isabet + self.iska
+        return {
+            'boyut': len(self._veri),
+            'isabet': self.isabet,
+            'iska': self.iska,
+            'tahliye': self.tahliye,
+            'birlesen': self.birlesen,
+            'isabet_orani': self.isabet / toplam if toplam else 0.0,
+        }
+
+
+# Yavaş değişen alanlar uzun, fiyat alanları kısa süre saklanır
+META_ALANLARI = ("longName", "shortName", "sector", "industry", "marketCap", "currency")
+FIYAT_ALANLARI = (
+    "regularMarketPrice", "regularMarketChangePercent", "regularMarketChange",
+    "regularMarketVolume", "regularMarketTime", "previousClose",
+)
+
+
+class BilgiOnbellegi:
+    """`ticker.info` çağrılarının önünde duran, meta ve fiyat alanlarını ayrı süreyle saklayan önbellek"""
+
+    def __init__(self, cekici, meta_ttl=6 * 3600, fiyat_ttl=15, max_boyut=2048):
+        self.cekici = cekici
+        self.meta = TTLOnbellek(max_boyut, meta_ttl)
+        self.fiyat = TTLOnbellek(max_boyut, fiyat_ttl)
+        self.saglayici_cagrisi = 0
+
+    def _yukle(self, sembol):
+        info = self.cekici(sembol) or {}
+        self.saglayici_cagrisi += 1
+        # Tek çağrıyla gelen meta alanlarını da tazele
+        self.meta.koy(sembol, {alan: info.get(alan) for alan in META_ALANLARI})
+        return {alan: info.get(alan) for alan in FIYAT_ALANLARI}
+
+    def fiyat_bilgisi(self, sembol, taze=False):
+        """Yalnızca fiyat alanları; `taze=True` önbelleği atlayıp yeniden çeker"""
+        if taze:
+            self.fiyat.sil(sembol)
+        return self.fiyat.getir(sembol, self._yukle)
+
+    def bilgi(self, sembol):
+        """Meta ve fiyat alanlarını birleşik bir sözlük olarak döndürür"""
+        fiyat = self.fiyat.getir(sembol, self._yukle)
+        bulundu, meta = self.meta.al(sembol)
+        if not bulundu:
+            # Meta tahliye edildiyse fiyatla birlikte yeniden yükle
+            fiyat = self.fiyat_bilgisi(sembol, taze=True)
+            meta = self.meta.al(sembol)[1] or {}
+        bilgi = dict(meta)
+        bilgi.update(fiyat)
+        return bilgi
+
+    def kaydet(self, yol):
+        """Süresi dolmamış girdileri duvar saatine göre son geçerlilikle diske yazar"""
+        simdi = time.time()
+        veri = {
+            ad: [[anahtar, simdi + kalan, deger] for anahtar, kalan, deger in onbellek.canli_girdiler()]
+            for ad, onbellek in (('meta', self.meta), ('fiyat', self.fiyat))
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(yol)), exist_ok=True)
+        gecici = f"{yol}.{os.getpid()}.tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(veri, f, ensure_ascii=False, default=str)
+        os.replace(gecici, yol)
+
+    def yukle(self, yol):
+        """`kaydet` ile yazılmış dosyadan hâlâ geçerli girdileri geri yükler, yüklenen sayıyı döndürür"""
+        try:
+            with open(yol, encoding="utf-8") as f:
+                veri = json.load(f)
+        except FileNotFoundError:
+            return 0
+        simdi = time.time()
+        sayi = 0
+        for ad, onbellek in (('meta', self.meta), ('fiyat', self.fiyat)):
+            for anahtar, son_gecerlilik, deger in veri.get(ad, []):
+                if son_gecerlilik > simdi:
+                    onbellek.koy(anahtar, deger, ttl=son_gecerlilik - simdi)
+                    sayi += 1
+        return sayi
+
+    def istatistik(self):
+        return {
+            'meta': self.meta.istatistik(),
+            'fiyat': self.fiyat.istatistik(),
+            'saglayici_cagrisi': self.saglayici_cagrisi,
+        }
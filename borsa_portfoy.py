@@ -0,0 +1,121 @@
+"""Portföy değerleme motoru: hizalanmış fiyat paneli üzerinde matris işlemleriyle değer serisi ve risk metrikleri"""
+import numpy as np
+import pandas as pd
+
+YILLIK_ISLEM_GUNU = 252
+
+
+def fiyat_paneli(fiyat_okuyucu, semboller):
+    """Sembollerin kapanışlarını tarih × sembol tablosunda hizalar (eksik günler ileri doldurulur)"""
+    seriler = {}
+    for sembol in dict.fromkeys(semboller):
+        df = fiyat_okuyucu(sembol)
+        if df is not None and not df.empty:
+            index = df.index.tz_localize(None) if getattr(df.index, 'tz', None) is not None else df.index
+            seriler[sembol] = pd.Series(df["Close"].to_numpy(dtype=float), index=index.normalize())
+    if not seriler:
+        return pd.DataFrame()
+    panel = pd.concat(seriler, axis=1).sort_index()
+    panel = panel[~panel.index.duplicated(keep="last")]
+    return panel.ffill()
+
+
+def maksimum_dusus(getiriler):
+    birikimli = np.cumprod(1 + np.nan_to_num(getiriler))
+    zirve = np.maximum.accumulate(birikimli)
+    return float((birikimli / zirve - 1).min()) if len(birikimli) else 0.0
+
+
+def portfoy_metrikleri(getiriler, endeks_getirileri=None, yillik_gun=YILLIK_ISLEM_GUNU):
+    """Günlük getiri serisinden (ve varsa endeks getirilerinden) risk metriklerini hesaplar"""
+    getiriler = pd.Series(getiriler).dropna()
+    n = len(getiriler)
+    if n == 0:
+        return {}
+    r = getiriler.to_numpy()
+    toplam = float(np.prod(1 + r) - 1)
+    volatilite = float(r.std(ddof=1) * np.sqrt(yillik_gun)) if n > 1 else 0.0
+    ortalama = float(r.mean() * yillik_gun)
+    metrikler = {
+        'toplam_getiri': toplam,
+        'yillik_getiri': float((1 + toplam) ** (yillik_gun / n) - 1) if toplam > -1 else -1.0,
+        'yillik_volatilite': volatilite,
+        'sharpe': ortalama / volatilite if volatilite else 0.0,
+        'maksimum_dusus': maksimum_dusus(r),
+        'gun': n,
+    }
+    if endeks_getirileri is not None:
+        hizali = pd.concat([getiriler, pd.Series(endeks_getirileri)], axis=1, join="inner").dropna()
+        if len(hizali) > 1:
+            kov = np.cov(hizali.to_numpy().T, ddof=1)
+            metrikler['beta'] = float(kov[0, 1] / kov[1, 1]) if kov[1, 1] else 0.0
+            metrikler['endeks_korelasyonu'] = float(np.corrcoef(hizali.to_numpy().T)[0, 1])
+    return metrikler
+
+
+class PortfoyMotoru:
+    """Pozisyonları hizalanmış fiyat paneli üzerinde tek matris işlemiyle değerler.
+
+    fiyat_okuyucu(sembol) OHLCV DataFrame döndürür (yerel depo ya da senkron yol).
+    Pozisyonlar (sembol, lot) ya da (sembol, lot, alış_tarihi) demetleridir;
+    alış tarihi verilen pozisyon o tarihten itibaren portföye dahil edilir.
+    """
+
+    def __init__(self, fiyat_okuyucu, endeks="^XU100", yillik_gun=YILLIK_ISLEM_GUNU):
+        self.fiyat_okuyucu = fiyat_okuyucu
+        self.endeks = endeks
+        self.yillik_gun = yillik_gun
+
+    @staticmethod
+    def _pozisyon_matrisi(panel, pozisyonlar):
+        """T × N lot matrisi; alış tarihinden önceki günler sıfırdır"""
+        lotlar = pd.Series(0.0, index=panel.columns)
+        alislar = pd.Series(pd.NaT, index=panel.columns, dtype="datetime64[ns]")
+        for pozisyon in pozisyonlar:
+            sembol, lot = pozisyon[0], pozisyon[1]
+            if sembol not in lotlar.index:
+                continue
+            lotlar[sembol] += lot
+            if len(pozisyon) > 2 and pozisyon[2] is not None:
+                alislar[sembol] = pd.Timestamp(pozisyon[2])
+        tarihler = panel.index.to_numpy()[:, None]
+        baslangic = alislar.fillna(panel.index[0]).to_numpy()[None, :]
+        return (tarihler >= baslangic) * lotlar.to_numpy()[None, :]
+
+    def analiz(self, pozisyonlar):
+        semboller = [p[0] for p in pozisyonlar]
+        panel = fiyat_paneli(self.fiyat_okuyucu, semboller + [self.endeks])
+        if panel.empty:
+            return None
+        endeks = panel.pop(self.endeks) if self.endeks in panel.columns else None
+        panel = panel.dropna(how="all")
+        if panel.empty:
+            return None
+
+        fiyatlar = panel.to_numpy()
+        lotlar = self._pozisyon_matrisi(panel, pozisyonlar)
+        tutarlar = np.nan_to_num(fiyatlar) * lotlar                   # T × N
+        deger = tutarlar.sum(axis=1)                                  # T
+
+        # Getiri = önceki günün tutar ağırlıklarıyla varlık getirileri; yeni alışlar getiri sayılmaz
+        with np.errstate(divide="ignore", invalid="ignore"):
+            varlik_getirileri = fiyatlar[1:] / fiyatlar[:-1] - 1      # (T-1) × N
+            onceki = tutarlar[:-1]
+            onceki_toplam = onceki.sum(axis=1)
+            getiri = np.where(
+                onceki_toplam > 0,
+                np.nansum(onceki * np.nan_to_num(varlik_getirileri), axis=1) / onceki_toplam,
+                np.nan,
+            )
+        getiri_serisi = pd.Series(getiri, index=panel.index[1:], name="getiri")
+        deger_serisi = pd.Series(deger, index=panel.index, name="deger")
+        deger_serisi = deger_serisi[deger_serisi > 0]
+
+        endeks_getirisi = endeks.pct_change() if endeks is not None else None
+        metrikler = portfoy_metrikleri(getiri_serisi, endeks_getirisi, self.yillik_gun)
+        return {
+            'deger_serisi': deger_serisi,
+            'getiri_serisi': getiri_serisi.dropna(),
+            'metrikler': metrikler,
+            'korelasyon': panel.pct_change().corr(),
+        }
@@ -1,52 +1,76 @@
-import yfinance as yf
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
-import time
+from functools import partial
+
+from borsa_canli_motor import CanliTakipMotoru, KlavyeDinleyici, izleme_listesi_oku
+from borsa_onbellek import BilgiOnbellegi
+from borsa_saglayici import saglayici_olustur
+from borsa_toplu_veri import TopluVeriCekici
 
 
 class BorsaUygulamasi:
-    def __init__(self):
+    def __init__(self, saglayici=None):
+        # Tüm piyasa verisi bu sağlayıcıdan geçer (BORSA_SAGLAYICI: yfinance | kayit:<dizin> | tekrar:<dizin> | sentetik)
+        self.saglayici = saglayici or saglayici_olustur()
         self.bist100_hisseleri = [
             "THYAO.IS", "GARAN.IS", "AKBNK.IS", "ASELS.IS", "KRDMD.IS",
             "SASA.IS", "EREGL.IS", "KCHOL.IS", "TUPRS.IS", "BIMAS.IS","KAYSE.IS"
         ]
+        # Meta alanlar saatlerce, fiyat alanları saniyeler mertebesinde saklanır
+        self.onbellek = BilgiOnbellegi(self._ticker_info, meta_ttl=6 * 3600, fiyat_ttl=15)
+        self.toplu_cekici = TopluVeriCekici(self.onbellek.bilgi, max_isci=8)
+        # Canlı takip her turda taze fiyat ister
+        self.canli_cekici = TopluVeriCekici(partial(self.onbellek.fiyat_bilgisi, taze=True), max_isci=16)
 
     def hisse_verisi_cek(self, hisse_kodu, period):
-      ticker = yf.Ticker(hisse_kodu)
-      data = ticker.history(period=period)
-      return data
+      return self.saglayici.history(hisse_kodu, period=period)
 
-    def hisse_bilgileri(self, hisse_kodu):
-      ticker = yf.Ticker(hisse_kodu)
+    def _ticker_info(self, hisse_kodu):
+      return self.saglayici.info(hisse_kodu)
+
+    def _bilgi_sozlugu(self, info):
       return {
-                'isim': ticker.info["longName"],
-                'sektor': ticker.info["sector"],
-                'piyasa_degeri': ticker.info["marketCap"],
-                'fiyat': ticker.info["regularMarketPrice"],
-                'değişim': ticker.info["regularMarketChangePercent"]
+                'isim': info.get("longName"),
+                'sektor': info.get("sector"),
+                'piyasa_degeri': info.get("marketCap"),
+                'fiyat': info.get("regularMarketPrice"),
+                'değişim': info.get("regularMarketChangePercent")
             }
 
+    def hisse_bilgileri(self, hisse_kodu):
+      return self._bilgi_sozlugu(self.onbellek.bilgi(hisse_kodu))
+
+    def hisse_bilgileri_toplu(self, hisse_kodlari):
+      """Birden fazla hissenin bilgisini paralel çeker, hatalı semboller için None döner"""
+      infolar, hatalar = self.toplu_cekici.getir(hisse_kodlari)
+      bilgiler = {}
+      for hisse in hisse_kodlari:
+          try:
+              bilgiler[hisse] = self._bilgi_sozlugu(infolar[hisse])
+          except KeyError as e:
+              print(f"{hisse} bilgi alma hatası: {hatalar.get(hisse, e)}")
+              bilgiler[hisse] = None
+      return bilgiler
+
     def bist100_endeksi(self):
-       bist100 = yf.Ticker("^XU100")
-       data = bist100.history("1y")
-       return data
+       return self.saglayici.history("^XU100", period="1y")
 
     def hisse_listesi_goster(self):
         print("📊 BIST100'den Popüler Hisseler:")
         print("-" * 50)
 
+        bilgiler = self.hisse_bilgileri_toplu(self.bist100_hisseleri)
         for i, hisse in enumerate(self.bist100_hisseleri, 1):
-            bilgi = self.hisse_bilgileri(hisse)
-            if bilgi:
-                print(f"{i:2d}. {bilgi['isim']} ({hisse})")
+            bilgi = bilgiler[hisse]
+            if bilgi and bilgi['fiyat'] is not None:
+                print(f"{i:2d}. {bilgi['isim'] or hisse} ({hisse})")
                 print(f"    Fiyat: {bilgi['fiyat']:.2f} TL")
-                print(f"    Değişim: {bilgi['değişim']:.2f}%")
+                print(f"    Değişim: {bilgi['değişim'] or 0.0:.2f}%")
                 print()
 
     def hisse_grafik_ciz(self, hisse_kodu, period):
         """Hisse fiyat grafiği çizer"""
         data = self.hisse_verisi_cek(hisse_kodu, period)
         if data is not None and not data.empty:
+            import matplotlib.pyplot as plt  # çizim istenene kadar yüklenmez
             fig=plt.figure(figsize=(12, 6))
             axes=fig.add_axes([0.1,0.1,0.8,0.8])
             axes.plot(data.index, data['Close'], linewidth=2)  #index tarihi verir x için
@@ -57,6 +81,7 @@ class BorsaUygulamasi:
             axes.tick_params(axis='x', labelrotation=45) #x dekileri 45 derece döndürür okunulabilirlik için
             plt.tight_layout()
             plt.show()
+            plt.close(fig)  # döngüde çağrıldığında figürler birikmesin
         else:
             print(f"{hisse_kodu} için veri bulunamadı.")
 
@@ -65,9 +90,10 @@ class BorsaUygulamasi:
         print("-" * 30)
 
         toplam_deger = 0
+        bilgiler = self.hisse_bilgileri_toplu([hisse for hisse, _ in hisseler_lotlar])
         for hisse, lot in hisseler_lotlar:
-            bilgi = self.hisse_bilgileri(hisse)
-            if bilgi:
+            bilgi = bilgiler[hisse]
+            if bilgi and bilgi["fiyat"] is not None:
                 deger = bilgi["fiyat"] * lot
                 print(f"{hisse}: {bilgi['fiyat']:.2f} TL × {lot} lot = {deger:.2f} TL")
                 toplam_deger += deger
@@ -76,32 +102,48 @@ class BorsaUygulamasi:
 
         print(f"\nToplam Portföy Değeri: {toplam_deger:.2f} TL")
 
-    def canli_takip(self, hisse_kodu, sure_dakika=5):
-        print(f"🔴 {hisse_kodu} Canlı Takip (Çıkmak için Ctrl+C)")
+    def canli_takip(self, hisse_kodlari, sure_dakika=5, aralik=5.0):
+        """Bir ya da daha fazla hisseyi motor üzerinden canlı takip eder"""
+        if isinstance(hisse_kodlari, str):
+            hisse_kodlari = [hisse_kodlari]
+        tekli = len(hisse_kodlari) == 1
+        baslik = ", ".join(h if isinstance(h, str) else h[0] for h in hisse_kodlari[:5])
+        if len(hisse_kodlari) > 5:
+            baslik += f" ... ({len(hisse_kodlari)} hisse)"
+        print(f"🔴 {baslik} Canlı Takip")
+        print("Çıkmak için 'q' yazıp Enter'a basın (ya da Ctrl+C)")
         print("-" * 40)
 
-        try:
-            for i in range(sure_dakika * 12):  # 5 saniyede bir güncelleme
-                ticker = yf.Ticker(hisse_kodu)
-                fiyat = ticker.info["regularMarketPrice"]
-                değişim = ticker.info["regularMarketChangePercent"]
+        motor = CanliTakipMotoru(self.canli_cekici.getir, varsayilan_aralik=aralik)
+        motor.ekle_liste(hisse_kodlari)
 
-                print(f"\r[{datetime.now().strftime('%H:%M:%S')}] {hisse_kodu}: {fiyat:.2f} TL ({değişim:+.2f}%)",end="") #ende aynı satırda
-                print("Çıkmak için 'q' tuşuna basın, devam etmek için Enter'a basın.")
-                cevap = input()
-                if cevap.lower() == 'q':
-                    print("Takip sonlandırıldı.")
-                    break
+        def yazdir(tick):
+            if tick['fiyat'] is None:
+                return
+            degisim = tick['değişim'] or 0.0
+            satir = f"[{tick['zaman'].strftime('%H:%M:%S')}] {tick['sembol']}: {tick['fiyat']:.2f} TL ({degisim:+.2f}%)"
+            print("\r" + satir if tekli else satir, end="" if tekli else "\n", flush=True)  #tek hissede aynı satırda
 
-                time.sleep(5)
+        motor.abone_ol(yazdir)
+        klavye = KlavyeDinleyici(motor.durdur_olayi).baslat()
+        try:
+            motor.calistir(sure=sure_dakika * 60)
+        except KeyboardInterrupt:
+            motor.durdur_olayi.set()
+        klavye.bekle()
 
-        except :
-            print("\n\nTakip sonlandırıldı.")
+        ist = motor.istatistik()
+        print("\n\nTakip sonlandırıldı.")
+        print(f"{ist['tick']} tick, {ist['tick_saniye']:.2f} tick/sn, {ist['hata']} hata, "
+              f"gecikme p50 {ist['gecikme_p50'] * 1000:.0f} ms / p99 {ist['gecikme_p99'] * 1000:.0f} ms")
 
+    def kapat(self):
+        """Toplu veri çekicilerin iş parçacıklarını kapatır"""
+        self.toplu_cekici.kapat()
+        self.canli_cekici.kapat()
 
-def main():
-    uygulama = BorsaUygulamasi()
 
+def menu(uygulama):
     while True:
         print("\n" + "=" * 50)
         print("📊 BORSA UYGULAMASI")
@@ -131,9 +173,9 @@ def main():
 
 
         elif secim == "3":
-            bist100 = yf.Ticker("^XU100")
-            degisim = bist100.info.get("regularMarketChangePercent")
-            fiyat = bist100.info.get("regularMarketPrice")
+            bist100 = uygulama.onbellek.fiyat_bilgisi("^XU100")
+            degisim = bist100.get("regularMarketChangePercent")
+            fiyat = bist100.get("regularMarketPrice")
 
             if degisim is not None and fiyat is not None:
                 print(f"\n📈 BIST100 Endeksi")
@@ -158,9 +200,20 @@ def main():
                     print(f"Hatalı giriş: '{parca}'. Bu hisse atlanacak.")
             uygulama.portfoy_analizi(hisseler_lotlar)
         elif secim == "5":
-            hisse = input("Takip edilecek hisse kodunu girin (örn: THYAO.IS): ")
+            print("Birden fazla hisse için virgülle ayırın, 'hepsi' listedeki tüm hisseler, '@dosya' izleme listesi")
+            giris = input("Takip edilecek hisse kodları (örn: THYAO.IS): ").strip()
             sure = int(input("Takip süresi (dakika): "))
-            uygulama.canli_takip(hisse, sure)
+            if giris.lower() == "hepsi":
+                hisseler = list(uygulama.bist100_hisseleri)
+            elif giris.startswith("@"):
+                try:
+                    hisseler = izleme_listesi_oku(giris[1:])
+                except OSError as e:
+                    print(f"İzleme listesi okunamadı: {e}")
+                    continue
+            else:
+                hisseler = [h.strip() for h in giris.split(",") if h.strip()]
+            uygulama.canli_takip(hisseler, sure)
 
         elif secim == "6":
             print("Uygulama kapatılıyor...")
@@ -170,5 +223,13 @@ def main():
             print("Geçersiz seçim! Lütfen 1-6 arası bir sayı girin.")
 
 
+def main():
+    uygulama = BorsaUygulamasi()
+    try:
+        menu(uygulama)
+    finally:
+        uygulama.kapat()
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
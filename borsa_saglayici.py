@@ -0,0 +1,299 @@
+"""Piyasa verisi sağlayıcı arayüzü: canlı yfinance, diske kaydeden, çevrimdışı tekrar oynatan ve yerel servise soran uygulamalar
+
+Ağır kütüphaneler (yfinance, pandas, numpy) yalnızca gerektiren çağrıda yüklenir.
+"""
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from collections import defaultdict
+
+from borsa_takvim import period_gunu
+
+
+class SaglayiciHatasi(Exception):
+    """Sağlayıcı veriyi döndüremedi (kayıt yok ya da enjekte edilmiş hata)"""
+
+
+class MarketDataProvider:
+    """Uygulamanın piyasa verisine eriştiği tek nokta"""
+
+    def info(self, sembol):
+        """`ticker.info` biçiminde sözlük döndürür"""
+        raise NotImplementedError
+
+    def history(self, sembol, period=None, start=None, end=None, interval="1d"):
+        """`ticker.history` biçiminde OHLCV DataFrame döndürür"""
+        raise NotImplementedError
+
+
+class YFinanceSaglayici(MarketDataProvider):
+    def info(self, sembol):
+        import yfinance as yf
+        return yf.Ticker(sembol).info
+
+    def history(self, sembol, period=None, start=None, end=None, interval="1d"):
+        import yfinance as yf
+        ticker = yf.Ticker(sembol)
+        if start is not None:
+            return ticker.history(start=start, end=end, interval=interval)
+        return ticker.history(period=period or "1mo", interval=interval)
+
+
+# borsa_servis'in varsayılan dinleme adresi
+SERVIS_ADRESI = "http://127.0.0.1:8765"
+# Sentetik gün içi barların pandas frekansları; listede olmayan aralıklar iş günü olarak üretilir
+SENTETIK_SIKLIKLAR = {"1m": "min", "2m": "2min", "5m": "5min", "15m": "15min", "30m": "30min", "60m": "h", "1h": "h"}
+
+
+def _gecmis_anahtari(sembol, period, start, end, interval):
+    ham = f"{sembol}|{period}|{start}|{end}|{interval}"
+    return hashlib.sha1(ham.encode("utf-8")).hexdigest()[:16]
+
+
+class KaydedenSaglayici(MarketDataProvider):
+    """Başka bir sağlayıcının yanıtlarını diske yazarak aynen geçirir.
+
+    info yanıtları sembol başına JSONL dosyasına sırayla eklenir, geçmiş
+    yanıtları istek parametrelerinden türetilen anahtarla pickle olarak saklanır.
+    """
+
+    def __init__(self, kaynak, dizin):
+        self.kaynak = kaynak
+        self.dizin = dizin
+        os.makedirs(os.path.join(dizin, "info"), exist_ok=True)
+        os.makedirs(os.path.join(dizin, "history"), exist_ok=True)
+        self._kilit = threading.Lock()
+
+    def info(self, sembol):
+        veri = self.kaynak.info(sembol)
+        with self._kilit:
+            with open(os.path.join(self.dizin, "info", f"{sembol}.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(veri, default=str) + "\n")
+        return veri
+
+    def history(self, sembol, period=None, start=None, end=None, interval="1d"):
+        df = self.kaynak.history(sembol, period=period, start=start, end=end, interval=interval)
+        anahtar = _gecmis_anahtari(sembol, period, start, end, interval)
+        df.to_pickle(os.path.join(self.dizin, "history", f"{anahtar}.pkl"))
+        with self._kilit:
+            with open(os.path.join(self.dizin, "history", "dizin.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "anahtar": anahtar, "sembol": sembol, "period": period,
+                    "start": str(start) if start is not None else None,
+                    "end": str(end) if end is not None else None, "interval": interval,
+                }) + "\n")
+        return df
+
+
+class TekrarSaglayici(MarketDataProvider):
+    """Kayıtlı yanıtları ağa çıkmadan, belirlenimci biçimde tekrar oynatır.
+
+    - info: sembolün kayıtlı yanıtları sırayla, sona gelince baştan döndürülür.
+    - history: aynı parametreli kayıt yoksa sembolün en uzun kaydı istenen aralığa kırpılır.
+    - gecikme: her çağrıya eklenen sabit süre ya da (ortalama, sapma) çifti.
+    - hata_orani: çağrıların bu oranı `SaglayiciHatasi` ile düşer.
+    - sentetik: kaydı olmayan semboller için tohumu sembolden türetilen rastgele yürüyüş üretilir.
+    Tüm rastlantısallık `tohum` ile sabitlenir; aynı çağrı sırası aynı sonucu verir.
+    """
+
+    def __init__(self, dizin=None, gecikme=0.0, hata_orani=0.0, tohum=0, sentetik=False, bar_sayisi=252):
+        self.dizin = dizin
+        self.gecikme = gecikme
+        self.hata_orani = hata_orani
+        self.sentetik = sentetik or dizin is None
+        self.bar_sayisi = bar_sayisi
+        self._rng = random.Random(tohum)
+        self._kilit = threading.Lock()
+        self._info_kayitlari = {}
+        self._info_sirasi = defaultdict(int)
+        self._gecmis_dizini = defaultdict(list)
+        if dizin is not None:
+            self._kayitlari_yukle()
+        self.cagri_sayisi = 0
+
+    def _kayitlari_yukle(self):
+        info_dizini = os.path.join(self.dizin, "info")
+        if os.path.isdir(info_dizini):
+            for ad in os.listdir(info_dizini):
+                if ad.endswith(".jsonl"):
+                    with open(os.path.join(info_dizini, ad), encoding="utf-8") as f:
+                        self._info_kayitlari[ad[:-6]] = [json.loads(satir) for satir in f if satir.strip()]
+        dizin_dosyasi = os.path.join(self.dizin, "history", "dizin.jsonl")
+        if os.path.exists(dizin_dosyasi):
+            with open(dizin_dosyasi, encoding="utf-8") as f:
+                for satir in f:
+                    kayit = json.loads(satir)
+                    self._gecmis_dizini[kayit["sembol"]].append(kayit)
+
+    def _cagri(self):
+        """Gecikme ve hata enjeksiyonu; kilit altında çekilen sayılar çağrı sırasını belirlenimci tutar"""
+        with self._kilit:
+            self.cagri_sayisi += 1
+            if isinstance(self.gecikme, tuple):
+                bekleme = max(0.0, self._rng.gauss(*self.gecikme))
+            else:
+                bekleme = self.gecikme
+            hata = self.hata_orani and self._rng.random() < self.hata_orani
+        if bekleme:
+            time.sleep(bekleme)
+        if hata:
+            raise SaglayiciHatasi("Enjekte edilmiş sağlayıcı hatası")
+
+    @staticmethod
+    def _sembol_tohumu(sembol):
+        return zlib.crc32(sembol.encode("utf-8"))
+
+    def _sentetik_gecmis(self, sembol, bar, interval="1d"):
+        import numpy as np
+        import pandas as pd
+        siklik = SENTETIK_SIKLIKLAR.get(interval)
+        tohum = self._sembol_tohumu(sembol)
+        rng = np.random.default_rng(tohum if siklik is None else (tohum, zlib.crc32(interval.encode("utf-8"))))
+        if siklik is None:
+            index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=bar, tz="Europe/Istanbul")
+        else:
+            index = pd.date_range(end=pd.Timestamp.now(tz="Europe/Istanbul").floor(siklik), periods=bar, freq=siklik)
+        kapanis = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bar)))
+        acilis = kapanis * (1 + rng.normal(0, 0.005, bar))
+        return pd.DataFrame(
+            {
+                "Open": acilis,
+                "High": np.maximum(acilis, kapanis) * 1.01,
+                "Low": np.minimum(acilis, kapanis) * 0.99,
+                "Close": kapanis,
+                "Volume": rng.integers(10_000, 5_000_000, bar).astype(float),
+            },
+            index=index,
+        )
+
+    def _sentetik_info(self, sembol, sira):
+        rng = random.Random(f"{sembol}|{sira}")
+        fiyat = 100 * math.exp(rng.gauss(0, 0.3))
+        return {
+            "longName": f"{sembol} Sentetik A.Ş.",
+            "sector": ("Banks", "Industrials", "Energy", "Technology")[self._sembol_tohumu(sembol) % 4],
+            "marketCap": int(self._sembol_tohumu(sembol) % 10 ** 6) * 10 ** 5,
+            "currency": "TRY",
+            "regularMarketPrice": round(fiyat, 2),
+            "regularMarketChangePercent": rng.gauss(0, 1.5),
+            "regularMarketVolume": rng.randrange(10_000, 5_000_000),
+        }
+
+    def info(self, sembol):
+        self._cagri()
+        with self._kilit:
+            sira = self._info_sirasi[sembol]
+            self._info_sirasi[sembol] += 1
+        kayitlar = self._info_kayitlari.get(sembol)
+        if kayitlar:
+            return dict(kayitlar[sira % len(kayitlar)])
+        if self.sentetik:
+            return self._sentetik_info(sembol, sira)
+        raise SaglayiciHatasi(f"{sembol} için kayıtlı info yok")
+
+    def history(self, sembol, period=None, start=None, end=None, interval="1d"):
+        import pandas as pd
+        self._cagri()
+        anahtar = _gecmis_anahtari(sembol, period, start, end, interval)
+        yol = os.path.join(self.dizin, "history", f"{anahtar}.pkl") if self.dizin else None
+        if yol and os.path.exists(yol):
+            return pd.read_pickle(yol)
+        adaylar = [k for k in self._gecmis_dizini.get(sembol, []) if k["interval"] == interval]
+        if adaylar:
+            df = max((pd.read_pickle(os.path.join(self.dizin, "history", f"{k['anahtar']}.pkl")) for k in adaylar), key=len)
+        elif self.sentetik:
+            df = self._sentetik_gecmis(sembol, self.bar_sayisi, interval)
+        else:
+            raise SaglayiciHatasi(f"{sembol} için kayıtlı geçmiş yok")
+        return self._kirp(df, period, start, end)
+
+    @staticmethod
+    def _kirp(df, period, start, end):
+        import pandas as pd
+        if df.empty:
+            return df
+        tz = getattr(df.index, 'tz', None)
+
+        def zaman(deger):
+            ts = pd.Timestamp(deger)
+            return ts.tz_localize(tz) if ts.tzinfo is None and tz is not None else ts
+
+        if start is not None:
+            df = df[df.index >= zaman(start)]
+        if end is not None:
+            df = df[df.index < zaman(end)]
+        if start is None and period not in (None, "max"):
+            df = df[df.index >= df.index[-1] - pd.Timedelta(days=period_gunu(period))]
+        return df
+
+
+class ServisSaglayici(MarketDataProvider):
+    """Yerel fiyat servisine (borsa_servis) HTTP ile soran ince istemci.
+
+    Sağlayıcı çağrıları, önbellek ve veritabanı yazımı serviste yapılır; aynı
+    sembolü aynı anda soran istemcilerin istekleri orada tek çağrıya iner.
+    """
+
+    def __init__(self, adres=SERVIS_ADRESI, zaman_asimi=30.0):
+        self.adres = adres.rstrip("/")
+        self.zaman_asimi = zaman_asimi
+
+    def _getir(self, yol, **parametreler):
+        from urllib.error import HTTPError, URLError
+        from urllib.parse import urlencode
+        from urllib.request import urlopen
+        sorgu = urlencode({ad: deger for ad, deger in parametreler.items() if deger is not None})
+        try:
+            with urlopen(f"{self.adres}{yol}?{sorgu}", timeout=self.zaman_asimi) as yanit:
+                return json.load(yanit)
+        except HTTPError as e:
+            try:
+                mesaj = json.load(e).get("hata")
+            except ValueError:
+                mesaj = None
+            raise SaglayiciHatasi(mesaj or f"Servis HTTP {e.code} döndürdü") from e
+        except URLError as e:
+            raise SaglayiciHatasi(f"Servise ulaşılamadı ({self.adres}): {e.reason}") from e
+
+    def info(self, sembol):
+        # İstemci önbelleği buraya yalnızca ıskada ya da taze istekte düşer;
+        # servis taze istekleri canlı yoklama aralığı içinde birleştirir
+        veri = self._getir("/info", s=sembol, taze=1)
+        if sembol in veri["hatalar"]:
+            raise SaglayiciHatasi(veri["hatalar"][sembol])
+        return veri["sonuc"][sembol]
+
+    def history(self, sembol, period=None, start=None, end=None, interval="1d"):
+        import pandas as pd
+        veri = self._getir("/history", s=sembol, period=period, start=start, end=end, interval=interval)
+        index = pd.DatetimeIndex(pd.to_datetime(veri["index"]), name=veri["ad"])
+        return pd.DataFrame(veri["data"], index=index, columns=veri["columns"])
+
+
+def saglayici_olustur(tanim=None):
+    """BORSA_SAGLAYICI ortam değişkeninden sağlayıcı kurar.
+
+    yfinance (varsayılan) | kayit:<dizin> | tekrar:<dizin> | sentetik | servis:<adres>
+    """
+    tanim = tanim or os.getenv("BORSA_SAGLAYICI", "yfinance")
+    tur, _, dizin = tanim.partition(":")
+    if tur == "yfinance":
+        return YFinanceSaglayici()
+    if tur == "kayit":
+        return KaydedenSaglayici(YFinanceSaglayici(), dizin or "kayitlar")
+    if tur == "tekrar":
+        return TekrarSaglayici(
+            dizin or "kayitlar",
+            gecikme=float(os.getenv("BORSA_SAGLAYICI_GECIKME", "0")),
+            hata_orani=float(os.getenv("BORSA_SAGLAYICI_HATA", "0")),
+        )
+    if tur == "sentetik":
+        return TekrarSaglayici(gecikme=float(os.getenv("BORSA_SAGLAYICI_GECIKME", "0")), sentetik=True)
+    if tur == "servis":
+        return ServisSaglayici(dizin or SERVIS_ADRESI)
+    raise ValueError(f"Bilinmeyen sağlayıcı: {tanim}")
@@ -0,0 +1,375 @@
+"""Yerel fiyat servisi: sağlayıcı çağrıları, önbellek ve veritabanı yazıcısı tek süreçte toplanır
+
+Aynı makinedeki terminaller ve cron betikleri bu servise bağlanır; aynı anda
+gelen özdeş istekler tek sağlayıcı çağrısına iner, tickler tek bağlantıdan yazılır.
+
+  python -m borsa_servis --port 8765
+  python borsa_takip_projesi_database_ile.py --servis http://127.0.0.1:8765
+
+Uç noktalar (JSON):
+  GET /quote?s=THYAO.IS,GARAN.IS[&taze=1]   fiyat alanları ({"sonuc": ..., "hatalar": ...})
+  GET /info?s=THYAO.IS[&taze=1]             meta + fiyat alanları (ticker.info biçimi)
+  GET /history?s=THYAO.IS&period=1y         fiyat geçmişi (günlükte yerel depo + eksik aralık senkronu)
+  GET /stats                                önbellek, birleştirme ve yayın sayaçları
+  GET /ws?s=THYAO.IS,GARAN.IS               WebSocket tick akışı; {"abone": [...]} ve {"cik": [...]} mesajları
+"""
+import argparse
+import asyncio
+import json
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from aiohttp import WSMsgType, WSCloseCode, web
+
+from borsa_canli_motor import CanliTakipMotoru
+from borsa_metrik import metrikler
+from borsa_onbellek import TTLOnbellek
+from borsa_toplu_veri import TopluVeriCekici
+
+_json = partial(json.dumps, ensure_ascii=False, default=str)
+
+
+def _semboller(metin):
+    return list(dict.fromkeys(s.strip() for s in (metin or "").split(",") if s.strip()))
+
+
+def _abonelik_komutu(komut):
+    """{"abone": [...], "cik": [...]} mesajından sembol listelerini döndürür; biçim hatalıysa (None, None)"""
+    if not isinstance(komut, dict):
+        return None, None
+    listeler = []
+    for ad in ("abone", "cik"):
+        semboller = komut.get(ad, [])
+        if not isinstance(semboller, list) or not all(isinstance(s, str) and s.strip() for s in semboller):
+            return None, None
+        listeler.append([s.strip() for s in semboller])
+    return listeler
+
+
+def _hata(durum, mesaj):
+    return web.json_response({"hata": mesaj}, status=durum, dumps=_json)
+
+
+def _cerceve_json(df):
+    """Fiyat DataFrame'ini ServisSaglayici'nin geri kurduğu bölünmüş biçime çevirir; saat dilimi korunur"""
+    if df is None:
+        return _json({"index": [], "columns": [], "data": [], "ad": None})
+    return _json({
+        "index": [ts.isoformat() for ts in df.index],
+        "columns": [str(ad) for ad in df.columns],
+        "data": df.to_numpy().tolist(),
+        "ad": df.index.name,
+    })
+
+
+class _Istemci:
+    """Bir WebSocket bağlantısı; yavaş istemci yayını bekletmesin diye kendi sınırlı kuyruğundan yazılır"""
+
+    def __init__(self, ws, kapasite):
+        self.ws = ws
+        self.kuyruk = asyncio.Queue(kapasite)
+        self.semboller = set()
+        self.dusen = 0
+
+    def ekle(self, mesaj):
+        if self.kuyruk.full():
+            # Kuyruk doluysa en eski tick atılır, istemci her zaman son fiyatı görür
+            self.kuyruk.get_nowait()
+            self.dusen += 1
+        self.kuyruk.put_nowait(mesaj)
+
+    async def gonder(self):
+        while True:
+            mesaj = await self.kuyruk.get()
+            try:
+                await self.ws.send_str(mesaj)
+            except ConnectionError:
+                return
+
+
+class BorsaServisi:
+    """BorsaUygulamasi'nın önbelleğini, deposunu ve tick yazıcısını HTTP/WebSocket istemcilerine paylaştırır.
+
+    Engelleyen sağlayıcı ve depo çağrıları iş parçacığı havuzunda çalışır; aynı
+    anahtarla uçuştaki bir çağrı varsa yeni istek onun sonucunu bekler.
+    Canlı yoklamalar `canli_aralik` süreli ayrı bir önbellekten geçer, böylece
+    WebSocket akışı ve `taze=1` istekleri bu süre içinde tek çağrıya iner.
+    """
+
+    def __init__(self, uygulama, canli_aralik=1.0, isci=32, kuyruk=256):
+        self.uygulama = uygulama
+        self.kuyruk = kuyruk
+        self.canli = TTLOnbellek(max_boyut=4096, varsayilan_ttl=canli_aralik)
+        self._havuz = ThreadPoolExecutor(max_workers=isci, thread_name_prefix="servis")
+        self._ucustakiler = {}  # anahtar -> Future
+        self._canli_cekici = TopluVeriCekici(self._taze_fiyat, max_isci=16)
+        self.motor = CanliTakipMotoru(self._canli_cekici.getir, varsayilan_aralik=canli_aralik)
+        self.motor.abone_ol(self._tick_geldi)
+        self.motor.abone_ol(self._tick_kaydet)
+        self._aboneler = defaultdict(set)  # sembol -> {_Istemci}
+        self._son_mesaj = {}  # sembol -> son yayınlanan tick (yeni aboneye hemen gönderilir)
+        self._istemciler = set()
+        self._dongu = None
+        self.istekler = Counter()
+        self.birlesen = 0
+        self.yayin = 0
+
+    # Engelleyen işler (havuzda çalışır)
+
+    def _taze_fiyat(self, sembol):
+        return self.canli.getir(sembol, partial(self.uygulama.onbellek.fiyat_bilgisi, taze=True))
+
+    def _bilgi(self, sembol, taze):
+        if taze:
+            # Meta alanları taze çekimle birlikte tazelendi, birleşik sözlük ana önbellekten kurulur
+            fiyat = self._taze_fiyat(sembol)
+            bilgi = self.uygulama.onbellek.bilgi(sembol)
+            bilgi.update(fiyat)
+        else:
+            bilgi = self.uygulama.onbellek.bilgi(sembol)
+        # Sembol tablosuna oturumda bir kez yazılır
+        self.uygulama._bilgi_sozlugu(sembol, bilgi)
+        return bilgi
+
+    def _gecmis(self, sembol, period, start, end, interval):
+        if interval == "1d" and start is None and end is None:
+            df = self.uygulama.hisse_verisi_senkron(sembol, period or "1y")
+        else:
+            with metrikler.zamanla("saglayici.history", sembol):
+                df = self.uygulama.saglayici.history(sembol, period=period, start=start, end=end, interval=interval)
+        return _cerceve_json(df)
+
+    def _tick_kaydet(self, tick):
+        self.uygulama._save_live_tick(tick['sembol'], tick['fiyat'], tick['değişim'], tick.get('hacim'))
+
+    # İstek birleştirme
+
+    def _ucus_bitti(self, anahtar, gelecek):
+        self._ucustakiler.pop(anahtar, None)
+        # Bekleyenlerin hepsi iptal edildiyse hata kaydı "alınmadı" uyarısı üretmesin
+        if not gelecek.cancelled():
+            gelecek.exception()
+
+    async def _birlestir(self, anahtar, fonksiyon, *args):
+        gelecek = self._ucustakiler.get(anahtar)
+        if gelecek is None:
+            gelecek = asyncio.get_running_loop().run_in_executor(self._havuz, fonksiyon, *args)
+            self._ucustakiler[anahtar] = gelecek
+            gelecek.add_done_callback(partial(self._ucus_bitti, anahtar))
+        else:
+            self.birlesen += 1
+        # Bir istemcinin bağlantısı kopsa da ortak çağrı diğerleri için sürer
+        return await asyncio.shield(gelecek)
+
+    async def fiyat(self, sembol, taze=False):
+        onbellek = self.canli if taze else self.uygulama.onbellek.fiyat
+        # Önbellekteki fiyat havuza gitmeden döner
+        bulundu, deger = onbellek.al(sembol, iska_say=False)
+        if bulundu:
+            return deger
+        yukleyici = self._taze_fiyat if taze else self.uygulama.onbellek.fiyat_bilgisi
+        return await self._birlestir(("fiyat", sembol, taze), yukleyici, sembol)
+
+    def _toplu_yanit(self, islem, semboller, sonuclar):
+        sonuc, hatalar = {}, {}
+        for sembol, deger in zip(semboller, sonuclar):
+            if isinstance(deger, Exception):
+                metrikler.hata(islem, sembol, deger)
+                hatalar[sembol] = str(deger)
+            else:
+                sonuc[sembol] = deger
+        return web.json_response({"sonuc": sonuc, "hatalar": hatalar}, dumps=_json)
+
+    # HTTP
+
+    async def _quote(self, istek):
+        self.istekler["quote"] += 1
+        semboller = _semboller(istek.query.get("s"))
+        if not semboller:
+            return _hata(400, "s parametresi gerekli")
+        taze = istek.query.get("taze") == "1"
+        sonuclar = await asyncio.gather(*(self.fiyat(s, taze) for s in semboller), return_exceptions=True)
+        return self._toplu_yanit("servis.quote", semboller, sonuclar)
+
+    async def _info(self, istek):
+        self.istekler["info"] += 1
+        semboller = _semboller(istek.query.get("s"))
+        if not semboller:
+            return _hata(400, "s parametresi gerekli")
+        taze = istek.query.get("taze") == "1"
+        sonuclar = await asyncio.gather(
+            *(self._birlestir(("bilgi", s, taze), self._bilgi, s, taze) for s in semboller),
+            return_exceptions=True,
+        )
+        return self._toplu_yanit("servis.info", semboller, sonuclar)
+
+    async def _history(self, istek):
+        self.istekler["history"] += 1
+        sembol = istek.query.get("s")
+        if not sembol:
+            return _hata(400, "s parametresi gerekli")
+        parametreler = tuple(istek.query.get(ad) for ad in ("period", "start", "end")) + (
+            istek.query.get("interval", "1d"),)
+        try:
+            metin = await self._birlestir(("gecmis", sembol) + parametreler, self._gecmis, sembol, *parametreler)
+        except Exception as e:
+            metrikler.hata("servis.history", sembol, e)
+            return _hata(502, f"{sembol} fiyat geçmişi alınamadı: {e}")
+        return web.Response(text=metin, content_type="application/json")
+
+    async def _stats(self, istek):
+        return web.json_response(self.istatistik(), dumps=_json)
+
+    # WebSocket
+
+    def _tick_geldi(self, tick):
+        # Motor iş parçacığından çağrılır; dağıtım olay döngüsünde yapılır
+        self._dongu.call_soon_threadsafe(self._dagit, tick)
+
+    def _dagit(self, tick):
+        # Mesaj abone sayısından bağımsız olarak bir kez serileştirilir
+        mesaj = _json({
+            'sembol': tick['sembol'],
+            'zaman': tick['zaman'].isoformat(),
+            'fiyat': tick['fiyat'],
+            'değişim': tick['değişim'],
+            'hacim': tick['hacim'],
+        })
+        self._son_mesaj[tick['sembol']] = mesaj
+        for istemci in self._aboneler.get(tick['sembol'], ()):
+            istemci.ekle(mesaj)
+            self.yayin += 1
+
+    def _abone_et(self, istemci, semboller):
+        for sembol in semboller:
+            if sembol in istemci.semboller:
+                continue
+            istemci.semboller.add(sembol)
+            if not self._aboneler[sembol]:
+                self.motor.ekle(sembol)
+            self._aboneler[sembol].add(istemci)
+            if sembol in self._son_mesaj:
+                istemci.ekle(self._son_mesaj[sembol])
+
+    def _cik(self, istemci, semboller):
+        for sembol in semboller:
+            if sembol not in istemci.semboller:
+                continue
+            istemci.semboller.discard(sembol)
+            aboneler = self._aboneler[sembol]
+            aboneler.discard(istemci)
+            if not aboneler:
+                # Son abone gidince sembol yoklanmaz
+                del self._aboneler[sembol]
+                self._son_mesaj.pop(sembol, None)
+                self.motor.cikar(sembol)
+
+    async def _ws(self, istek):
+        self.istekler["ws"] += 1
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(istek)
+        istemci = _Istemci(ws, self.kuyruk)
+        self._istemciler.add(istemci)
+        gonderici = asyncio.get_running_loop().create_task(istemci.gonder())
+        self._abone_et(istemci, _semboller(istek.query.get("s")))
+        try:
+            async for mesaj in ws:
+                if mesaj.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    komut = json.loads(mesaj.data)
+                except ValueError:
+                    komut = None
+                abone, cik = _abonelik_komutu(komut)
+                if abone is None:
+                    await ws.send_str(_json({"hata": "Beklenen mesaj: {\"abone\": [...]} ya da {\"cik\": [...]}"}))
+                    continue
+                self._abone_et(istemci, abone)
+                self._cik(istemci, cik)
+        finally:
+            self._cik(istemci, list(istemci.semboller))
+            self._istemciler.discard(istemci)
+            gonderici.cancel()
+        return ws
+
+    # Yaşam döngüsü
+
+    async def _basla(self, app):
+        self._dongu = asyncio.get_running_loop()
+        self.motor.baslat()
+
+    async def _kapat_istemciler(self, app):
+        for istemci in list(self._istemciler):
+            await istemci.ws.close(code=WSCloseCode.GOING_AWAY, message=b"Servis kapaniyor")
+
+    async def _temizle(self, app):
+        self.motor.durdur(zaman_asimi=5.0)
+        self._canli_cekici.kapat()
+        self._havuz.shutdown(wait=True)
+        # Bekleyen tickler yazılır, önbellek diske alınır
+        self.uygulama.kapat()
+
+    def web_uygulamasi(self):
+        app = web.Application()
+        app.router.add_get("/quote", self._quote)
+        app.router.add_get("/info", self._info)
+        app.router.add_get("/history", self._history)
+        app.router.add_get("/stats", self._stats)
+        app.router.add_get("/ws", self._ws)
+        app.on_startup.append(self._basla)
+        app.on_shutdown.append(self._kapat_istemciler)
+        app.on_cleanup.append(self._temizle)
+        return app
+
+    def istatistik(self):
+        return {
+            'istek': dict(self.istekler),
+            'birlesen': self.birlesen,
+            'ucusta': len(self._ucustakiler),
+            'istemci': len(self._istemciler),
+            'abone_sembol': len(self._aboneler),
+            'yayin': self.yayin,
+            'dusen': sum(istemci.dusen for istemci in self._istemciler),
+            'onbellek': self.uygulama.onbellek.istatistik(),
+            'canli_onbellek': self.canli.istatistik(),
+            'motor': self.motor.istatistik(),
+            'tick_yazici': self.uygulama.tick_yazici.istatistik(),
+        }
+
+
+def _arguman_ayristirici():
+    ayrac = argparse.ArgumentParser(description="Yerel fiyat servisi (HTTP + WebSocket)")
+    ayrac.add_argument("--host", default="127.0.0.1")
+    ayrac.add_argument("--port", type=int, default=8765)
+    ayrac.add_argument("--canli-aralik", type=float, default=1.0,
+                       help="Canlı yoklama aralığı (saniye); bu süre içindeki taze istekler tek çağrıya iner")
+    ayrac.add_argument("--isci", type=int, default=32, help="Sağlayıcı ve depo çağrıları için iş parçacığı sayısı")
+    ayrac.add_argument("--kuyruk", type=int, default=256, help="WebSocket istemcisi başına bekleyen en fazla tick")
+    ayrac.add_argument("--saglayici", help="yfinance | kayit:<dizin> | tekrar:<dizin> | sentetik (varsayılan: BORSA_SAGLAYICI)")
+    ayrac.add_argument("--depo", help="mysql | gomulu | yok (varsayılan: BORSA_DEPO)")
+    ayrac.add_argument("--tick-tasma", metavar="DOSYA",
+                       help="spill politikasında taşan ticklerin yazılacağı dosya (varsayılan: TICK_TASMA)")
+    return ayrac
+
+
+def main(argv=None):
+    args = _arguman_ayristirici().parse_args(argv)
+    from borsa_depolama import depo_olustur
+    from borsa_saglayici import saglayici_olustur
+    from borsa_takip_projesi_database_ile import BorsaUygulamasi
+
+    uygulama = BorsaUygulamasi(
+        saglayici=saglayici_olustur(args.saglayici) if args.saglayici else None,
+        depo=depo_olustur(args.depo) if args.depo else None,
+        tasma_dosyasi=args.tick_tasma,
+    )
+    servis = BorsaServisi(uygulama, canli_aralik=args.canli_aralik, isci=args.isci, kuyruk=args.kuyruk)
+    print(f"Fiyat servisi dinliyor: http://{args.host}:{args.port}", flush=True)
+    web.run_app(servis.web_uygulamasi(), host=args.host, port=args.port, print=None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
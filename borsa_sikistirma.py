@@ -0,0 +1,203 @@
+"""live_ticks tablosunu 1m/5m/1h OHLC barlarına sıkıştıran ve eski tickleri parça parça silen iş
+
+Her çalıştırma job_state tablosundaki su seviyesinden (son işlenen tick id'si)
+devam eder; yalnızca yeni ticklerin düştüğü barlar yeniden hesaplanıp
+price_bars tablosuna "tick_1m" gibi önekli aralık adlarıyla upsert edilir,
+sağlayıcıdan backfill edilen "1m" barlarıyla aynı anahtarı paylaşmaz. Bir
+barın tamamı ts aralığıyla yeniden okunduğu için geç gelen (ör. taşma
+dosyasından geri yüklenen) tickler de doğru bara eklenir. Bar hacmi,
+ticklerdeki günlük kümülatif hacmin bar içindeki artışından hesaplanır. Saklama süresini aşan ve sıkıştırılmış tickler, her biri
+kısa bir işlem olan sınırlı partilerle silinir.
+
+Kullanım: python -m borsa_sikistirma --saklama-gun 7 [--dongu 300]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from borsa_metrik import metrikler
+
+# bar aralığı -> pandas resample frekansı
+ARALIKLAR = {"1m": "min", "5m": "5min", "1h": "h"}
+# Tick barları price_bars'ta bu önekle saklanır; sağlayıcı barlarının hacmi ve OHLC'si ezilmez
+BAR_ONEKI = "tick_"
+SU_SEVIYESI = "tick_sikistirma.son_id"
+# Aralığın ilk tick'inin hacim artışı için kapsamdan bu kadar önceki tickler de okunur
+HACIM_PAYI = timedelta(minutes=15)
+
+
+def bar_araligi(aralik):
+    """Sıkıştırılmış barların price_bars'taki bar_interval değeri, örn. 1m -> tick_1m"""
+    return BAR_ONEKI + aralik
+
+
+def hacim_artislari(hacim):
+    """Günlük kümülatif hacim serisinden tick başına işlem hacmi.
+
+    Her tick aynı gün içindeki bir önceki bilinen değere göre farkı alır. Günün
+    ilk tick'i ve hacmi azalan (sağlayıcının düzelttiği) tickler 0 katkı verir;
+    hacmi bilinmeyen tickler atlanır.
+    """
+    hacim = hacim.dropna().astype(float)
+    if hacim.empty:
+        return hacim
+    gun = hacim.index.normalize()
+    ayni_gun = np.append(False, gun[1:] == gun[:-1])
+    fark = hacim.diff()
+    return fark.where(ayni_gun & (fark >= 0), 0.0)
+
+
+def tick_barlari(ticklar, siklik):
+    """Price/Volume sütunlu tick çerçevesinden Open/High/Low/Close/Volume/TickCount barları üretir.
+
+    Volume, bardaki ticklerin hacim artışlarının toplamıdır; hiçbir tick'inde hacim
+    olmayan barlarda (ör. hacim sütunu eklenmeden önce yazılmış tickler) boş kalır.
+    """
+    gruplar = ticklar["Price"].resample(siklik)
+    barlar = gruplar.ohlc().rename(columns=str.capitalize)
+    if "Volume" in ticklar:
+        artis = hacim_artislari(ticklar["Volume"])
+        barlar["Volume"] = artis.resample(siklik).sum(min_count=1).reindex(barlar.index)
+    else:
+        barlar["Volume"] = float("nan")
+    barlar["TickCount"] = gruplar.count()
+    return barlar[barlar["TickCount"] > 0]
+
+
+class TickSikistirici:
+    """Depo üzerinde su seviyesinden artımlı sıkıştırma ve saklama süresine göre temizlik"""
+
+    def __init__(self, depo, araliklar=tuple(ARALIKLAR), parti=20000, saklama_gun=7,
+                 silme_partisi=5000, silme_beklemesi=0.05):
+        for aralik in araliklar:
+            if aralik not in ARALIKLAR:
+                raise ValueError(f"Desteklenmeyen bar aralığı: {aralik} ({', '.join(ARALIKLAR)})")
+        self.depo = depo
+        self.araliklar = tuple(araliklar)
+        self.parti = max(1, int(parti))
+        self.saklama = timedelta(days=saklama_gun)
+        self.silme_partisi = max(1, int(silme_partisi))
+        self.silme_beklemesi = silme_beklemesi
+
+    def su_seviyesi(self):
+        deger = self.depo.durum_oku(SU_SEVIYESI)
+        return int(deger) if deger else 0
+
+    def _kapsam(self, ilk, son):
+        """Tick aralığını en uzun bar aralığının sınırlarına genişletir"""
+        en_uzun = max((pd.Timedelta(pd.tseries.frequencies.to_offset(ARALIKLAR[a])) for a in self.araliklar))
+        bas = pd.Timestamp(ilk).floor(en_uzun)
+        bit = pd.Timestamp(son).floor(en_uzun) + en_uzun
+        return bas.to_pydatetime(), bit.to_pydatetime()
+
+    def sikistir(self):
+        """Su seviyesinden sonraki tüm tickleri partiler halinde barlara işler"""
+        sonuc = {'tick': 0, 'bar': 0, 'parti': 0}
+        son_id = self.su_seviyesi()
+        while True:
+            parti = self.depo.tick_partisi(son_id, self.parti)
+            if not parti:
+                break
+            araliklar = {}  # sembol -> [ilk ts, son ts]
+            for _, sembol, ts in parti:
+                aralik = araliklar.get(sembol)
+                if aralik is None:
+                    araliklar[sembol] = [ts, ts]
+                elif ts < aralik[0]:
+                    aralik[0] = ts
+                elif ts > aralik[1]:
+                    aralik[1] = ts
+            for sembol, (ilk, son) in araliklar.items():
+                bas, bit = self._kapsam(ilk, son)
+                with metrikler.zamanla("sikistirma.oku", sembol):
+                    ticklar = self.depo.tickleri_oku(sembol, bas - HACIM_PAYI, bit)
+                if ticklar.empty:
+                    continue
+                for aralik in self.araliklar:
+                    # Paydaki tickler yalnızca hacim farkı içindir; o barlar yeniden yazılmaz
+                    barlar = tick_barlari(ticklar, ARALIKLAR[aralik])
+                    barlar = barlar[barlar.index >= bas]
+                    if barlar.empty:
+                        continue
+                    with metrikler.zamanla("sikistirma.yaz", sembol):
+                        sonuc['bar'] += self.depo.barlari_kaydet(sembol, bar_araligi(aralik), barlar)
+            # Barlar yazıldıktan sonra ilerletilir; arada kesilirse aynı parti zararsızca yeniden işlenir
+            son_id = parti[-1][0]
+            self.depo.durum_yaz(SU_SEVIYESI, son_id)
+            sonuc['tick'] += len(parti)
+            sonuc['parti'] += 1
+            if len(parti) < self.parti:
+                break
+        return sonuc
+
+    def temizle(self, simdi=None):
+        """Saklama süresini aşmış ve sıkıştırılmış tickleri sınırlı partilerle siler"""
+        sinir = (simdi or datetime.now()) - self.saklama
+        son_id = self.su_seviyesi()
+        silinen = 0
+        while True:
+            with metrikler.zamanla("sikistirma.sil"):
+                adet = self.depo.eski_tickleri_sil(sinir, son_id, self.silme_partisi)
+            silinen += adet
+            if adet < self.silme_partisi:
+                return silinen
+            # Partiler arasında canlı yazımlara nefes payı bırakılır
+            time.sleep(self.silme_beklemesi)
+
+    def calistir(self):
+        baslangic = time.perf_counter()
+        sonuc = self.sikistir()
+        sonuc['silinen'] = self.temizle()
+        sonuc['sure'] = time.perf_counter() - baslangic
+        return sonuc
+
+
+def _arguman_ayristirici():
+    ayrac = argparse.ArgumentParser(description="live_ticks → price_bars sıkıştırma ve saklama temizliği")
+    ayrac.add_argument("--aralik", default=",".join(ARALIKLAR), help="Virgülle ayrılmış bar aralıkları")
+    ayrac.add_argument("--saklama-gun", type=float, default=7, help="Ham ticklerin saklanacağı gün sayısı")
+    ayrac.add_argument("--parti", type=int, default=20000, help="Bir seferde işlenen tick sayısı")
+    ayrac.add_argument("--silme-partisi", type=int, default=5000, help="Tek DELETE ile silinen en fazla tick")
+    ayrac.add_argument("--dongu", type=float, metavar="SANIYE", help="Verilirse bu aralıkla sürekli çalışır")
+    ayrac.add_argument("--depo", help="mysql | gomulu (varsayılan: BORSA_DEPO)")
+    return ayrac
+
+
+def main(argv=None):
+    args = _arguman_ayristirici().parse_args(argv)
+    from borsa_depolama import depo_olustur
+
+    depo = depo_olustur(args.depo)
+    sikistirici = TickSikistirici(
+        depo,
+        araliklar=[a.strip() for a in args.aralik.split(",") if a.strip()],
+        parti=args.parti,
+        saklama_gun=args.saklama_gun,
+        silme_partisi=args.silme_partisi,
+    )
+    try:
+        while True:
+            try:
+                sonuc = sikistirici.calistir()
+                print(f"{sonuc['tick']} tick → {sonuc['bar']} bar ({sonuc['parti']} parti), "
+                      f"{sonuc['silinen']} eski tick silindi, {sonuc['sure']:.2f} s")
+            except Exception as e:
+                metrikler.hata("sikistirma", hata=e)
+                print(f"Sıkıştırma hatası: {e}")
+                if not args.dongu:
+                    return 1
+            if not args.dongu:
+                return 0
+            time.sleep(args.dongu)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        depo.kapat()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,218 +1,277 @@
-import yfinance as yf
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 import time
+from functools import partial
 import os
-import mysql.connector
-import pandas as pd
+import sys
+import json
+import argparse
+
+# pandas, matplotlib, yfinance ve veritabanı sürücüleri modül başında yüklenmez;
+# ilgili eylem ilk kez çağrıldığında içe aktarılır, önbellekten yanıtlanan komutlar hızlı başlar
+from borsa_canli_motor import CanliTakipMotoru, KlavyeDinleyici, izleme_listesi_oku
+from borsa_metrik import metrikler
+from borsa_onbellek import BilgiOnbellegi
+from borsa_saglayici import saglayici_olustur
+from borsa_takvim import beklenen_son_gun, period_baslangici
+from borsa_tick_yazici import TickYazici
+from borsa_toplu_veri import TopluVeriCekici
+
+GUN_ICI_SENKRON_ARALIGI = 15 * 60  # seans içinde günün barı en fazla bu kadar saniyede bir tazelenir
+ONBELLEK_DOSYASI = os.getenv("BORSA_ONBELLEK", os.path.join(os.path.expanduser("~"), ".cache", "borsa", "bilgi_onbellegi.json"))
 
 
 class BorsaUygulamasi:
-    def __init__(self):
+    def __init__(self, saglayici=None, depo=None, onbellek_dosyasi=None, tasma_dosyasi=None):
+        # Tüm piyasa verisi bu sağlayıcıdan geçer (BORSA_SAGLAYICI: yfinance | kayit:<dizin> | tekrar:<dizin> | sentetik | servis:<adres>)
+        self.saglayici = saglayici or saglayici_olustur()
         self.bist100_hisseleri = [
             "THYAO.IS", "GARAN.IS", "AKBNK.IS", "ASELS.IS", "KRDMD.IS",
             "SASA.IS", "EREGL.IS", "KCHOL.IS", "TUPRS.IS", "BIMAS.IS","KAYSE.IS"
         ]
-        self.db_conn = None
-        self._db_connect()
-        self._ensure_tables()
-
-    def _db_connect(self):
+        # Tam sembol evreni (backfill ile aynı dosya) verilirse sabit liste yerine o kullanılır
+        if os.getenv("BORSA_SEMBOL_DOSYASI"):
+            from borsa_backfill import sembolleri_oku
+            self.bist100_hisseleri = list(sembolleri_oku(os.getenv("BORSA_SEMBOL_DOSYASI")))
+        # Meta alanlar saatlerce, fiyat alanları saniyeler mertebesinde saklanır
+        self.onbellek = BilgiOnbellegi(self._ticker_info, meta_ttl=6 * 3600, fiyat_ttl=15)
+        # Önceki çalıştırmaların hâlâ geçerli girdileri diskten alınır (cron'dan gelen ardışık çağrılar için)
+        self.onbellek_dosyasi = onbellek_dosyasi or ONBELLEK_DOSYASI
         try:
-            self.db_conn = mysql.connector.connect(
-                host=os.getenv("MYSQL_HOST", "127.0.0.1"),
-                port=int(os.getenv("MYSQL_PORT", "3306")),
-                user=os.getenv("MYSQL_USER", "root"),
-                password=os.getenv("MYSQL_PASSWORD", "4340"),
-                database=os.getenv("MYSQL_DATABASE", "borsa")
-            )
-        except Exception as e:
-            print(f"MySQL bağlantı hatası: {e}")
-            self.db_conn = None
-
-    def _ensure_tables(self):
-        if not self.db_conn:
-            return
-        try:
-            cursor = self.db_conn.cursor()
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS symbols (
-                    symbol VARCHAR(32) PRIMARY KEY,
-                    name VARCHAR(255),
-                    sector VARCHAR(255),
-                    market_cap BIGINT
-                )
-                """
-            )
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS prices (
-                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
-                    symbol VARCHAR(32),
-                    ts DATETIME,
-                    open_price DOUBLE,
-                    high_price DOUBLE,
-                    low_price DOUBLE,
-                    close_price DOUBLE,
-                    volume DOUBLE,
-                    INDEX idx_symbol_ts (symbol, ts)
-                )
-                """
-            )
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS live_ticks (
-                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
-                    symbol VARCHAR(32),
-                    ts DATETIME,
-                    price DOUBLE,
-                    change_percent DOUBLE,
-                    INDEX idx_live_symbol_ts (symbol, ts)
-                )
-                """
-            )
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS portfolio_snapshots (
-                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
-                    created_at DATETIME,
-                    total_value DOUBLE
-                )
-                """
-            )
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS portfolio_lines (
-                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
-                    snapshot_id BIGINT,
-                    symbol VARCHAR(32),
-                    lot INT,
-                    price DOUBLE,
-                    value DOUBLE,
-                    INDEX idx_snapshot (snapshot_id)
-                )
-                """
-            )
-            self.db_conn.commit()
-            cursor.close()
-        except Exception as e:
-            print(f"Tablo oluşturma hatası: {e}")
+            self.onbellek.yukle(self.onbellek_dosyasi)
+        except (OSError, ValueError) as e:
+            print(f"Önbellek dosyası okunamadı: {e}")
+        self.toplu_cekici = TopluVeriCekici(self.onbellek.bilgi, max_isci=8)
+        # Canlı takip her turda taze fiyat ister
+        self.canli_cekici = TopluVeriCekici(partial(self.onbellek.fiyat_bilgisi, taze=True), max_isci=16)
+        self._kayitli_semboller = set()
+        self._son_senkron = {}  # sembol -> son ağ senkronunun monotonic zamanı
+        self._gecmis_basi = {}  # sembol -> tam çekimde istenen en eski başlangıç (daha eskisi yok)
+        self._indikator_onbellegi = None
+        self._tick_tamponu = None
+        self._tarayici = None
+        # Depo ilk kullanıldığında açılır; menü ve önbellekli komutlar veritabanına bağlanmaz
+        self._depo = depo
+        # Tickler arka planda, depodan alınan ayrı bir bağlantıyla toplu olarak yazılır
+        self.tick_yazici = TickYazici(
+            self._save_live_ticks,
+            max_kuyruk=int(os.getenv("TICK_KUYRUK", "10000")),
+            parti_boyutu=500,
+            flush_araligi=1.0,
+            politika=os.getenv("TICK_POLITIKA", "block"),
+            tasma_dosyasi=tasma_dosyasi,
+        )
+
+    @property
+    def depo(self):
+        if self._depo is None:
+            # Arka uç BORSA_DEPO ile seçilir: mysql (varsayılan) ya da gomulu (SQLite + Parquet)
+            from borsa_depolama import depo_olustur
+            self._depo = depo_olustur()
+        return self._depo
+
+    @property
+    def indikator_onbellegi(self):
+        if self._indikator_onbellegi is None:
+            from borsa_indikator import IndikatorOnbellegi
+            self._indikator_onbellegi = IndikatorOnbellegi()
+        return self._indikator_onbellegi
+
+    @property
+    def tick_tamponu(self):
+        """Canlı takipte gelen son tickler; canlı görünüm ve alarmlar veritabanına gitmeden buradan okur"""
+        if self._tick_tamponu is None:
+            from borsa_tick_tamponu import TickTamponu
+            self._tick_tamponu = TickTamponu(int(os.getenv("TICK_TAMPONU", "1024")))
+        return self._tick_tamponu
+
+    @property
+    def tarayici(self):
+        """Sembol evreni taraması; özellikler depoda, panel bellekte tutulur"""
+        if self._tarayici is None:
+            from borsa_tarayici import Tarayici
+            self._tarayici = Tarayici(self.depo)
+        return self._tarayici
 
     def _upsert_symbol(self, symbol_code, info_dict):
-        if not self.db_conn or not info_dict:
-            return
+        """Sembolü depoya yazar; yazım gerçekten yapıldıysa True döner"""
+        if not self.depo.kullanilabilir() or not info_dict:
+            return False
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO symbols (symbol, name, sector, market_cap)
-                VALUES (%s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    name = VALUES(name),
-                    sector = VALUES(sector),
-                    market_cap = VALUES(market_cap)
-                """,
-                (
-                    symbol_code,
-                    info_dict.get("longName"),
-                    info_dict.get("sector"),
-                    info_dict.get("marketCap")
-                )
-            )
-            self.db_conn.commit()
-            cursor.close()
+            with metrikler.zamanla("db.sembol_kaydet", symbol_code):
+                self.depo.sembol_kaydet(symbol_code, info_dict)
+            return True
         except Exception as e:
+            metrikler.hata("db.sembol_kaydet", symbol_code, e)
             print(f"Sembol kaydetme hatası ({symbol_code}): {e}")
+        return False
 
     def _save_price_history(self, symbol_code, df):
-        if not self.db_conn or df is None or df.empty:
-            return
+        if not self.depo.kullanilabilir() or df is None or df.empty:
+            return 0
         try:
-            records = []
-            safe_index = df.index.tz_localize(None) if getattr(df.index, 'tz', None) else df.index
-            for ts, row in df.iterrows():
-                ts_naive = ts.tz_localize(None) if getattr(ts, 'tzinfo', None) else ts
-                records.append(
-                    (
-                        symbol_code,
-                        ts_naive.to_pydatetime() if hasattr(ts_naive, 'to_pydatetime') else ts_naive,
-                        float(row.get('Open', None)) if 'Open' in df.columns else None,
-                        float(row.get('High', None)) if 'High' in df.columns else None,
-                        float(row.get('Low', None)) if 'Low' in df.columns else None,
-                        float(row.get('Close', None)) if 'Close' in df.columns else None,
-                        float(row.get('Volume', None)) if 'Volume' in df.columns else None,
-                    )
-                )
-            cursor = self.db_conn.cursor()
-            cursor.executemany(
-                """
-                INSERT INTO prices (symbol, ts, open_price, high_price, low_price, close_price, volume)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """,
-                records
-            )
-            self.db_conn.commit()
-            cursor.close()
+            with metrikler.zamanla("db.fiyat_kaydet", symbol_code):
+                yazilan = self.depo.fiyat_kaydet(symbol_code, df)
+            metrikler.say("db.fiyat_satiri", symbol_code, yazilan)
+            return yazilan
         except Exception as e:
+            metrikler.hata("db.fiyat_kaydet", symbol_code, e)
             print(f"Fiyat geçmişi kaydetme hatası ({symbol_code}): {e}")
+        return 0
 
-    def _save_live_tick(self, symbol_code, price, change_percent):
-        if not self.db_conn:
-            return
+    def _update_features(self, symbol_code):
+        # Aynı tarihli bar yeniden yazılmış olabilir (gün içi senkron), zaman damgasına bakılmaz
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO live_ticks (symbol, ts, price, change_percent)
-                VALUES (%s, %s, %s, %s)
-                """,
-                (symbol_code, datetime.now(), float(price) if price is not None else None, float(change_percent) if change_percent is not None else None)
-            )
-            self.db_conn.commit()
-            cursor.close()
+            with metrikler.zamanla("tarayici.guncelle", symbol_code):
+                self.tarayici.guncelle([symbol_code], zorla=True)
         except Exception as e:
-            print(f"Canlı tick kaydetme hatası ({symbol_code}): {e}")
+            metrikler.hata("tarayici.guncelle", symbol_code, e)
+            print(f"Tarama özellikleri güncellenemedi ({symbol_code}): {e}")
+
+    def _save_live_tick(self, symbol_code, price, change_percent, volume=None):
+        if not self.depo.kullanilabilir() and self.tick_yazici.politika != "spill":
+            return
+        # Yazım arka plandaki tick yazıcısına bırakılır, takip döngüsü beklemez
+        self.tick_yazici.ekle(symbol_code, price, change_percent, volume=volume)
+
+    def _save_live_ticks(self, records):
+        # Tick yazıcısının arka plan iş parçacığından çağrılır. Hata yukarı iletilir ve
+        # yazıcıda (tick_yazici.parti / tick_yazici.geri_yukleme) bir kez sayılır; burada yalnızca süre ölçülür
+        baslangic = time.perf_counter()
+        try:
+            self.depo.tickleri_kaydet(records)
+        finally:
+            if metrikler.acik:
+                metrikler.sure_ekle("db.tick_yazma", None, time.perf_counter() - baslangic)
+        metrikler.say("db.tick_satiri", miktar=len(records))
 
     def _save_portfolio_snapshot(self, items):
-        if not self.db_conn or not items:
+        if not self.depo.kullanilabilir() or not items:
             return
         try:
-            total_value = sum(item[4] for item in items)  # value alanı
-            cursor = self.db_conn.cursor()
-            cursor.execute(
-                "INSERT INTO portfolio_snapshots (created_at, total_value) VALUES (%s, %s)",
-                (datetime.now(), total_value)
-            )
-            snapshot_id = cursor.lastrowid
-            line_records = []
-            for symbol_code, lot, price, value in [(i[0], i[1], i[2], i[4]) for i in items]:
-                line_records.append((snapshot_id, symbol_code, lot, price, value))
-            cursor.executemany(
-                """
-                INSERT INTO portfolio_lines (snapshot_id, symbol, lot, price, value)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                line_records
-            )
-            self.db_conn.commit()
-            cursor.close()
+            with metrikler.zamanla("db.portfoy_kaydet"):
+                self.depo.portfoy_kaydet(items)
         except Exception as e:
+            metrikler.hata("db.portfoy_kaydet", hata=e)
             print(f"Portföy snapshot kaydetme hatası: {e}")
 
-    def hisse_verisi_cek(self, hisse_kodu, period):
-      ticker = yf.Ticker(hisse_kodu)
-      data = ticker.history(period=period)
-      return data
-
-    def hisse_bilgileri(self, hisse_kodu):
-      ticker = yf.Ticker(hisse_kodu)
-      info = ticker.info
-      # Veritabanına sembol bilgilerini yaz
+    def _save_alert(self, alarm):
+        if not self.depo.kullanilabilir():
+            return
+        try:
+            with metrikler.zamanla("db.alarm_kaydet", alarm['sembol']):
+                self.depo.alarmlari_kaydet([(
+                    alarm['kural'], alarm['metin'], alarm['sembol'], alarm['zaman'],
+                    alarm['alan'], alarm['deger'], alarm['esik'],
+                )])
+        except Exception as e:
+            metrikler.hata("db.alarm_kaydet", alarm['sembol'], e)
+            print(f"Alarm kaydetme hatası ({alarm['sembol']}): {e}")
+
+    def kapat(self):
+        """Bekleyen tickleri yazıp bağlantıları kapatır, önbelleği diske yazar"""
+        self.tick_yazici.kapat()
+        self.toplu_cekici.kapat()
+        self.canli_cekici.kapat()
+        if self._depo is not None:
+            self._depo.kapat()
+        try:
+            self.onbellek.kaydet(self.onbellek_dosyasi)
+        except OSError as e:
+            print(f"Önbellek dosyası yazılamadı: {e}")
+
+    def hisse_verisi_cek(self, hisse_kodu, period=None, start=None):
+      with metrikler.zamanla("saglayici.history", hisse_kodu):
+          return self.saglayici.history(hisse_kodu, period=period, start=start)
+
+    def _bas_eksik(self, hisse_kodu, ilk, baslangic):
+      # İstenen aralığın başı depoda yoksa (ör. 1y kayıtlıyken 5y istendi) tam çekim gerekir;
+      # o başlangıçla çekilmiş ve daha eski bar gelmemişse (yeni listelenen hisse) yeniden istenmez
+      if baslangic is None or ilk <= baslangic + timedelta(days=7):
+          return False
+      denenen = self._gecmis_basi.get(hisse_kodu)
+      return denenen is None or baslangic < denenen
+
+    def _senkron_gerekli(self, hisse_kodu, ilk, son, baslangic, simdi):
+      if son is None:
+          return True
+      if self._bas_eksik(hisse_kodu, ilk, baslangic):
+          return True
+      beklenen = beklenen_son_gun(simdi)
+      if son.date() < beklenen:
+          return True
+      if beklenen == simdi.date():
+          # Seans içinde günün barı değişir, belirli aralıklarla tazele
+          son_senkron = self._son_senkron.get(hisse_kodu)
+          return son_senkron is None or time.monotonic() - son_senkron > GUN_ICI_SENKRON_ARALIGI
+      return False
+
+    @staticmethod
+    def _depoya_ekle(depodaki, yeni, baslangic):
+      """Depoya yazılamayan yeni barları depodan okunanların üstüne bindirir"""
+      import pandas as pd
+      from borsa_donusum import FIYAT_SUTUNLARI
+      yeni = yeni[[ad for ad in FIYAT_SUTUNLARI if ad in yeni.columns]]
+      if getattr(yeni.index, 'tz', None) is not None:
+          # Depo yerel saati saat dilimsiz saklar (fiyat_kayitlari ile aynı dönüşüm)
+          yeni = yeni.tz_localize(None)
+      if depodaki is None or depodaki.empty:
+          return yeni
+      birlesik = pd.concat([depodaki[~depodaki.index.isin(yeni.index)], yeni]).sort_index()
+      birlesik.index.name = depodaki.index.name
+      if baslangic is not None:
+          birlesik = birlesik[birlesik.index >= baslangic]
+      return birlesik
+
+    def hisse_verisi_senkron(self, hisse_kodu, period):
+      """Önce yerel depodan okur, yalnızca eksik aralığı ağdan çekip ekler"""
+      if not self.depo.kullanilabilir():
+          return self.hisse_verisi_cek(hisse_kodu, period)
+      simdi = datetime.now()
+      baslangic = period_baslangici(period, simdi)
+      try:
+          ilk, son = self.depo.fiyat_araligi(hisse_kodu)
+      except Exception as e:
+          metrikler.hata("depo.fiyat_araligi", hisse_kodu, e)
+          print(f"Yerel fiyat deposu okunamadı ({hisse_kodu}): {e}")
+          return self.hisse_verisi_cek(hisse_kodu, period)
+      yeni = None  # çekilip depoya yazılamamış barlar
+      if self._senkron_gerekli(hisse_kodu, ilk, son, baslangic, simdi):
+          tam = son is None or self._bas_eksik(hisse_kodu, ilk, baslangic)
+          if tam:
+              cekilen = self.hisse_verisi_cek(hisse_kodu, period)
+          else:
+              # Son günü de yeniden çek, yarım kalmış bar güncellensin
+              cekilen = self.hisse_verisi_cek(hisse_kodu, start=son.date())
+          bos = cekilen is None or cekilen.empty
+          yazilan = 0 if bos else self._save_price_history(hisse_kodu, cekilen)
+          if yazilan:
+              self._update_features(hisse_kodu)
+          if yazilan or bos:
+              if tam and baslangic is not None:
+                  self._gecmis_basi[hisse_kodu] = baslangic
+              self._son_senkron[hisse_kodu] = time.monotonic()
+          elif tam:
+              # Yazılamadı; çekilen veri atılmaz, sonraki çağrı yeniden dener
+              return cekilen
+          else:
+              yeni = cekilen
       try:
-          self._upsert_symbol(hisse_kodu, info)
-      except Exception:
-          pass
+          with metrikler.zamanla("depo.fiyat_oku", hisse_kodu):
+              depodaki = self.depo.fiyat_oku(hisse_kodu, start=baslangic)
+      except Exception as e:
+          metrikler.hata("depo.fiyat_oku", hisse_kodu, e)
+          print(f"Yerel fiyat deposu okunamadı ({hisse_kodu}): {e}")
+          return self.hisse_verisi_cek(hisse_kodu, period)
+      return depodaki if yeni is None else self._depoya_ekle(depodaki, yeni, baslangic)
+
+    def _ticker_info(self, hisse_kodu):
+      with metrikler.zamanla("saglayici.info", hisse_kodu):
+          return self.saglayici.info(hisse_kodu)
+
+    def _bilgi_sozlugu(self, hisse_kodu, info):
+      # Veritabanına sembol bilgilerini oturumda bir kez yaz; yazılamadıysa sonraki çağrı yeniden dener
+      if hisse_kodu not in self._kayitli_semboller and self._upsert_symbol(hisse_kodu, info):
+          self._kayitli_semboller.add(hisse_kodu)
       return {
                 'isim': info.get("longName"),
                 'sektor': info.get("sector"),
@@ -221,57 +280,94 @@ class BorsaUygulamasi:
                 'değişim': info.get("regularMarketChangePercent")
             }
 
+    def hisse_bilgileri(self, hisse_kodu):
+      info = self.onbellek.bilgi(hisse_kodu)
+      return self._bilgi_sozlugu(hisse_kodu, info)
+
+    def hisse_bilgileri_toplu(self, hisse_kodlari):
+      """Birden fazla hissenin bilgisini paralel çeker, hatalı semboller için None döner"""
+      infolar, hatalar = self.toplu_cekici.getir(hisse_kodlari)
+      bilgiler = {}
+      for hisse in hisse_kodlari:
+          if hisse in infolar:
+              bilgiler[hisse] = self._bilgi_sozlugu(hisse, infolar[hisse])
+          else:
+              metrikler.say("bilgi.basarisiz", hisse)
+              print(f"{hisse} bilgi alma hatası: {hatalar.get(hisse)}")
+              bilgiler[hisse] = None
+      return bilgiler
+
     def bist100_endeksi(self):
-       bist100 = yf.Ticker("^XU100")
-       data = bist100.history("1y")
-       return data
+       return self.hisse_verisi_senkron("^XU100", "1y")
 
     def hisse_listesi_goster(self):
         print("📊 BIST100'den Popüler Hisseler:")
         print("-" * 50)
 
+        bilgiler = self.hisse_bilgileri_toplu(self.bist100_hisseleri)
         for i, hisse in enumerate(self.bist100_hisseleri, 1):
-            bilgi = self.hisse_bilgileri(hisse)
+            bilgi = bilgiler[hisse]
             if bilgi:
                 print(f"{i:2d}. {bilgi['isim']} ({hisse})")
                 print(f"    Fiyat: {bilgi['fiyat']:.2f} TL")
                 print(f"    Değişim: {bilgi['değişim']:.2f}%")
                 print()
 
-    def hisse_grafik_ciz(self, hisse_kodu, period):
-        """Hisse fiyat grafiği çizer"""
-        data = self.hisse_verisi_cek(hisse_kodu, period)
-        # Fiyat geçmişini veritabanına yaz
-        try:
-            self._save_price_history(hisse_kodu, data)
-        except Exception:
-            pass
+    def _grafik_olustur(self, hisse_kodu, data, indikatorler):
+        import matplotlib.pyplot as plt
+        from borsa_grafik import BOYUT, grafik_ciz
+        fig=plt.figure(figsize=BOYUT)
+        # Göstergeler oturum önbelleğinden gelir, yeni bar yoksa yeniden hesaplanmaz
+        hesapla = lambda ad, **p: self.indikator_onbellegi.hesapla(hisse_kodu, data, ad, **p)
+        return grafik_ciz(fig, hisse_kodu, data, indikatorler, hesapla=hesapla)
+
+    def hisse_grafik_ciz(self, hisse_kodu, period, indikatorler=None):
+        """Hisse fiyat grafiği çizer, istenirse göstergeleri üzerine ekler"""
+        # Yerel depo sıcaksa ağa çıkılmaz, yalnızca eksik barlar çekilip yazılır
+        data = self.hisse_verisi_senkron(hisse_kodu, period)
         if data is not None and not data.empty:
-            fig=plt.figure(figsize=(12, 6))
-            axes=fig.add_axes([0.1,0.1,0.8,0.8])
-            axes.plot(data.index, data['Close'], linewidth=2)  #index tarihi verir x için
-            axes.set_title(f"{hisse_kodu} Hisse Fiyat Grafiği")
-            axes.set_xlabel("Tarih")
-            axes.set_ylabel("Fiyat")
-            axes.grid(True, alpha=0.3)  #mouse harejketlerine yarar
-            axes.tick_params(axis='x', labelrotation=45) #x dekileri 45 derece döndürür okunulabilirlik için
+            import matplotlib.pyplot as plt
+            # Pencerede beklenen süre çizim süresine sayılmaz
+            with metrikler.zamanla("grafik.cizim", hisse_kodu):
+                fig = self._grafik_olustur(hisse_kodu, data, indikatorler)
             plt.show()
+            plt.close(fig)  # döngüde çağrıldığında figürler birikmesin
         else:
             print(f"{hisse_kodu} için veri bulunamadı.")
 
-    def portfoy_analizi(self, hisseler_lotlar):
+    def grafikleri_kaydet(self, hisse_kodlari, dizin, period="1y", indikatorler=None, bicim="png", isci=None):
+        """Pencere açmadan her hisse için grafik dosyası üretir; verisi değişmeyen grafikler yeniden çizilmez"""
+        from borsa_grafik import toplu_ciz
+        cekici = TopluVeriCekici(lambda s: self.hisse_verisi_senkron(s, period))
+        try:
+            veriler, hatalar = cekici.getir(hisse_kodlari)
+        finally:
+            cekici.kapat()
+        with metrikler.zamanla("grafik.toplu"):
+            cizilen, atlanan, cizim_hatalari = toplu_ciz(veriler, dizin, period, indikatorler, bicim, isci)
+        metrikler.say("grafik.cizilen", miktar=len(cizilen))
+        metrikler.say("grafik.atlanan", miktar=len(atlanan))
+        hatalar.update(cizim_hatalari)
+        for hisse, hata in hatalar.items():
+            metrikler.hata("grafik.toplu", hisse, hata)
+            print(f"{hisse} grafiği üretilemedi: {hata}")
+        print(f"{len(cizilen)} grafik çizildi, {len(atlanan)} grafik güncel ({dizin})")
+        return cizilen, atlanan, hatalar
+
+    def portfoy_analizi(self, hisseler_lotlar, period="1y"):
         print("📈 Portföy Analizi")
         print("-" * 30)
 
         toplam_deger = 0
         detay_kayitlari = []  # (symbol, lot, price, value)
+        bilgiler = self.hisse_bilgileri_toplu([hisse for hisse, _ in hisseler_lotlar])
         for hisse, lot in hisseler_lotlar:
-            bilgi = self.hisse_bilgileri(hisse)
+            bilgi = bilgiler[hisse]
             if bilgi:
                 deger = bilgi["fiyat"] * lot
                 print(f"{hisse}: {bilgi['fiyat']:.2f} TL × {lot} lot = {deger:.2f} TL")
                 toplam_deger += deger
-                detay_kayitlari.append((hisse, lot, bilgi["fiyat"], deger, deger))
+                detay_kayitlari.append((hisse, lot, bilgi["fiyat"], deger))
             else:
                 print(f"{hisse} için bilgi bulunamadı.")
 
@@ -279,40 +375,441 @@ class BorsaUygulamasi:
         # Snapshot kaydet
         try:
             self._save_portfolio_snapshot(detay_kayitlari)
-        except Exception:
-            pass
-
-    def canli_takip(self, hisse_kodu, sure_dakika=5):
-        print(f"🔴 {hisse_kodu} Canlı Takip (Çıkmak için Ctrl+C)")
+        except Exception as e:
+            metrikler.hata("db.portfoy_kaydet", hata=e)
+        if hisseler_lotlar:
+            self.portfoy_gecmisi_goster(hisseler_lotlar, period)
+
+    def portfoy_gecmisi_goster(self, hisseler_lotlar, period="1y"):
+        """Saklanan fiyat geçmişinden portföyün değer serisini ve risk metriklerini yazdırır"""
+        semboller = list(dict.fromkeys([hisse for hisse, _ in hisseler_lotlar] + ["^XU100"]))
+        # Eksik geçmişler paralel senkronlanır, ardından panel yerel veriden kurulur
+        cekici = TopluVeriCekici(lambda s: self.hisse_verisi_senkron(s, period))
+        try:
+            gecmisler, hatalar = cekici.getir(semboller)
+        finally:
+            cekici.kapat()
+        for hisse, hata in hatalar.items():
+            print(f"{hisse} fiyat geçmişi alınamadı: {hata}")
+        from borsa_portfoy import PortfoyMotoru
+        rapor = PortfoyMotoru(gecmisler.get).analiz(hisseler_lotlar)
+        if not rapor or not rapor['metrikler']:
+            print("Geçmiş analiz için yeterli veri yok.")
+            return
+        m = rapor['metrikler']
+        print(f"\n📉 Son {period} ({m['gun']} işlem günü)")
+        print(f"Toplam Getiri: {m['toplam_getiri'] * 100:+.2f}%")
+        print(f"Yıllık Volatilite: {m['yillik_volatilite'] * 100:.2f}%")
+        print(f"Sharpe: {m['sharpe']:.2f}")
+        print(f"Maksimum Düşüş: {m['maksimum_dusus'] * 100:.2f}%")
+        if 'beta' in m:
+            print(f"BIST100 Betası: {m['beta']:.2f} (korelasyon {m['endeks_korelasyonu']:.2f})")
+        if 1 < len(rapor['korelasyon']) <= 10:
+            print("\nKorelasyon Matrisi:")
+            print(rapor['korelasyon'].round(2).to_string())
+
+    def geri_test(self, semboller, strateji, araliklar=None, period="5y", maliyet=None, isci=None,
+                  sirala="sharpe", ilk=10):
+        """Stratejiyi saklanan fiyat geçmişi üzerinde sınar; ızgara verilirse önce tarar, en iyisini raporlar"""
+        from borsa_backtest import VARSAYILAN_MALIYET, GeriTestMotoru, parametre_izgarasi, strateji_al
+        strateji, (_, varsayilan, _) = strateji_al(strateji)
+        izgara = parametre_izgarasi(strateji, araliklar or {})
+        if not izgara:
+            print("Geçerli parametre birleşimi yok.")
+            return None
+        semboller = list(dict.fromkeys(semboller))
+        # Geçmişler portföy raporundaki gibi paralel senkronlanır; sonraki çalıştırmalar yerel depodan okur
+        cekici = TopluVeriCekici(lambda s: self.hisse_verisi_senkron(s, period))
+        try:
+            gecmisler, hatalar = cekici.getir(semboller + ["^XU100"])
+        finally:
+            cekici.kapat()
+        for hisse, hata in hatalar.items():
+            print(f"{hisse} fiyat geçmişi alınamadı: {hata}")
+        motor = GeriTestMotoru(gecmisler.get, semboller,
+                               maliyet=VARSAYILAN_MALIYET if maliyet is None else maliyet)
+        if motor.panel.empty:
+            print("Geri test için fiyat geçmişi yok.")
+            return None
+        print(f"🧪 {strateji} geri testi: {motor.panel.shape[1]} hisse, {len(motor.panel)} işlem günü, "
+              f"{len(izgara)} parametre seti")
+        parametreler = izgara[0]
+        if len(izgara) > 1:
+            baslangic = time.perf_counter()
+            tablo = motor.tarama(strateji, izgara, isci=isci, sirala=sirala)
+            print(f"Tarama {time.perf_counter() - baslangic:.2f} s")
+            sutunlar = list(varsayilan) + ["toplam_getiri", "sharpe", "maksimum_dusus", "islem", "maruziyet"]
+            print(tablo[sutunlar].head(ilk).to_string(float_format=lambda x: f"{x:.3f}"))
+            parametreler = {ad: tablo[ad].iloc[0].item() for ad in varsayilan}
+        rapor = motor.calistir(strateji, **parametreler)
+        m = rapor['metrikler']
+        print(f"\n📉 {strateji} {', '.join(f'{k}={v}' for k, v in parametreler.items())} ({m['gun']} işlem günü)")
+        print(f"Toplam Getiri: {m['toplam_getiri'] * 100:+.2f}%")
+        print(f"Yıllık Getiri: {m['yillik_getiri'] * 100:+.2f}%")
+        print(f"Yıllık Volatilite: {m['yillik_volatilite'] * 100:.2f}%")
+        print(f"Sharpe: {m['sharpe']:.2f}")
+        print(f"Maksimum Düşüş: {m['maksimum_dusus'] * 100:.2f}%")
+        if 'beta' in m:
+            print(f"BIST100 Betası: {m['beta']:.2f} (korelasyon {m['endeks_korelasyonu']:.2f})")
+        print(f"İşlem: {m['islem']}, kazanma oranı {m.get('kazanma_orani', 0.0) * 100:.1f}%, "
+              f"piyasada kalma {m['maruziyet'] * 100:.1f}%")
+        return rapor
+
+    def _gostergeleri_isit(self, alarmlar, semboller, period="1y"):
+        """Gösterge kuralları soğuk başlamasın diye göstergeler saklanan günlük kapanışlarla ısıtılır"""
+        cekici = TopluVeriCekici(lambda s: self.hisse_verisi_senkron(s, period))
+        try:
+            gecmisler, hatalar = cekici.getir(semboller)
+        finally:
+            cekici.kapat()
+        for sembol, df in gecmisler.items():
+            if df is not None and not df.empty:
+                alarmlar.isit(sembol, df["Close"].to_numpy(), son_bar=df.index[-1])
+        for sembol, hata in hatalar.items():
+            metrikler.hata("alarm.isit", sembol, hata)
+            print(f"{sembol} göstergeleri ısıtılamadı: {hata}")
+
+    def canli_takip(self, hisse_kodlari, sure_dakika=5, aralik=5.0, klavye=True, alarm_kurallari=None):
+        """Bir ya da daha fazla hisseyi motor üzerinden canlı takip eder; `klavye=False` stdin dinlemez.
+
+        `alarm_kurallari` verilirse (Kural ya da metin listesi) her tick kurallara karşı değerlendirilir.
+        """
+        if isinstance(hisse_kodlari, str):
+            hisse_kodlari = [hisse_kodlari]
+        tekli = len(hisse_kodlari) == 1
+        baslik = ", ".join(h if isinstance(h, str) else h[0] for h in hisse_kodlari[:5])
+        if len(hisse_kodlari) > 5:
+            baslik += f" ... ({len(hisse_kodlari)} hisse)"
+        print(f"🔴 {baslik} Canlı Takip")
+        print("Çıkmak için 'q' yazıp Enter'a basın (ya da Ctrl+C)" if klavye else "Çıkmak için Ctrl+C")
         print("-" * 40)
 
+        motor = CanliTakipMotoru(self.canli_cekici.getir, varsayilan_aralik=aralik)
+        motor.ekle_liste(hisse_kodlari)
+
+        tampon = self.tick_tamponu
+
+        def yazdir(tick):
+            if tick['fiyat'] is None:
+                return
+            degisim = tick['değişim'] or 0.0
+            satir = f"[{tick['zaman'].strftime('%H:%M:%S')}] {tick['sembol']}: {tick['fiyat']:.2f} TL ({degisim:+.2f}%)"
+            vwap = tampon.vwap(tick['sembol'])
+            if vwap is not None:
+                satir += f" VWAP {vwap:.2f}"
+            dakika = tampon.degisim(tick['sembol'], 60)
+            if dakika is not None:
+                satir += f" 1dk {dakika:+.2f}%"
+            print("\r" + satir if tekli else satir, end="" if tekli else "\n", flush=True)  #tek hissede aynı satırda
+
+        def kaydet(tick):
+            self._save_live_tick(tick['sembol'], tick['fiyat'], tick['değişim'], tick.get('hacim'))
+
+        # Tampon yazıcıdan önce güncellenir, satırdaki toplamlar bu tick'i de içerir
+        motor.abone_ol(tampon)
+        motor.abone_ol(yazdir)
+        motor.abone_ol(kaydet)
+        alarmlar = None
+        if alarm_kurallari:
+            from borsa_alarm import AlarmMotoru
+            alarmlar = AlarmMotoru(alarm_kurallari, tampon=tampon)
+
+            def alarm_yazdir(alarm):
+                print(f"\n🔔 [{alarm['zaman'].strftime('%H:%M:%S')}] {alarm['sembol']}: {alarm['metin']} "
+                      f"({alarm['alan']} = {alarm['deger']:.2f})", flush=True)
+
+            alarmlar.abone_ol(alarm_yazdir)
+            alarmlar.abone_ol(self._save_alert)
+            if alarmlar.gostergeler is not None:
+                self._gostergeleri_isit(alarmlar, [h if isinstance(h, str) else h[0] for h in hisse_kodlari])
+            motor.abone_ol(alarmlar)
+        dinleyici = KlavyeDinleyici(motor.durdur_olayi).baslat() if klavye else None
         try:
-            for i in range(sure_dakika * 12):  # 5 saniyede bir güncelleme
-                ticker = yf.Ticker(hisse_kodu)
-                fiyat = ticker.info["regularMarketPrice"]
-                değişim = ticker.info["regularMarketChangePercent"]
-
-                print(f"\r[{datetime.now().strftime('%H:%M:%S')}] {hisse_kodu}: {fiyat:.2f} TL ({değişim:+.2f}%)",end="") #ende aynı satırda
-                print("Çıkmak için 'q' tuşuna basın, devam etmek için Enter'a basın.")
-                cevap = input()
-                if cevap.lower() == 'q':
-                    print("Takip sonlandırıldı.")
-                    break
-
-                # Tick verisini kaydet
-                try:
-                    self._save_live_tick(hisse_kodu, fiyat, değişim)
-                except Exception:
-                    pass
-                time.sleep(5)
-
-        except :
-            print("\n\nTakip sonlandırıldı.")
-
+            motor.calistir(sure=sure_dakika * 60)
+        except KeyboardInterrupt:
+            motor.durdur_olayi.set()
+        if dinleyici:
+            dinleyici.bekle()
+
+        ist = motor.istatistik()
+        metrikler.say("canli.tick", miktar=ist['tick'])
+        metrikler.say("canli.hata", miktar=ist['hata'])
+        print("\n\nTakip sonlandırıldı.")
+        print(f"{ist['tick']} tick, {ist['tick_saniye']:.2f} tick/sn, {ist['hata']} hata, "
+              f"gecikme p50 {ist['gecikme_p50'] * 1000:.0f} ms / p99 {ist['gecikme_p99'] * 1000:.0f} ms")
+        if alarmlar is not None:
+            a = alarmlar.istatistik()
+            metrikler.say("alarm.tetik", miktar=a['tetik'])
+            print(f"{a['kural']} kural, {a['tetik']} alarm ({a['bastirilan']} tekrar bastırıldı)")
+
+
+def _portfoy_ayristir(giris):
+    """"THYAO.IS:10,GARAN.IS:5" biçimini [(hisse, lot), ...] listesine çevirir, hatalı parçaları atlar"""
+    hisseler_lotlar = []
+    for parca in giris.split(','):
+        try:
+            hisse, lot = parca.split(':')
+            hisseler_lotlar.append((hisse.strip(), int(lot.strip())))
+        except ValueError:
+            print(f"Hatalı giriş: '{parca}'. Bu hisse atlanacak.")
+    return hisseler_lotlar
 
-def main():
-    uygulama = BorsaUygulamasi()
 
+def _komut_quote(uygulama, args):
+    sonuc = {}
+    for hisse in args.semboller:
+        try:
+            info = uygulama.onbellek.fiyat_bilgisi(hisse, taze=args.taze)
+        except Exception as e:
+            metrikler.hata("bilgi", hisse, e)
+            print(f"{hisse} bilgi alma hatası: {e}", file=sys.stderr)
+            continue
+        sonuc[hisse] = {
+            'fiyat': info.get("regularMarketPrice"),
+            'değişim': info.get("regularMarketChangePercent"),
+            'hacim': info.get("regularMarketVolume"),
+        }
+    if args.json:
+        print(json.dumps(sonuc, ensure_ascii=False))
+    else:
+        for hisse, bilgi in sonuc.items():
+            if bilgi['fiyat'] is None:
+                print(f"{hisse}: fiyat yok")
+            else:
+                print(f"{hisse}: {bilgi['fiyat']:.2f} TL ({bilgi['değişim'] or 0.0:+.2f}%)")
+    return 0 if len(sonuc) == len(args.semboller) else 1
+
+
+def _komut_history(uygulama, args):
+    data = uygulama.hisse_verisi_senkron(args.sembol, args.period)
+    if data is None or data.empty:
+        print(f"{args.sembol} için veri bulunamadı.", file=sys.stderr)
+        return 1
+    if args.csv:
+        data.to_csv(sys.stdout)
+    else:
+        print(data.tail(args.son).to_string())
+    return 0
+
+
+def _komut_portfolio(uygulama, args):
+    hisseler_lotlar = _portfoy_ayristir(args.pozisyonlar)
+    if not hisseler_lotlar:
+        return 1
+    uygulama.portfoy_analizi(hisseler_lotlar, period=args.period)
+    return 0
+
+
+def _komut_chart(uygulama, args):
+    hisseler = list(args.semboller)
+    if args.liste:
+        hisseler += [sembol for sembol, _ in izleme_listesi_oku(args.liste)]
+    if not hisseler:
+        print("Çizilecek hisse yok.", file=sys.stderr)
+        return 1
+    from borsa_indikator import indikator_ayristir
+    try:
+        indikatorler = indikator_ayristir(args.gosterge)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    _, _, hatalar = uygulama.grafikleri_kaydet(hisseler, args.dizin, args.period, indikatorler, args.bicim, args.isci)
+    return 1 if hatalar else 0
+
+
+def _komut_screen(uygulama, args):
+    if not uygulama.depo.kullanilabilir():
+        # Özellikler depoda tutulur; ince istemci (--servis) ve ulaşılamayan veritabanı taranamaz
+        print("Tarama yerel depo gerektirir; --servis ile ya da veritabanına ulaşılamadığında kullanılamaz.",
+              file=sys.stderr)
+        return 1
+    semboller = list(args.semboller)
+    if args.liste:
+        semboller += [sembol for sembol, _ in izleme_listesi_oku(args.liste)]
+    tarayici = uygulama.tarayici
+    if args.guncelle:
+        evren = semboller or uygulama.bist100_hisseleri
+        # Meta verisi olmayan semboller için bilgi çekilir; _bilgi_sozlugu symbols tablosuna yazar
+        eksik = uygulama.depo.semboller_oku(evren).index
+        eksik = [s for s in evren if s not in eksik]
+        if eksik:
+            uygulama.hisse_bilgileri_toplu(eksik)
+        guncellenen = tarayici.guncelle(evren)
+        print(f"{guncellenen} sembolün özellikleri güncellendi.", file=sys.stderr)
+    try:
+        panel = tarayici.panel(taze=True)
+        baslangic = time.perf_counter()
+        sonuc = tarayici.tara(args.suzgec, args.sirala, args.artan, args.limit, semboller=semboller or None)
+    except Exception as e:
+        print(f"Tarama hatası: {e}", file=sys.stderr)
+        return 1
+    sure = time.perf_counter() - baslangic
+    sutunlar = [s.strip() for s in args.sutun.split(",") if s.strip() in sonuc.columns]
+    if args.json:
+        print(sonuc[sutunlar].to_json(orient="index", date_format="iso", force_ascii=False))
+    elif args.csv:
+        sonuc[sutunlar].to_csv(sys.stdout)
+    elif sonuc.empty:
+        print("Eşleşen hisse yok.")
+    else:
+        print(sonuc[sutunlar].to_string(float_format=lambda x: f"{x:,.2f}"))
+    print(f"{len(panel)} sembol tarandı, {len(sonuc)} sonuç, {sure * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+def _komut_backtest(uygulama, args):
+    hisseler = list(args.semboller)
+    if args.liste:
+        hisseler += [sembol for sembol, _ in izleme_listesi_oku(args.liste)]
+    from borsa_backtest import parametre_araliklari
+    try:
+        rapor = uygulama.geri_test(hisseler or uygulama.bist100_hisseleri, args.strateji,
+                                   parametre_araliklari(args.param), period=args.period, maliyet=args.maliyet,
+                                   isci=args.isci, sirala=args.sirala, ilk=args.ilk)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if rapor is None:
+        return 1
+    if args.islemler:
+        rapor['islemler'].to_csv(args.islemler, index=False)
+        print(f"{len(rapor['islemler'])} işlem {args.islemler} dosyasına yazıldı")
+    if args.sermaye:
+        rapor['sembol_sermayesi'].assign(portfoy=rapor['sermaye']).to_csv(args.sermaye)
+        print(f"Sermaye eğrileri {args.sermaye} dosyasına yazıldı")
+    return 0
+
+
+def _komut_track(uygulama, args):
+    hisseler = list(args.semboller)
+    if args.liste:
+        hisseler += izleme_listesi_oku(args.liste)
+    if not hisseler:
+        print("Takip edilecek hisse yok.", file=sys.stderr)
+        return 1
+    kurallar = list(args.kural)
+    if args.alarm:
+        from borsa_alarm import kurallari_oku
+        kurallar += kurallari_oku(args.alarm)
+    # Cron ya da servis altında stdin yoktur; klavye dinleyicisi yalnızca terminalde açılır
+    uygulama.canli_takip(hisseler, args.sure, aralik=args.aralik, klavye=sys.stdin.isatty(),
+                         alarm_kurallari=kurallar)
+    return 0
+
+
+def _arguman_ayristirici():
+    ayrac = argparse.ArgumentParser(description="Borsa takip uygulaması (komut verilmezse etkileşimli menü açılır)")
+    ayrac.add_argument("--stats", action="store_true", help="İşlem sürelerini ve hataları ölç, çıkışta özet yazdır")
+    ayrac.add_argument("--metrik-cikti", metavar="DOSYA",
+                       help="Çıkışta metrikleri yaz (.prom: Prometheus metni, diğerleri: JSON satırları)")
+    ayrac.add_argument("--servis", metavar="ADRES", default=os.getenv("BORSA_SERVIS"),
+                       help="Yerel fiyat servisine (python -m borsa_servis) ince istemci olarak bağlan, "
+                            "örn. http://127.0.0.1:8765 (varsayılan: BORSA_SERVIS)")
+    ayrac.add_argument("--tick-tasma", metavar="DOSYA",
+                       help="spill politikasında taşan ticklerin yazılacağı dosya (varsayılan: TICK_TASMA)")
+    komutlar = ayrac.add_subparsers(dest="komut")
+
+    quote = komutlar.add_parser("quote", help="Anlık fiyat ve değişim (önbellekteyse ağa çıkmaz)")
+    quote.add_argument("semboller", nargs="+", metavar="SEMBOL")
+    quote.add_argument("--json", action="store_true", help="Sonucu JSON olarak yazdır")
+    quote.add_argument("--taze", action="store_true", help="Önbelleği atlayıp sağlayıcıdan çek")
+    quote.set_defaults(islem=_komut_quote)
+
+    history = komutlar.add_parser("history", help="Fiyat geçmişi (yerel depo + eksik aralık senkronu)")
+    history.add_argument("sembol", metavar="SEMBOL")
+    history.add_argument("--period", default="1y")
+    history.add_argument("--csv", action="store_true", help="Tüm geçmişi CSV olarak stdout'a yaz")
+    history.add_argument("--son", type=int, default=20, help="Tablo çıktısında gösterilecek bar sayısı")
+    history.set_defaults(islem=_komut_history)
+
+    portfolio = komutlar.add_parser("portfolio", help="Portföy değeri ve risk metrikleri")
+    portfolio.add_argument("pozisyonlar", metavar="HISSE:LOT,...")
+    portfolio.add_argument("--period", default="1y")
+    portfolio.set_defaults(islem=_komut_portfolio)
+
+    chart = komutlar.add_parser("chart", help="Grafikleri pencere açmadan dosyaya yaz (değişmeyenler atlanır)")
+    chart.add_argument("semboller", nargs="*", metavar="SEMBOL")
+    chart.add_argument("--liste", metavar="DOSYA", help="İzleme listesi dosyası")
+    chart.add_argument("--dizin", default="grafikler", help="Çıktı dizini")
+    chart.add_argument("--bicim", choices=("png", "svg"), default="png")
+    chart.add_argument("--period", default="1y")
+    chart.add_argument("--gosterge", default="", help="Örn: SMA20,EMA50,BB,RSI14")
+    chart.add_argument("--isci", type=int, help="Çizim süreci sayısı (varsayılan: CPU sayısı)")
+    chart.set_defaults(islem=_komut_chart)
+
+    screen = komutlar.add_parser("screen", help="Tüm sembol evreninde süzgeç ve sıralama (saklanan özelliklerden)")
+    screen.add_argument("suzgec", nargs="?", default="", metavar="SÜZGEÇ",
+                        help="Örn: \"sector == Banks and 20d return > 5%% and volume > 2x 20d avg\"")
+    screen.add_argument("semboller", nargs="*", metavar="SEMBOL", help="Yalnızca bu semboller taranır")
+    screen.add_argument("--liste", metavar="DOSYA", help="İzleme listesi dosyası")
+    screen.add_argument("--sirala", default="ret_20d", help="Sıralama ifadesi, örn. rel_volume ya da \"ret_5d - ret_20d\"")
+    screen.add_argument("--artan", action="store_true", help="Küçükten büyüğe sırala")
+    screen.add_argument("--limit", type=int, default=20)
+    screen.add_argument("--sutun", default="name,sector,close,ret_1d,ret_20d,rel_volume,rsi_14",
+                        help="Gösterilecek sütunlar")
+    screen.add_argument("--guncelle", action="store_true",
+                        help="Önce yeni barı gelen sembollerin özelliklerini yeniden hesapla")
+    cikti = screen.add_mutually_exclusive_group()
+    cikti.add_argument("--json", action="store_true")
+    cikti.add_argument("--csv", action="store_true")
+    screen.set_defaults(islem=_komut_screen)
+
+    backtest = komutlar.add_parser("backtest", help="Sinyal stratejisini fiyat geçmişi üzerinde sına (parametre taraması)")
+    backtest.add_argument("semboller", nargs="*", metavar="SEMBOL", help="Varsayılan: hisse listesi")
+    backtest.add_argument("--liste", metavar="DOSYA", help="İzleme listesi dosyası")
+    backtest.add_argument("--strateji", default="MA", type=str.upper, choices=("MA", "RSI"))
+    backtest.add_argument("--param", action="append", default=[], metavar="AD=DEĞERLER",
+                          help="Örn: hizli=5,10,20 ya da yavas=50:200:25 (tekrarlanabilir; birden çok değer tarama yapar)")
+    backtest.add_argument("--period", default="5y")
+    backtest.add_argument("--maliyet", type=float, help="İşlem başına maliyet oranı (varsayılan 0.001)")
+    backtest.add_argument("--isci", type=int, help="Tarama süreç sayısı (varsayılan: CPU sayısı)")
+    backtest.add_argument("--sirala", default="sharpe", help="Tarama sıralama metriği")
+    backtest.add_argument("--ilk", type=int, default=10, help="Gösterilecek tarama satırı")
+    backtest.add_argument("--islemler", metavar="CSV", help="En iyi parametrelerin işlem listesini yaz")
+    backtest.add_argument("--sermaye", metavar="CSV", help="Sembol ve portföy sermaye eğrilerini yaz")
+    backtest.set_defaults(islem=_komut_backtest)
+
+    track = komutlar.add_parser("track", help="Canlı takip")
+    track.add_argument("semboller", nargs="*", metavar="SEMBOL")
+    track.add_argument("--liste", metavar="DOSYA", help="İzleme listesi dosyası")
+    track.add_argument("--sure", type=float, default=5, help="Takip süresi (dakika)")
+    track.add_argument("--aralik", type=float, default=5.0, help="Varsayılan yoklama aralığı (saniye)")
+    track.add_argument("--alarm", metavar="DOSYA", help="Her satırda bir alarm kuralı bulunan dosya")
+    track.add_argument("--kural", action="append", default=[], metavar="KURAL",
+                       help="Alarm kuralı, örn. \"THYAO.IS crosses above 300\" (tekrarlanabilir)")
+    track.set_defaults(islem=_komut_track)
+    return ayrac
+
+
+def _metrikleri_raporla(args):
+    if args.stats:
+        print(metrikler.ozet())
+    if args.metrik_cikti:
+        metrikler.disari_aktar(args.metrik_cikti)
+
+
+def main(argv=None):
+    args = _arguman_ayristirici().parse_args(argv)
+    if args.stats or args.metrik_cikti:
+        metrikler.acik = True
+    if args.servis:
+        # Sağlayıcı, önbellek ve veritabanı yazımı serviste; bu süreç yalnızca sorar ve gösterir
+        from borsa_depolama import BosDepo
+        from borsa_saglayici import ServisSaglayici
+        uygulama = BorsaUygulamasi(saglayici=ServisSaglayici(args.servis), depo=BosDepo())
+    else:
+        uygulama = BorsaUygulamasi(tasma_dosyasi=args.tick_tasma)
+    try:
+        if args.komut:
+            return args.islem(uygulama, args)
+        menu(uygulama)
+        return 0
+    finally:
+        uygulama.kapat()
+        _metrikleri_raporla(args)
+
+
+def menu(uygulama):
     while True:
         print("\n" + "=" * 50)
         print("📊 BORSA UYGULAMASI")
@@ -336,15 +833,22 @@ def main():
                 print(f"{i}. {hisse}")
             hisse_no = int(input("\nHangi hissenin grafiğini görmek istiyorsunuz? (1-10): ")) - 1
             if 0 <= hisse_no < len(uygulama.bist100_hisseleri):
-                uygulama.hisse_grafik_ciz(uygulama.bist100_hisseleri[hisse_no],period="1y")
+                from borsa_indikator import indikator_ayristir
+                giris = input("Göstergeler (örn: SMA20,EMA50,BB,RSI14,MACD; boş bırakılabilir): ")
+                try:
+                    indikatorler = indikator_ayristir(giris)
+                except ValueError as e:
+                    print(f"{e}. Göstergesiz çiziliyor.")
+                    indikatorler = []
+                uygulama.hisse_grafik_ciz(uygulama.bist100_hisseleri[hisse_no],period="1y", indikatorler=indikatorler)
             else:
                     print("Geçersiz seçim!")
 
 
         elif secim == "3":
-            bist100 = yf.Ticker("^XU100")
-            degisim = bist100.info.get("regularMarketChangePercent")
-            fiyat = bist100.info.get("regularMarketPrice")
+            bist100 = uygulama.onbellek.fiyat_bilgisi("^XU100")
+            degisim = bist100.get("regularMarketChangePercent")
+            fiyat = bist100.get("regularMarketPrice")
 
             if degisim is not None and fiyat is not None:
                 print(f"\n📈 BIST100 Endeksi")
@@ -359,19 +863,30 @@ def main():
             print("\nPortföyünüzdeki hisseleri ve lot miktarlarını girin (virgülle ayırın):")
             print("Örnek: THYAO.IS:10,GARAN.IS:5,AKBNK.IS:20")
             giris = input("Hisseler ve lotlar: ")
-            hisseler_lotlar = []
-            for parca in giris.split(','):
-                try:
-                    hisse, lot = parca.split(':')
-                    lot = int(lot.strip())
-                    hisseler_lotlar.append((hisse.strip(), lot))
-                except:
-                    print(f"Hatalı giriş: '{parca}'. Bu hisse atlanacak.")
-            uygulama.portfoy_analizi(hisseler_lotlar)
+            uygulama.portfoy_analizi(_portfoy_ayristir(giris))
         elif secim == "5":
-            hisse = input("Takip edilecek hisse kodunu girin (örn: THYAO.IS): ")
+            print("Birden fazla hisse için virgülle ayırın, 'hepsi' listedeki tüm hisseler, '@dosya' izleme listesi")
+            giris = input("Takip edilecek hisse kodları (örn: THYAO.IS): ").strip()
             sure = int(input("Takip süresi (dakika): "))
-            uygulama.canli_takip(hisse, sure)
+            if giris.lower() == "hepsi":
+                hisseler = list(uygulama.bist100_hisseleri)
+            elif giris.startswith("@"):
+                try:
+                    hisseler = izleme_listesi_oku(giris[1:])
+                except OSError as e:
+                    print(f"İzleme listesi okunamadı: {e}")
+                    continue
+            else:
+                hisseler = [h.strip() for h in giris.split(",") if h.strip()]
+            kurallar = []
+            alarm_dosyasi = input("Alarm kuralları dosyası (boş bırakılabilir): ").strip()
+            if alarm_dosyasi:
+                from borsa_alarm import KuralHatasi, kurallari_oku
+                try:
+                    kurallar = kurallari_oku(alarm_dosyasi)
+                except (OSError, KuralHatasi) as e:
+                    print(f"Alarm kuralları okunamadı: {e}")
+            uygulama.canli_takip(hisseler, sure, alarm_kurallari=kurallar)
 
         elif secim == "6":
             print("Uygulama kapatılıyor...")
@@ -382,4 +897,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
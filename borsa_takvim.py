@@ -0,0 +1,32 @@
+"""Period ve seans hesapları"""
+from datetime import datetime, time as dtime, timedelta
+
+# yfinance period değerlerinin kabaca gün karşılıkları
+PERIOD_GUNLERI = {
+    "1d": 1, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183,
+    "1y": 366, "2y": 731, "5y": 1827, "10y": 3653,
+}
+SEANS_ACILISI = dtime(10, 0)
+
+
+def period_gunu(period):
+    return PERIOD_GUNLERI.get(period, 366)
+
+
+def period_baslangici(period, simdi):
+    """Period için istenen ilk tarihi döndürür, 'max' için None"""
+    if period == "max":
+        return None
+    if period == "ytd":
+        return datetime(simdi.year, 1, 1)
+    return simdi - timedelta(days=period_gunu(period))
+
+
+def beklenen_son_gun(simdi):
+    """Yerel depoda bulunması gereken en son günlük barın tarihi"""
+    gun = simdi.date()
+    if simdi.weekday() >= 5 or simdi.time() < SEANS_ACILISI:
+        gun -= timedelta(days=1)
+        while gun.weekday() >= 5:
+            gun -= timedelta(days=1)
+    return gun
@@ -0,0 +1,233 @@
+"""Sembol evreni üzerinde vektörel tarama: saklanan özellikler + symbols meta verisi tek panelde
+
+Her sembolün son barlarından türetilen özellikler (getiriler, hacim ortalaması,
+SMA/RSI, oynaklık, 52 haftalık uçlar) symbol_features tablosunda tutulur ve
+yalnızca yeni barı gelen semboller için, sınırlı bir kuyruktan yeniden
+hesaplanır. Tarama bu tabloyu symbols meta verisiyle (sector, market_cap)
+sembol indeksli tek bir DataFrame'de birleştirir; süzgeç ve sıralama
+ifadeleri tüm evren üzerinde tek vektörel geçişte (DataFrame.eval) çalışır.
+
+Örnek süzgeç: "sector == Banks and 20d return > 5% and volume > 2x 20d avg"
+"""
+import re
+from datetime import timedelta
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from borsa_donusum import OZELLIK_SUTUNLARI
+from borsa_indikator import rsi
+
+GECMIS_BAR = 300  # en uzun pencere (52 hafta / 250 günlük getiri) + RSI ısınması
+OKUMA_GUNU = 460  # GECMIS_BAR işlem gününü kapsayan takvim günü
+YILLIK_GUN = 252
+GETIRI_GUNLERI = (1, 5, 20, 60, 250)
+
+# Paneldeki türetilmiş sütunlar: ad -> (panel -> Series)
+TURETILMIS = {
+    "rel_volume": lambda p: p["volume"] / p["avg_volume_20"],
+    "dist_52w_high": lambda p: (p["close"] / p["high_52w"] - 1) * 100,
+}
+
+# Okunabilir yazımlar -> panel sütunları; sayısal kısaltmalardan önce uygulanır
+_KISALTMALAR = (
+    (re.compile(r"\b(\d+)\s*d(?:ay)?\s+(?:return|getiri)\b", re.I), lambda m: f"ret_{m[1]}d"),
+    (re.compile(r"\b(\d+)\s*d(?:ay)?\s+(?:avg|average|ort)(?:\s+(?:volume|hacim))?\b", re.I),
+     lambda m: f"avg_volume_{m[1]}"),
+    (re.compile(r"\b(\d+)\s*d(?:ay)?\s+(?:sma|ma)\b", re.I), lambda m: f"sma_{m[1]}"),
+    (re.compile(r"\b(\d+)\s*d(?:ay)?\s+(?:volatility|vol)\b", re.I), lambda m: f"volatility_{m[1]}"),
+    (re.compile(r"\b52\s*w(?:eek)?\s+(high|low)\b", re.I), lambda m: f"{m[1].lower()}_52w"),
+    (re.compile(r"\brsi(?:\s*(\d+))?\b", re.I), lambda m: f"rsi_{m[1] or 14}"),
+    (re.compile(r"\bmarket\s+cap\b", re.I), lambda m: "market_cap"),
+    (re.compile(r"\bprice\b", re.I), lambda m: "close"),
+    (re.compile(r"(\d+(?:\.\d+)?)\s*%"), lambda m: m[1]),
+    (re.compile(r"\b(\d+(?:\.\d+)?)\s*([KMB])\b"),
+     lambda m: repr(float(m[1]) * {"K": 1e3, "M": 1e6, "B": 1e9}[m[2]])),
+    (re.compile(r"(\d+(?:\.\d+)?)\s*[x×]\s*(?=[A-Za-z_(])"), lambda m: f"{m[1]} * "),
+)
+_BELIRTEC = re.compile(
+    r"""\s*(?:(?P<metin>"[^"]*"|'[^']*')|(?P<sayi>\d+(?:\.\d+)?(?:e[+-]?\d+)?)"""
+    r"""|(?P<ad>[A-Za-z_][\w.]*)|(?P<op>==|!=|<=|>=|=|<|>|[()\[\],*/+\-~&|]))"""
+)
+_ANAHTAR_KELIMELER = {"and", "or", "not", "in"}
+_KARSILASTIRMA = {"==", "!="}
+
+
+class TaramaHatasi(ValueError):
+    pass
+
+
+@lru_cache(maxsize=256)
+def ifade_cevir(metin, sutunlar):
+    """Kullanıcı ifadesini DataFrame.eval ifadesine çevirir ve yalnızca panel sütunlarına izin verir.
+
+    Karşılaştırmanın diğer tarafındaki tanınmayan sözcükler metin değeri sayılır (sector == Banks).
+    """
+    for desen, degistir in _KISALTMALAR:
+        metin = desen.sub(degistir, metin)
+    belirtecler = []
+    konum = 0
+    metin = metin.rstrip()
+    while konum < len(metin):
+        eslesme = _BELIRTEC.match(metin, konum)
+        if not eslesme:
+            raise TaramaHatasi(f"Anlaşılamayan ifade: {metin[konum:].strip()!r}")
+        konum = eslesme.end()
+        tur = eslesme.lastgroup
+        belirtecler.append([tur, eslesme.group(tur)])
+
+    cikti = []
+    for i, (tur, deger) in enumerate(belirtecler):
+        if tur == "op" and deger == "=":
+            deger = "=="
+        elif tur == "ad":
+            kucuk = deger.lower()
+            if kucuk in _ANAHTAR_KELIMELER:
+                deger = kucuk
+            elif deger not in sutunlar:
+                onceki = belirtecler[i - 1][1] if i else None
+                sonraki = belirtecler[i + 1][1] if i + 1 < len(belirtecler) else None
+                if onceki in _KARSILASTIRMA or onceki in ("=", "[", ",") or sonraki in _KARSILASTIRMA or sonraki == "=":
+                    deger = repr(deger)
+                else:
+                    raise TaramaHatasi(f"Bilinmeyen alan: {deger} (alanlar: {', '.join(sutunlar)})")
+        cikti.append(deger)
+    if not cikti:
+        raise TaramaHatasi("Boş ifade")
+    return " ".join(cikti)
+
+
+def _hizala(seriler, uzunluk):
+    """Sembol başına son `uzunluk` değeri sağa yaslı (sembol × bar) matrise dizer; eksikler NaN"""
+    matris = np.full((len(seriler), uzunluk), np.nan)
+    for i, seri in enumerate(seriler):
+        degerler = np.asarray(seri, dtype=float)[-uzunluk:]
+        if len(degerler):
+            matris[i, uzunluk - len(degerler):] = degerler
+    return matris
+
+
+def _pencere(fonksiyon, matris, n):
+    """Son n sütun üzerinde satır bazlı toplama; penceresi eksik satırlar NaN"""
+    if matris.shape[1] < n:
+        return np.full(matris.shape[0], np.nan)
+    parca = matris[:, -n:]
+    with np.errstate(invalid="ignore"):
+        return np.where(np.isnan(parca).any(axis=1), np.nan, fonksiyon(parca, axis=1))
+
+
+def ozellikleri_hesapla(veriler, uzunluk=GECMIS_BAR):
+    """{sembol: Close/Volume DataFrame} sözlüğünden symbol indeksli özellik tablosu üretir.
+
+    Tüm semboller tek (sembol × bar) matriste hizalanır, özellikler sütun işlemleriyle
+    bir kerede hesaplanır. Getiriler ve oynaklık yüzde cinsindendir.
+    """
+    # Sütunlar sembol başına bir kez NumPy'a alınır; sonrası tamamen matris işlemidir
+    diziler = {}
+    for sembol, df in veriler.items():
+        if df is None or df.empty:
+            continue
+        kapanis = df["Close"].to_numpy(dtype=float, na_value=np.nan)
+        if not np.isnan(kapanis).all():
+            diziler[sembol] = (kapanis, df["Volume"].to_numpy(dtype=float, na_value=np.nan), df.index[-1])
+    semboller = list(diziler)
+    if not semboller:
+        return pd.DataFrame(columns=("ts",) + OZELLIK_SUTUNLARI, index=pd.Index([], name="symbol"))
+    kapanis = _hizala([diziler[s][0] for s in semboller], uzunluk)
+    hacim = _hizala([diziler[s][1] for s in semboller], uzunluk)
+    son = kapanis[:, -1]
+
+    zamanlar = pd.DatetimeIndex([diziler[s][2] for s in semboller])
+    if zamanlar.tz is not None:
+        zamanlar = zamanlar.tz_localize(None)
+    ozellik = {"ts": zamanlar, "close": son, "volume": hacim[:, -1]}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for gun in GETIRI_GUNLERI:
+            ozellik[f"ret_{gun}d"] = (son / kapanis[:, -1 - gun] - 1) * 100 if gun < uzunluk else np.nan
+        # Hacim ortalaması son barı içermez; "bugünkü hacim > 2 × ortalama" karşılaştırması için
+        ozellik["avg_volume_20"] = _pencere(np.mean, hacim[:, :-1], 20)
+        for n in (20, 50, 200):
+            ozellik[f"sma_{n}"] = _pencere(np.mean, kapanis, n)
+        log_getiri = np.diff(np.log(kapanis), axis=1)
+        ozellik["volatility_20"] = _pencere(np.std, log_getiri, 20) * np.sqrt(YILLIK_GUN) * 100
+        # fmax/fmin NaN'ları atlar; yeni listelenen semboller eldeki geçmişle hesaplanır
+        ozellik["high_52w"] = np.fmax.reduce(kapanis[:, -YILLIK_GUN:], axis=1)
+        ozellik["low_52w"] = np.fmin.reduce(kapanis[:, -YILLIK_GUN:], axis=1)
+    # RSI tüm evren için tek çağrıda; ısınma için yeterli geçmişi olmayan semboller NaN
+    rsi_son = rsi(pd.DataFrame(kapanis.T), 14).to_numpy()[-1]
+    ozellik["rsi_14"] = np.where((~np.isnan(kapanis)).sum(axis=1) > 14, rsi_son, np.nan)
+
+    return pd.DataFrame(ozellik, index=pd.Index(semboller, name="symbol"))[["ts", *OZELLIK_SUTUNLARI]]
+
+
+def panel_olustur(ozellikler, meta):
+    """Özellik tablosunu meta veriyle birleştirip türetilmiş sütunları ekler"""
+    panel = ozellikler.join(meta, how="left")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for ad, fonksiyon in TURETILMIS.items():
+            panel[ad] = fonksiyon(panel)
+    return panel
+
+
+def tara(panel, suzgec=None, sirala=None, artan=False, limit=None):
+    """Süzgeci tüm panelde tek geçişte uygular, sonucu sıralayıp ilk `limit` satırı döndürür"""
+    sutunlar = tuple(panel.columns) + (panel.index.name or "symbol",)
+    if suzgec and suzgec.strip():
+        maske = panel.eval(ifade_cevir(suzgec, sutunlar))
+        if not isinstance(maske, pd.Series) or maske.dtype != bool:
+            raise TaramaHatasi(f"Süzgeç doğru/yanlış üretmeli: {suzgec}")
+        panel = panel[maske.to_numpy()]
+    if sirala and sirala.strip():
+        anahtar = panel.eval(ifade_cevir(sirala, sutunlar))
+        sira = np.argsort(np.asarray(anahtar, dtype=float) * (1 if artan else -1), kind="stable")
+        # NaN'lar argsort'ta sona düşer
+        panel = panel.iloc[sira]
+    if limit:
+        panel = panel.head(limit)
+    return panel
+
+
+class Tarayici:
+    """Depodaki özellik ve meta veriyi bellekteki panelde tutar; tarama depoya gitmez"""
+
+    def __init__(self, depo):
+        self.depo = depo
+        self._panel = None
+
+    def guncelle(self, semboller, zorla=False):
+        """Son barı saklanan özellikten yeni olan sembolleri yeniden hesaplar, güncellenen sayıyı döndürür.
+
+        `zorla`, aynı zaman damgalı barın yeniden yazıldığı durumlar (gün içi senkron) içindir.
+        """
+        semboller = list(dict.fromkeys(semboller))
+        if not semboller:
+            return 0
+        saklanan = self.depo.ozellikleri_oku(semboller)["ts"]
+        veriler = {}
+        for sembol in semboller:
+            _, son = self.depo.fiyat_araligi(sembol)
+            if son is None:
+                continue
+            if not zorla and sembol in saklanan.index and saklanan[sembol] >= pd.Timestamp(son):
+                continue
+            veriler[sembol] = self.depo.fiyat_oku(
+                sembol, start=son - timedelta(days=OKUMA_GUNU), sutunlar=["Close", "Volume"]
+            )
+        ozellikler = ozellikleri_hesapla(veriler)
+        if ozellikler.empty:
+            return 0
+        self.depo.ozellikleri_kaydet(ozellikler)
+        self._panel = None
+        return len(ozellikler)
+
+    def panel(self, taze=False):
+        if self._panel is None or taze:
+            self._panel = panel_olustur(self.depo.ozellikleri_oku(), self.depo.semboller_oku())
+        return self._panel
+
+    def tara(self, suzgec=None, sirala=None, artan=False, limit=None, semboller=None):
+        panel = self.panel()
+        if semboller is not None:
+            panel = panel[panel.index.isin(list(semboller))]
+        return tara(panel, suzgec, sirala, artan, limit)
@@ -0,0 +1,253 @@
+"""Sembol başına son N tick'i önceden ayrılmış NumPy halka tamponlarında tutan süreç içi depo
+
+Tick başına Python nesnesi ya da DataFrame oluşturulmaz; her sembol sabit
+boyutlu üç dizi (zaman, fiyat, hacim) kullanır, bellek sembol sayısıyla
+doğrusal ve önceden bilinir. Son fiyat, VWAP ve min/maks O(1) (amortize),
+n saniyelik değişim O(log N) ile yanıtlanır; OHLC barları istendiğinde
+tampondaki ticklerden vektörel olarak üretilir.
+"""
+import threading
+from datetime import datetime
+
+import numpy as np
+
+VARSAYILAN_KAPASITE = 1024
+_EPOK = datetime(1970, 1, 1)  # zamanlar yerel duvar saati saniyesi olarak saklanır
+
+
+def _saniye(zaman):
+    return (zaman.replace(tzinfo=None) - _EPOK).total_seconds()
+
+
+class _MonotonKuyruk:
+    """Kayan penceredeki en büyük (isaret=1) ya da en küçük (isaret=-1) değerin sıra numaralarını tutar"""
+
+    __slots__ = ("sira", "bas", "uzunluk", "kapasite", "isaret")
+
+    def __init__(self, kapasite, isaret):
+        self.sira = np.empty(kapasite, dtype=np.int64)
+        self.bas = 0
+        self.uzunluk = 0
+        self.kapasite = kapasite
+        self.isaret = isaret
+
+    def dusur(self, en_eski):
+        while self.uzunluk and self.sira[self.bas] < en_eski:
+            self.bas = (self.bas + 1) % self.kapasite
+            self.uzunluk -= 1
+
+    def ekle(self, sira, deger, degerler):
+        # Yeni değerden kötü olan kuyruk elemanları bir daha uç değer olamaz
+        while self.uzunluk:
+            kuyruk = int(self.sira[(self.bas + self.uzunluk - 1) % self.kapasite])
+            if self.isaret * degerler[kuyruk % self.kapasite] <= self.isaret * deger:
+                self.uzunluk -= 1
+            else:
+                break
+        self.sira[(self.bas + self.uzunluk) % self.kapasite] = sira
+        self.uzunluk += 1
+
+    def ilk(self):
+        return int(self.sira[self.bas])
+
+
+class _Halka:
+    """Tek sembolün tick halkası ve artımlı toplamları"""
+
+    __slots__ = ("kapasite", "zaman", "fiyat", "hacim", "sayi", "toplam_pv", "toplam_v",
+                 "son_kumulatif", "maks", "min")
+
+    def __init__(self, kapasite):
+        self.kapasite = kapasite
+        self.zaman = np.zeros(kapasite, dtype=np.float64)
+        self.fiyat = np.zeros(kapasite, dtype=np.float64)
+        self.hacim = np.zeros(kapasite, dtype=np.float64)
+        self.sayi = 0  # şimdiye kadar eklenen tick sayısı; sonraki tick'in sıra numarası
+        self.toplam_pv = 0.0
+        self.toplam_v = 0.0
+        self.son_kumulatif = None
+        self.maks = _MonotonKuyruk(kapasite, 1)
+        self.min = _MonotonKuyruk(kapasite, -1)
+
+    def __len__(self):
+        return min(self.sayi, self.kapasite)
+
+    def ekle(self, zaman, fiyat, hacim):
+        k = self.kapasite
+        i = self.sayi % k
+        if self.sayi:
+            zaman = max(zaman, self.zaman[(i - 1) % k])  # sıralı arama için zaman geri gitmez
+        if self.sayi >= k:
+            # Üzerine yazılacak en eski tick toplamlardan çıkarılır
+            self.toplam_pv -= self.fiyat[i] * self.hacim[i]
+            self.toplam_v -= self.hacim[i]
+        en_eski = self.sayi - k + 1
+        self.maks.dusur(en_eski)
+        self.min.dusur(en_eski)
+        self.zaman[i] = zaman
+        self.fiyat[i] = fiyat
+        self.hacim[i] = hacim
+        self.maks.ekle(self.sayi, fiyat, self.fiyat)
+        self.min.ekle(self.sayi, fiyat, self.fiyat)
+        self.toplam_pv += fiyat * hacim
+        self.toplam_v += hacim
+        self.sayi += 1
+        if self.sayi % k == 0:
+            # Halka her döndüğünde toplamlar baştan hesaplanır, çıkarma hataları birikmez (amortize O(1))
+            self.toplam_pv = float(np.dot(self.fiyat, self.hacim))
+            self.toplam_v = float(self.hacim.sum())
+
+    def sirali(self, dizi):
+        """Diziyi eskiden yeniye sıralı bir kopya olarak döndürür"""
+        if self.sayi <= self.kapasite:
+            return dizi[:self.sayi].copy()
+        i = self.sayi % self.kapasite
+        return np.concatenate((dizi[i:], dizi[:i]))
+
+    def oncesi(self, hedef):
+        """Zamanı hedef'ten küçük ya da eşit son tick'in fiyatı; yoksa None"""
+        n = len(self)
+        if not n:
+            return None
+        if self.sayi <= self.kapasite:
+            j = int(np.searchsorted(self.zaman[:n], hedef, side="right")) - 1
+            return float(self.fiyat[j]) if j >= 0 else None
+        # Dolu halka iki sıralı parçadan oluşur: [i:] eski, [:i] yeni
+        i = self.sayi % self.kapasite
+        j = int(np.searchsorted(self.zaman[:i], hedef, side="right")) - 1
+        if j >= 0:
+            return float(self.fiyat[j])
+        j = int(np.searchsorted(self.zaman[i:], hedef, side="right")) - 1
+        return float(self.fiyat[i + j]) if j >= 0 else None
+
+
+class TickTamponu:
+    """Canlı takip motoruna abone olup sembol başına son `kapasite` tick'i saklar.
+
+    Motorun `hacim` alanı günlük kümülatif hacimdir; tick hacmi ardışık farktan türetilir.
+    Sorgular motor iş parçacığıyla eşzamanlı yapılabilir.
+    """
+
+    def __init__(self, kapasite=VARSAYILAN_KAPASITE):
+        self.kapasite = max(2, int(kapasite))
+        self._halkalar = {}
+        self._kilit = threading.Lock()
+
+    def __call__(self, tick):
+        fiyat = tick.get('fiyat')
+        if fiyat is None:
+            return
+        self.ekle(tick['sembol'], tick['zaman'], fiyat, tick.get('hacim'))
+
+    def ekle(self, sembol, zaman, fiyat, kumulatif_hacim=None):
+        with self._kilit:
+            halka = self._halkalar.get(sembol)
+            if halka is None:
+                halka = self._halkalar[sembol] = _Halka(self.kapasite)
+            hacim = 0.0
+            if kumulatif_hacim is not None:
+                onceki = halka.son_kumulatif
+                # Gün değişiminde kümülatif hacim sıfırlanır; ilk tick'in hacmi bilinmez
+                if onceki is not None and kumulatif_hacim >= onceki:
+                    hacim = float(kumulatif_hacim - onceki)
+                halka.son_kumulatif = kumulatif_hacim
+            halka.ekle(_saniye(zaman), float(fiyat), hacim)
+
+    def semboller(self):
+        with self._kilit:
+            return list(self._halkalar)
+
+    def _halka(self, sembol):
+        halka = self._halkalar.get(sembol)
+        return halka if halka is not None and halka.sayi else None
+
+    def son(self, sembol):
+        """Son tick'in fiyatı"""
+        with self._kilit:
+            halka = self._halka(sembol)
+            return float(halka.fiyat[(halka.sayi - 1) % halka.kapasite]) if halka else None
+
+    def vwap(self, sembol):
+        """Tampondaki ticklerin hacim ağırlıklı ortalama fiyatı; hacim yoksa None"""
+        with self._kilit:
+            halka = self._halka(sembol)
+            if not halka or halka.toplam_v <= 0:
+                return None
+            return float(halka.toplam_pv / halka.toplam_v)
+
+    def en_yuksek(self, sembol):
+        with self._kilit:
+            halka = self._halka(sembol)
+            return float(halka.fiyat[halka.maks.ilk() % halka.kapasite]) if halka else None
+
+    def en_dusuk(self, sembol):
+        with self._kilit:
+            halka = self._halka(sembol)
+            return float(halka.fiyat[halka.min.ilk() % halka.kapasite]) if halka else None
+
+    def degisim(self, sembol, saniye):
+        """Son tick'e göre `saniye` önceki fiyattan yüzde değişim; tampon o kadar geriye gitmiyorsa None"""
+        with self._kilit:
+            halka = self._halka(sembol)
+            if not halka:
+                return None
+            son_i = (halka.sayi - 1) % halka.kapasite
+            onceki = halka.oncesi(halka.zaman[son_i] - saniye)
+            if not onceki:
+                return None
+            return float((halka.fiyat[son_i] / onceki - 1) * 100)
+
+    def ozet(self, sembol, saniye=60):
+        """Canlı görünüm ve alarmlar için tek çağrıda tüm toplamlar"""
+        return {
+            'son': self.son(sembol),
+            'vwap': self.vwap(sembol),
+            'en_yuksek': self.en_yuksek(sembol),
+            'en_dusuk': self.en_dusuk(sembol),
+            'degisim': self.degisim(sembol, saniye),
+            'tick': self.tick_sayisi(sembol),
+        }
+
+    def tick_sayisi(self, sembol):
+        with self._kilit:
+            halka = self._halkalar.get(sembol)
+            return len(halka) if halka else 0
+
+    def ticklar(self, sembol):
+        """(zaman_saniye, fiyat, hacim) dizilerini eskiden yeniye kopya olarak döndürür"""
+        with self._kilit:
+            halka = self._halkalar.get(sembol)
+            if halka is None:
+                bos = np.empty(0)
+                return bos, bos, bos
+            return halka.sirali(halka.zaman), halka.sirali(halka.fiyat), halka.sirali(halka.hacim)
+
+    def ohlc(self, sembol, saniye=60):
+        """Tampondaki tickleri `saniye` uzunluğunda barlara böler (Open/High/Low/Close/Volume/TickCount)"""
+        import pandas as pd
+        zaman, fiyat, hacim = self.ticklar(sembol)
+        sutunlar = ["Open", "High", "Low", "Close", "Volume", "TickCount"]
+        if not len(zaman):
+            return pd.DataFrame(columns=sutunlar, index=pd.DatetimeIndex([], name="Date"))
+        kova = np.floor_divide(zaman, saniye).astype(np.int64)
+        baslar = np.concatenate(([0], np.flatnonzero(np.diff(kova)) + 1))
+        sonlar = np.concatenate((baslar[1:], [len(zaman)]))
+        return pd.DataFrame(
+            {
+                "Open": fiyat[baslar],
+                "High": np.maximum.reduceat(fiyat, baslar),
+                "Low": np.minimum.reduceat(fiyat, baslar),
+                "Close": fiyat[sonlar - 1],
+                "Volume": np.add.reduceat(hacim, baslar),
+                "TickCount": sonlar - baslar,
+            },
+            index=pd.DatetimeIndex(pd.to_datetime(kova[baslar] * saniye, unit="s"), name="Date"),
+        )
+
+    def bellek(self):
+        """Halka dizilerinin toplam bayt cinsinden boyutu"""
+        with self._kilit:
+            return sum(
+                h.zaman.nbytes + h.fiyat.nbytes + h.hacim.nbytes + h.maks.sira.nbytes + h.min.sira.nbytes
+                for h in self._halkalar.values()
+            )
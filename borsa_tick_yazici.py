@@ -0,0 +1,214 @@
+"""Canlı tickleri arka planda toplu halde veritabanına yazan tamponlu yazıcı"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from itertools import islice
+
+from borsa_metrik import metrikler
+
+POLITIKALAR = ("block", "drop_oldest", "spill")
+TASMA_DOSYASI = os.getenv("TICK_TASMA", os.path.join(os.path.expanduser("~"), ".cache", "borsa", "tick_tasma.jsonl"))
+
+
+class TickYazici:
+    """Sınırlı bellek kuyruğu + arka plan boşaltıcı.
+
+    `yazici(kayitlar)` (symbol, ts, price, change_percent, volume) demetlerinden oluşan
+    bir listeyi tek seferde kalıcı hale getirmelidir. Kuyruk dolduğunda davranış
+    `politika` ile seçilir: block (üretici bekler), drop_oldest (en eski tick
+    atılır) veya spill (tick `tasma_dosyasi`na yazılır, kuyruk boşalınca geri
+    yüklenir). Geri yükleme ya da bir parti yazılamazsa sonraki geri yükleme
+    üstel geri çekilmeyle ertelenir; depo kapalıyken taşma dosyası her turda
+    baştan okunmaz. Başarılı ilk parti yazımı bekleme süresini sıfırlar.
+    """
+
+    def __init__(self, yazici, max_kuyruk=10000, parti_boyutu=500, flush_araligi=1.0,
+                 politika="block", tasma_dosyasi=None, ilk_bekleme=1.0, max_bekleme=60.0):
+        if politika not in POLITIKALAR:
+            raise ValueError(f"Geçersiz politika: {politika} (seçenekler: {', '.join(POLITIKALAR)})")
+        self.yazici = yazici
+        self.max_kuyruk = max(1, int(max_kuyruk))
+        self.parti_boyutu = max(1, int(parti_boyutu))
+        self.flush_araligi = flush_araligi
+        self.politika = politika
+        self.tasma_dosyasi = tasma_dosyasi or TASMA_DOSYASI
+        self.ilk_bekleme = ilk_bekleme
+        self.max_bekleme = max_bekleme
+        self._ardisik_hata = 0
+        self._sonraki_geri_yukleme = 0.0
+        self._kuyruk = deque()
+        self._kosul = threading.Condition()
+        self._tasma_kilidi = threading.Lock()
+        self._is_parcacigi = None
+        self._kapaniyor = False
+        self.yazilan = 0
+        self.atilan = 0
+        self.tasan = 0
+        self.hatali_parti = 0
+
+    def baslat(self):
+        with self._kosul:
+            if self._is_parcacigi is not None:
+                return
+            self._kapaniyor = False
+            self._is_parcacigi = threading.Thread(target=self._dongu, name="tick-yazici", daemon=True)
+            self._is_parcacigi.start()
+
+    def ekle(self, symbol_code, price, change_percent, ts=None, volume=None):
+        """Tick'i kuyruğa ekler; veritabanı yazımını beklemez. `volume` günlük kümülatif hacimdir"""
+        kayit = (
+            symbol_code,
+            ts or datetime.now(),
+            float(price) if price is not None else None,
+            float(change_percent) if change_percent is not None else None,
+            float(volume) if volume is not None else None,
+        )
+        if self._is_parcacigi is None:
+            self.baslat()
+        with self._kosul:
+            while len(self._kuyruk) >= self.max_kuyruk:
+                if self.politika == "drop_oldest":
+                    self._kuyruk.popleft()
+                    self.atilan += 1
+                elif self.politika == "spill":
+                    self._diske_tasir([kayit])
+                    return
+                else:
+                    self._kosul.wait()
+            self._kuyruk.append(kayit)
+            if len(self._kuyruk) >= self.parti_boyutu:
+                self._kosul.notify_all()
+
+    def _parti_al(self):
+        # Kilit altında çağrılmalı
+        adet = min(self.parti_boyutu, len(self._kuyruk))
+        parti = [self._kuyruk.popleft() for _ in range(adet)]
+        self._kosul.notify_all()  # bekleyen üreticileri uyandır
+        return parti
+
+    def _dongu(self):
+        while True:
+            with self._kosul:
+                son_tarih = time.monotonic() + self.flush_araligi
+                while not self._kapaniyor and len(self._kuyruk) < self.parti_boyutu:
+                    kalan = son_tarih - time.monotonic()
+                    if kalan <= 0:
+                        break
+                    self._kosul.wait(kalan)
+                parti = self._parti_al()
+                bitti = self._kapaniyor and not self._kuyruk
+            if parti:
+                self._yaz(parti)
+            if not parti or bitti:
+                self._tasmayi_geri_yukle(zorla=bitti)
+            if bitti:
+                return
+
+    def _yaz(self, parti):
+        try:
+            self.yazici(parti)
+            self.yazilan += len(parti)
+            self._ardisik_hata = 0
+            self._sonraki_geri_yukleme = 0.0
+        except Exception as e:
+            self.hatali_parti += 1
+            self._geri_cekil()
+            metrikler.hata("tick_yazici.parti", hata=e)
+            print(f"Tick yazma hatası ({len(parti)} kayıt): {e}")
+            if self.politika == "spill":
+                self._diske_tasir(parti)
+            else:
+                self.atilan += len(parti)
+
+    def _geri_cekil(self):
+        self._ardisik_hata += 1
+        bekleme = min(self.max_bekleme, self.ilk_bekleme * 2 ** (self._ardisik_hata - 1))
+        self._sonraki_geri_yukleme = time.monotonic() + bekleme
+
+    def _diske_tasir(self, kayitlar):
+        with self._tasma_kilidi:
+            dizin = os.path.dirname(self.tasma_dosyasi)
+            if dizin:
+                os.makedirs(dizin, exist_ok=True)
+            with open(self.tasma_dosyasi, "a", encoding="utf-8") as f:
+                for symbol_code, ts, price, change_percent, volume in kayitlar:
+                    f.write(json.dumps([symbol_code, ts.isoformat(), price, change_percent, volume]) + "\n")
+        self.tasan += len(kayitlar)
+
+    def _tasmayi_geri_yukle(self, zorla=False):
+        """Kuyruk boşken diske taşmış tickleri veritabanına aktarır; geri çekilme süresinde beklemez"""
+        if self.politika != "spill" or not os.path.exists(self.tasma_dosyasi):
+            return
+        if not zorla and time.monotonic() < self._sonraki_geri_yukleme:
+            return
+        isleniyor = self.tasma_dosyasi + ".isleniyor"
+        with self._tasma_kilidi:
+            os.replace(self.tasma_dosyasi, isleniyor)
+        parti = []
+        islenen = 0  # veritabanına yazılmış satır sayısı
+        try:
+            with open(isleniyor, encoding="utf-8") as f:
+                for satir in f:
+                    # Hacim sütunu eklenmeden önce taşmış satırlarda beşinci alan yoktur
+                    symbol_code, ts, price, change_percent, *volume = json.loads(satir)
+                    parti.append((symbol_code, datetime.fromisoformat(ts), price, change_percent,
+                                  volume[0] if volume else None))
+                    if len(parti) >= self.parti_boyutu:
+                        self.yazici(parti)
+                        self.yazilan += len(parti)
+                        islenen += len(parti)
+                        parti = []
+            if parti:
+                self.yazici(parti)
+                self.yazilan += len(parti)
+            os.remove(isleniyor)
+            self._ardisik_hata = 0
+            self._sonraki_geri_yukleme = 0.0
+        except Exception as e:
+            self._geri_cekil()
+            # Yazılmış partiler atılır, kalan satırlar bir sonraki turda yeniden denenir
+            metrikler.hata("tick_yazici.geri_yukleme", hata=e)
+            print(f"Taşan tickler geri yüklenemedi: {e}")
+            with self._tasma_kilidi:
+                with open(isleniyor, encoding="utf-8") as f:
+                    kalan = list(islice(f, islenen, None))
+                if os.path.exists(self.tasma_dosyasi):
+                    # Bu arada taşan tickler kalanların arkasına eklenir
+                    with open(self.tasma_dosyasi, encoding="utf-8") as f:
+                        kalan.extend(f)
+                gecici = self.tasma_dosyasi + ".tmp"
+                with open(gecici, "w", encoding="utf-8") as f:
+                    f.writelines(kalan)
+                os.replace(gecici, self.tasma_dosyasi)
+                os.remove(isleniyor)
+
+    def flush(self):
+        """Kuyruktaki her şeyi hemen yazar"""
+        with self._kosul:
+            partiler = []
+            while self._kuyruk:
+                partiler.append(self._parti_al())
+        for parti in partiler:
+            self._yaz(parti)
+
+    def kapat(self, zaman_asimi=10.0):
+        """Kuyruğu boşaltıp arka plan iş parçacığını durdurur"""
+        with self._kosul:
+            is_parcacigi = self._is_parcacigi
+            self._kapaniyor = True
+            self._kosul.notify_all()
+        if is_parcacigi is not None:
+            is_parcacigi.join(zaman_asimi)
+        self._is_parcacigi = None
+
+    def istatistik(self):
+        return {
+            'kuyruk': len(self._kuyruk),
+            'yazilan': self.yazilan,
+            'atilan': self.atilan,
+            'tasan': self.tasan,
+            'hatali_parti': self.hatali_parti,
+        }
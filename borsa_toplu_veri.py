@@ -0,0 +1,49 @@
+"""Birden fazla sembol için eşzamanlı veri çekme katmanı"""
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TopluVeriCekici:
+    """Sembol listesini sınırlı bir iş parçacığı havuzuyla paralel çeker.
+
+    `cekici` tek sembol alıp sonucu döndüren herhangi bir çağrılabilirdir
+    (yfinance, önbellek ya da benchmark için sahte sağlayıcı).
+    """
+
+    def __init__(self, cekici, max_isci=8):
+        self.cekici = cekici
+        self.max_isci = max(1, int(max_isci))
+        self._havuz = None
+
+    def _havuz_al(self):
+        if self._havuz is None:
+            self._havuz = ThreadPoolExecutor(max_workers=self.max_isci, thread_name_prefix="toplu-veri")
+        return self._havuz
+
+    def getir(self, semboller):
+        """(sonuclar, hatalar) döndürür; bir sembolün hatası diğerlerini etkilemez"""
+        semboller = list(dict.fromkeys(semboller))  # sırayı koruyarak tekrarları at
+        sonuclar = {}
+        hatalar = {}
+        if not semboller:
+            return sonuclar, hatalar
+        if len(semboller) == 1:
+            # Tek sembolde havuza gerek yok
+            try:
+                sonuclar[semboller[0]] = self.cekici(semboller[0])
+            except Exception as e:
+                hatalar[semboller[0]] = e
+            return sonuclar, hatalar
+
+        havuz = self._havuz_al()
+        gelecekler = [(sembol, havuz.submit(self.cekici, sembol)) for sembol in semboller]
+        for sembol, gelecek in gelecekler:
+            try:
+                sonuclar[sembol] = gelecek.result()
+            except Exception as e:
+                hatalar[sembol] = e
+        return sonuclar, hatalar
+
+    def kapat(self):
+        if self._havuz is not None:
+            self._havuz.shutdown(wait=True)
+            self._havuz = None
@@ -0,0 +1,261 @@
+"""Bağlantı havuzu, sağlık kontrolü ve geri çekilmeli yeniden bağlanma"""
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class BaglantiYok(Exception):
+    """Veritabanına şu an ulaşılamıyor; bir sonraki deneme zamanı gelmedi"""
+
+
+class BaglantiHavuzu:
+    """Sınırlı sayıda bağlantıyı iş parçacıkları arasında paylaştırır.
+
+    Her iş parçacığı havuzdan kendi bağlantısını ve imlecini alır. Boşta uzun
+    kalmış bağlantılar verilmeden önce `saglik_sorgusu` ile kontrol edilir,
+    kopmuş olanlar atılıp yenisi açılır. Bağlantı açılamazsa denemeler üstel
+    geri çekilmeyle aralıklandırılır; bu süre içinde çağrılar beklemeden
+    `BaglantiYok` alır, böylece arayüz bloklanmaz.
+    """
+
+    def __init__(self, fabrika, boyut=5, kurulum=None, saglik_sorgusu="SELECT 1",
+                 saglik_araligi=30.0, ilk_bekleme=0.5, max_bekleme=60.0,
+                 baglanti_hatalari=(), kopma_kontrolu=None, paramstyle="format", bekleme_suresi=30.0):
+        self.fabrika = fabrika
+        self.boyut = max(1, int(boyut))
+        self.kurulum = kurulum
+        self.saglik_sorgusu = saglik_sorgusu
+        self.saglik_araligi = saglik_araligi
+        self.ilk_bekleme = ilk_bekleme
+        self.max_bekleme = max_bekleme
+        self.baglanti_hatalari = tuple(baglanti_hatalari)
+        self.kopma_kontrolu = kopma_kontrolu
+        self.paramstyle = paramstyle
+        self.bekleme_suresi = bekleme_suresi
+        self._bosta = queue.LifoQueue()  # (baglanti, son_kullanim)
+        self._yer = threading.BoundedSemaphore(self.boyut)
+        self._kilit = threading.Lock()
+        self._kurulum_kilidi = threading.Lock()
+        self._kurulum_tamam = kurulum is None
+        self._ardisik_hata = 0
+        self._sonraki_deneme = 0.0
+        self._kapali = False
+        self.acilan = 0
+        self.yeniden_baglanma = 0
+        self.atilan = 0
+
+    def sql(self, sorgu):
+        """`%s` yer tutucularını sürücünün biçimine çevirir"""
+        if self.paramstyle == "qmark":
+            return sorgu.replace("%s", "?")
+        return sorgu
+
+    def kullanilabilir(self):
+        """Geri çekilme süresi içinde değilsek True"""
+        return not self._kapali and time.monotonic() >= self._sonraki_deneme
+
+    def _ac(self):
+        with self._kilit:
+            if self._kapali:
+                raise BaglantiYok("Havuz kapatıldı")
+            kalan = self._sonraki_deneme - time.monotonic()
+            if kalan > 0:
+                raise BaglantiYok(f"Veritabanına ulaşılamıyor, {kalan:.0f} sn sonra yeniden denenecek")
+        # Bağlanmak saniyeler sürebilir; bu sırada diğer iş parçacıkları beklememeli
+        try:
+            baglanti = self.fabrika()
+        except Exception:
+            with self._kilit:
+                self._ardisik_hata += 1
+                bekleme = min(self.max_bekleme, self.ilk_bekleme * 2 ** (self._ardisik_hata - 1))
+                self._sonraki_deneme = time.monotonic() + bekleme * random.uniform(0.8, 1.2)
+            raise
+        with self._kilit:
+            if self._ardisik_hata:
+                self.yeniden_baglanma += 1
+            self._ardisik_hata = 0
+            self._sonraki_deneme = 0.0
+            self.acilan += 1
+        try:
+            if not self._kurulum_tamam:
+                with self._kurulum_kilidi:
+                    if not self._kurulum_tamam:
+                        self.kurulum(baglanti)
+                        self._kurulum_tamam = True
+        except BaseException:
+            self._at(baglanti)
+            raise
+        return baglanti
+
+    def baglanti_hatasi(self, hata):
+        """Hata bağlantının koptuğunu gösteriyorsa True; SQL hataları yeniden denenmez"""
+        if not isinstance(hata, self.baglanti_hatalari):
+            return False
+        return self.kopma_kontrolu is None or self.kopma_kontrolu(hata)
+
+    def _saglikli(self, baglanti):
+        try:
+            imlec = baglanti.cursor()
+            try:
+                imlec.execute(self.saglik_sorgusu)
+                imlec.fetchall()
+            finally:
+                imlec.close()
+            return True
+        except Exception:
+            return False
+
+    def _at(self, baglanti):
+        self.atilan += 1
+        try:
+            baglanti.close()
+        except Exception:
+            pass
+
+    def _al(self):
+        while True:
+            try:
+                baglanti, son_kullanim = self._bosta.get_nowait()
+            except queue.Empty:
+                return self._ac()
+            if time.monotonic() - son_kullanim < self.saglik_araligi or self._saglikli(baglanti):
+                return baglanti
+            self._at(baglanti)
+
+    @contextmanager
+    def baglanti(self):
+        """Havuzdan bir bağlantı ödünç verir; bağlantı hatasında bağlantı havuza dönmez"""
+        if not self._yer.acquire(timeout=self.bekleme_suresi):
+            raise BaglantiYok("Havuzda boş bağlantı yok")
+        baglanti = None
+        try:
+            baglanti = self._al()
+            yield baglanti
+        except Exception as e:
+            if baglanti is not None and self.baglanti_hatasi(e):
+                self._at(baglanti)
+                baglanti = None
+            raise
+        finally:
+            if baglanti is not None:
+                if self._kapali:
+                    self._at(baglanti)
+                else:
+                    self._bosta.put((baglanti, time.monotonic()))
+            self._yer.release()
+
+    @contextmanager
+    def imlec(self):
+        """Kendi bağlantısı üzerinde bir imleç verir; başarıda commit, hatada rollback yapar"""
+        with self.baglanti() as baglanti:
+            imlec = baglanti.cursor()
+            try:
+                yield imlec
+                baglanti.commit()
+            except Exception:
+                try:
+                    baglanti.rollback()
+                except Exception:
+                    pass
+                raise
+            finally:
+                imlec.close()
+
+    def calistir(self, islem, deneme=2):
+        """`islem(imlec)` çalıştırır; bağlantı koptuysa yeni bağlantıyla yeniden dener"""
+        for kalan in range(deneme - 1, -1, -1):
+            try:
+                with self.imlec() as imlec:
+                    return islem(imlec)
+            except Exception as e:
+                if kalan == 0 or not self.baglanti_hatasi(e) or not self.kullanilabilir():
+                    raise
+
+    def isit(self):
+        """Bir bağlantı açmayı dener; başarısızsa hatayı yazıp False döndürür"""
+        try:
+            with self.baglanti():
+                return True
+        except Exception as e:
+            print(f"Veritabanı bağlantı hatası: {e}")
+            return False
+
+    def kapat(self):
+        self._kapali = True
+        while True:
+            try:
+                baglanti, _ = self._bosta.get_nowait()
+            except queue.Empty:
+                return
+            self._at(baglanti)
+
+    def istatistik(self):
+        return {
+            'boyut': self.boyut,
+            'bosta': self._bosta.qsize(),
+            'acilan': self.acilan,
+            'yeniden_baglanma': self.yeniden_baglanma,
+            'atilan': self.atilan,
+            'ardisik_hata': self._ardisik_hata,
+        }
+
+
+# Sunucuya ulaşılamadı / bağlantı koptu (CR_CONNECTION_ERROR, CR_CONN_HOST_ERROR,
+# CR_SERVER_GONE_ERROR, CR_SERVER_LOST, CR_SERVER_LOST_EXTENDED)
+MYSQL_KOPMA_KODLARI = frozenset({2002, 2003, 2006, 2013, 2055})
+
+# SQLite'ta kopma yoktur; yalnızca dosyanın açılamaması ya da G/Ç hatası bağlantıyı geçersiz kılar
+SQLITE_KOPMA_MESAJLARI = ("unable to open database file", "disk i/o error", "closed database")
+
+
+def mysql_havuzu(boyut=None, kurulum=None):
+    """Ortam değişkenlerindeki MySQL ayarlarıyla havuz oluşturur"""
+    import mysql.connector
+    from mysql.connector import errors
+
+    def kopma_mi(hata):
+        return isinstance(hata, errors.InterfaceError) or hata.errno in MYSQL_KOPMA_KODLARI
+
+    def fabrika():
+        return mysql.connector.connect(
+            host=os.getenv("MYSQL_HOST", "127.0.0.1"),
+            port=int(os.getenv("MYSQL_PORT", "3306")),
+            user=os.getenv("MYSQL_USER", "root"),
+            password=os.getenv("MYSQL_PASSWORD", "4340"),
+            database=os.getenv("MYSQL_DATABASE", "borsa"),
+            connection_timeout=int(os.getenv("MYSQL_TIMEOUT", "5")),
+        )
+
+    return BaglantiHavuzu(
+        fabrika,
+        boyut=boyut or int(os.getenv("MYSQL_HAVUZ_BOYUTU", "5")),
+        kurulum=kurulum,
+        baglanti_hatalari=(errors.OperationalError, errors.InterfaceError),
+        kopma_kontrolu=kopma_mi,
+        paramstyle="format",
+    )
+
+
+def sqlite_havuzu(yol, boyut=5, kurulum=None):
+    """Gömülü SQLite dosyası için havuz; testlerde sunucusuz arka uç olarak kullanılır"""
+    def fabrika():
+        baglanti = sqlite3.connect(yol, timeout=30, check_same_thread=False)
+        baglanti.execute("PRAGMA journal_mode=WAL")  # okuyucular yazıcıyı beklemez
+        return baglanti
+
+    def kopma_mi(hata):
+        mesaj = str(hata).lower()
+        return any(parca in mesaj for parca in SQLITE_KOPMA_MESAJLARI)
+
+    return BaglantiHavuzu(
+        fabrika,
+        boyut=boyut,
+        kurulum=kurulum,
+        baglanti_hatalari=(sqlite3.OperationalError, sqlite3.ProgrammingError),
+        kopma_kontrolu=kopma_mi,
+        paramstyle="qmark",
+    )
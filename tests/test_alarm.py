@@ -0,0 +1,72 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.bench_alarm import kurallar_uret, tarayarak, ticklar_uret
+from borsa_alarm import TUM_SEMBOLLER, AlarmMotoru, KuralHatasi, kural_ayristir
+
+BAS = datetime(2026, 10, 16, 10, 0)
+
+
+def _tick(sembol, fiyat, saniye=0, degisim=0.0):
+    return {'sembol': sembol, 'zaman': BAS + timedelta(seconds=saniye), 'fiyat': fiyat,
+            'değişim': degisim, 'hacim': None}
+
+
+def _motor(kurallar, **kwargs):
+    motor = AlarmMotoru(kurallar, **kwargs)
+    alarmlar = []
+    motor.abone_ol(alarmlar.append)
+    return motor, alarmlar
+
+
+def test_kural_ayristirma():
+    kural = kural_ayristir("thyao.is crosses above 300")
+    assert (kural.sembol, kural.alan, kural.op, kural.esik, kural.kesisim) == ("THYAO.IS", "fiyat", ">", 300.0, True)
+    kural = kural_ayristir("change_percent < -3,5")
+    assert (kural.sembol, kural.alan, kural.esik) == (TUM_SEMBOLLER, "degisim", -3.5)
+    assert kural_ayristir("RSI > 70").alan == "RSI(14)"
+    # Yazımı farklı aynı kural aynı kimliği alır
+    assert kural_ayristir("THYAO.IS price crosses above 300").id == kural_ayristir("THYAO.IS yukarı keser 300").id
+    for hatali in ("THYAO.IS", "THYAO.IS foo > 3", "A B C > 1"):
+        with pytest.raises(KuralHatasi):
+            kural_ayristir(hatali)
+
+
+def test_kenar_tetikleme_yalnizca_yeni_saglanan_kurallar():
+    motor, alarmlar = _motor(["A > 10", "A >= 12", "A crosses below 9"], tekrar_suresi=0)
+    motor(_tick("A", 11))            # ilk gözlem: seviye kuralı tetiklenir, kesişim tetiklenmez
+    motor(_tick("A", 11.5, 1))       # hâlâ > 10: yeniden tetiklenmez
+    motor(_tick("A", 12, 2))         # >= 12 sınırda tetiklenir
+    motor(_tick("A", 8, 3))          # aşağı keser 9
+    motor(_tick("A", 10.5, 4))       # > 10 yeniden sağlanır
+    assert [(a['esik'], a['deger']) for a in alarmlar] == [(10, 11), (12, 12), (9, 8), (10, 10.5)]
+
+
+def test_tekrar_suresi_icinde_bastirilir():
+    motor, alarmlar = _motor(["A > 10"], tekrar_suresi=60)
+    for saniye, fiyat in ((0, 11), (10, 9), (20, 11), (90, 9), (100, 11)):
+        motor(_tick("A", fiyat, saniye))
+    assert [a['zaman'] for a in alarmlar] == [BAS, BAS + timedelta(seconds=100)]
+    assert motor.istatistik()['bastirilan'] == 1
+
+
+def test_ekle_cikar_ve_tekillestirme():
+    motor, alarmlar = _motor([], tekrar_suresi=0)
+    kural = motor.ekle("A > 10")
+    assert motor.ekle("A price > 10") is kural
+    assert len(motor.kurallar()) == 1
+    assert motor.cikar(kural.id) and not motor.cikar(kural.id)
+    motor(_tick("A", 11))
+    assert alarmlar == []
+
+
+def test_indeksli_motor_tarama_ile_ayni_sayida_tetikler():
+    rng = random.Random(5)
+    semboller = [f"S{i}.IS" for i in range(5)]
+    motor = AlarmMotoru(kurallar_uret(rng, 300, semboller), tekrar_suresi=0)
+    ticklar = list(ticklar_uret(rng, 2000, semboller))
+    for tick in ticklar:
+        motor(tick)
+    assert motor.istatistik()['tetik'] == tarayarak(motor.kurallar(), ticklar)
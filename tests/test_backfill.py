@@ -0,0 +1,103 @@
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from borsa_backfill import GecmisDoldurucu, JetonKovasi, normallestir, pencereler, sembolleri_oku
+
+SIMDI = datetime(2026, 10, 16)
+
+
+class _Saat:
+    def __init__(self):
+        self.simdi = 0.0
+
+    def __call__(self):
+        return self.simdi
+
+
+class _Saglayici:
+    def __init__(self, hatali=()):
+        self.istekler = []
+        self.hatali = set(hatali)
+
+    def history(self, sembol, period=None, start=None, end=None, interval="1d"):
+        self.istekler.append((sembol, start, end))
+        if sembol in self.hatali:
+            raise RuntimeError("sağlayıcı hatası")
+        index = pd.date_range(start, end, freq="D", inclusive="left", tz="Europe/Istanbul")
+        return pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 10.0}, index=index)
+
+
+class _Depo:
+    def __init__(self):
+        self.yazimlar = []
+
+    def fiyat_kaydet(self, sembol, df):
+        self.yazimlar.append((sembol, df))
+        return len(df)
+
+
+def _doldurucu(saglayici, depo, kontrol_noktasi, **kwargs):
+    return GecmisDoldurucu(saglayici, depo, isci=2, hiz=0, kontrol_noktasi=kontrol_noktasi,
+                           baslangic=SIMDI - timedelta(days=800), saat=lambda: SIMDI, **kwargs)
+
+
+def test_pencereler_geri_sinira_kirpilir():
+    gunluk = list(pencereler("1d", SIMDI - timedelta(days=800), SIMDI))
+    assert [son - bas for bas, son in gunluk] == [timedelta(days=366), timedelta(days=366), timedelta(days=68)]
+    dakikalik = list(pencereler("1m", datetime(2000, 1, 1), SIMDI))
+    assert dakikalik[0][0] == SIMDI - timedelta(days=29)
+    assert dakikalik[-1][1] == SIMDI
+
+
+def test_jeton_kovasi_hizi_sinirlar():
+    saat = _Saat()
+    kova = JetonKovasi(2, saat=saat)
+    assert kova.al() and kova.al()
+    saat.simdi = 0.5
+    assert kova.al()
+    assert kova.bekleme == 0.0
+    # Jeton bitti: yarım saniye beklenmesi gerekir, durdurulan bekleme False döner
+    durdur = threading.Event()
+    durdur.set()
+    assert kova.al(durdur) is False
+    assert kova.bekleme == 0.5
+
+
+def test_normallestir_bos_bar_ve_yinelenenleri_atar():
+    index = pd.DatetimeIndex(["2026-10-15", "2026-10-16", "2026-10-16"], tz="Europe/Istanbul")
+    df = pd.DataFrame({"Open": [None, 1.0, 2.0], "Close": [None, 1.0, 2.0], "Volume": [5.0, 1.0, 2.0]}, index=index)
+    sonuc = normallestir(df)
+    assert sonuc.index.tz is None
+    assert sonuc["Close"].tolist() == [2.0]
+
+
+def test_kontrol_noktasindan_devam_eder(tmp_path):
+    kontrol = str(tmp_path / "kontrol.json")
+    ilk = _doldurucu(_Saglayici(), _Depo(), kontrol)
+    sonuc = ilk.calistir(["A", "B"])
+    assert (sonuc['birim'], sonuc['pencere'], sonuc['devam']) == (2, 6, 0)
+    assert sonuc['satir'] == 1600
+
+    saglayici, depo = _Saglayici(), _Depo()
+    ikinci = _doldurucu(saglayici, depo, kontrol).calistir(["A", "B"])
+    # Yalnızca son günün örtüşmesi yeniden çekilir
+    assert ikinci['devam'] == 2
+    assert sorted(saglayici.istekler) == [("A", SIMDI - timedelta(days=1), SIMDI),
+                                          ("B", SIMDI - timedelta(days=1), SIMDI)]
+
+
+def test_hatali_sembol_digerlerini_durdurmaz(tmp_path):
+    depo = _Depo()
+    doldurucu = _doldurucu(_Saglayici(hatali={"B"}), depo, str(tmp_path / "kontrol.json"), deneme=1)
+    sonuc = doldurucu.calistir(iter(["A", "B", "C"]))
+    assert (sonuc['birim'], sonuc['hata']) == (2, 1)
+    assert set(doldurucu.hatalar) == {("B", "1d")}
+    assert {sembol for sembol, _ in depo.yazimlar} == {"A", "C"}
+
+
+def test_sembol_dosyasi(tmp_path):
+    dosya = tmp_path / "semboller.txt"
+    dosya.write_text("# BIST\nTHYAO.IS\n\nGARAN.IS,1h  # yorum\n", encoding="utf-8")
+    assert list(sembolleri_oku(str(dosya))) == ["THYAO.IS", "GARAN.IS"]
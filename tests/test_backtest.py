@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from borsa_backtest import (
+    GeriTestMotoru, GostergeOnbellegi, getirileri_hesapla, islemleri_cikar, parametre_araliklari,
+    parametre_izgarasi,
+)
+
+M = 0.01
+
+
+def test_getiriler_maliyeti_degisim_gunu_duser():
+    kapanis = np.array([[10.0, 5.0], [11.0, np.nan], [12.1, 5.0], [12.1, 5.5], [11.0, 5.5]])
+    pozisyon = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0], [0.0, 1.0], [0.0, 1.0]])
+    net, portfoy = getirileri_hesapla(kapanis, pozisyon, maliyet=M)
+    # Giriş t=0'da, çıkış t=2'de; her geçişte bir kez `maliyet` düşülür
+    assert net[:, 0] == pytest.approx([0.1 - M, 0.1, -M, 0.0])
+    # Fiyatı olmayan günlerin getirisi NaN; portföy yalnız geçerli sembollerin ortalaması
+    assert np.isnan(net[0, 1]) and np.isnan(net[1, 1])
+    assert net[2:, 1] == pytest.approx([0.1 - M, 0.0])
+    assert portfoy == pytest.approx([0.1 - M, 0.1, (-M + 0.1 - M) / 2, 0.0])
+
+
+def test_islemler_giris_cikis_maliyeti():
+    tarihler = pd.date_range("2026-10-01", periods=5).to_numpy()
+    kapanis = np.array([[10.0, 5.0], [11.0, 5.0], [12.1, 5.0], [12.1, 5.5], [11.0, 5.5]])
+    pozisyon = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0], [0.0, 1.0], [0.0, 1.0]])
+    islemler = islemleri_cikar(tarihler, ["A", "B"], kapanis, pozisyon, maliyet=M)
+    kapali, acik = islemler.iloc[0], islemler.iloc[1]
+    assert (kapali['sembol'], kapali['giris_fiyati'], kapali['cikis_fiyati'], kapali['bar']) == ("A", 10.0, 12.1, 2)
+    assert kapali['getiri'] == pytest.approx(1.21 * (1 - M) ** 2 - 1)
+    assert not kapali['acik']
+    # Açık işlem son kapanışla değerlenir, yalnız giriş maliyeti düşülür
+    assert (acik['sembol'], acik['cikis_fiyati'], bool(acik['acik'])) == ("B", 5.5, True)
+    assert acik['getiri'] == pytest.approx(1.1 * (1 - M) - 1)
+    assert islemleri_cikar(tarihler, ["A"], kapanis[:, :1], np.zeros((5, 1))).empty
+
+
+def test_sma_birikimli_toplamla_ayni():
+    kapanis = np.array([[1.0], [2.0], [np.nan], [4.0], [5.0], [6.0]])
+    sma = GostergeOnbellegi(kapanis).sma(2)[:, 0]
+    beklenen = pd.Series(kapanis[:, 0]).rolling(2).mean().to_numpy()
+    np.testing.assert_array_equal(np.isnan(sma), np.isnan(beklenen))
+    assert sma[~np.isnan(sma)] == pytest.approx(beklenen[~np.isnan(beklenen)])
+
+
+def test_parametre_araliklari_ve_izgara():
+    araliklar = parametre_araliklari(["hizli=5,10", "yavas=10:30:10"])
+    assert araliklar == {"hizli": [5, 10], "yavas": [10, 20, 30]}
+    # hizli >= yavas birleşimleri elenir
+    assert len(parametre_izgarasi("MA", araliklar)) == 5
+    with pytest.raises(ValueError):
+        parametre_izgarasi("MA", {"n": [14]})
+    with pytest.raises(ValueError):
+        parametre_araliklari(["hizli"])
+
+
+def test_tarama_tek_calistirma_ile_ayni():
+    index = pd.bdate_range("2025-01-01", periods=200)
+    rng = np.random.default_rng(4)
+    fiyatlar = {s: pd.DataFrame({"Close": 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 200)))}, index=index)
+                for s in ("A", "B")}
+    motor = GeriTestMotoru(fiyatlar.get, ["A", "B"], endeks=None, maliyet=M)
+    tek = motor.calistir("ma", hizli=5, yavas=20)
+    tablo = motor.tarama("MA", parametre_izgarasi("MA", {"hizli": [5], "yavas": [20, 40]}), isci=1)
+    satir = tablo[(tablo["hizli"] == 5) & (tablo["yavas"] == 20)].iloc[0]
+    assert satir["toplam_getiri"] == pytest.approx(tek['metrikler']['toplam_getiri'])
+    assert satir["islem"] == len(tek['islemler'])
@@ -0,0 +1,41 @@
+import json
+from argparse import Namespace
+
+import pytest
+
+pytest.importorskip("matplotlib")
+pytest.importorskip("pyarrow")
+
+from benchmarks.suite import calistir, karsilastir, olc  # noqa: E402
+
+
+def _yaz(yol, senaryolar):
+    yol.write_text(json.dumps({'senaryolar': senaryolar}), encoding="utf-8")
+    return str(yol)
+
+
+def test_olc_tekrar_ve_verim():
+    cagrilar = []
+    olcum = olc(lambda: cagrilar.append(1), tekrar=4, birim_sayisi=10)
+    # Bellek ölçümü ayrı bir ek turda yapılır
+    assert len(cagrilar) == 5
+    assert olcum['tekrar'] == 4 and olcum['birim'] == 10
+    assert olcum['p50_ms'] <= olcum['p99_ms']
+    assert olcum['verim_birim_sn'] > 0
+
+
+def test_karsilastir_gerilemeyi_esikle_bulur(tmp_path):
+    eski = _yaz(tmp_path / "eski.json", {"a": {'p50_ms': 10.0, 'verim_birim_sn': 100.0}})
+    ayni = _yaz(tmp_path / "ayni.json", {"a": {'p50_ms': 10.5, 'verim_birim_sn': 96.0}})
+    yavas = _yaz(tmp_path / "yavas.json", {"a": {'p50_ms': 12.0, 'verim_birim_sn': 100.0}})
+    assert karsilastir(Namespace(eski=eski, yeni=ayni, esik=0.10)) == 0
+    assert karsilastir(Namespace(eski=eski, yeni=yavas, esik=0.10)) == 1
+
+
+def test_takim_kucuk_veriyle_calisir(tmp_path):
+    cikti = tmp_path / "sonuc.json"
+    calistir(Namespace(sembol=3, bar=50, tekrar=1, gecikme=0.0, grafik=1,
+                       senaryo=["donusum", "fiyat_kaydet", "portfoy_degerleme"], cikti=str(cikti)))
+    sonuc = json.loads(cikti.read_text(encoding="utf-8"))
+    assert set(sonuc['senaryolar']) == {"donusum", "fiyat_kaydet", "portfoy_degerleme"}
+    assert sonuc['senaryolar']['donusum']['birim'] == 150
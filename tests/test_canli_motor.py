@@ -0,0 +1,87 @@
+from borsa_canli_motor import CanliTakipMotoru, izleme_listesi_oku
+
+
+class _Saat:
+    def __init__(self):
+        self.simdi = 0.0
+
+    def __call__(self):
+        return self.simdi
+
+
+class _Saglayici:
+    def __init__(self, hatali=()):
+        self.istekler = []
+        self.hatali = set(hatali)
+
+    def __call__(self, semboller):
+        self.istekler.append(sorted(semboller))
+        sonuclar = {s: {"regularMarketPrice": 10.0, "regularMarketVolume": 5} for s in semboller if s not in self.hatali}
+        return sonuclar, {s: LookupError(s) for s in semboller if s in self.hatali}
+
+
+def _motor(saglayici, saat, **secenekler):
+    motor = CanliTakipMotoru(saglayici, saat=saat, **secenekler)
+    tickler = []
+    motor.abone_ol(tickler.append)
+    return motor, tickler
+
+
+def test_ayni_anda_vadesi_gelenler_tek_istekte_cekilir():
+    saat, saglayici = _Saat(), _Saglayici()
+    motor, tickler = _motor(saglayici, saat)
+    motor.ekle_liste(["A", "B", ("C", 2.0)])
+    assert motor.tur() == 2.0
+    assert saglayici.istekler == [["A", "B", "C"]]
+    saat.simdi = 2.0
+    motor.tur()
+    assert saglayici.istekler[-1] == ["C"]
+    saat.simdi = 4.0
+    motor.tur()
+    assert saglayici.istekler[-1] == ["C"]
+    saat.simdi = 5.0
+    motor.tur()
+    assert saglayici.istekler[-1] == ["A", "B"]
+    assert [t["sembol"] for t in tickler] == ["A", "B", "C", "C", "C", "A", "B"]
+    assert tickler[0]["hacim"] == 5
+
+
+def test_hatali_sembol_tick_uretmez_digerlerini_etkilemez():
+    saat, saglayici = _Saat(), _Saglayici(hatali={"B"})
+    motor, tickler = _motor(saglayici, saat)
+    motor.ekle_liste(["A", "B"])
+    motor.tur()
+    assert [t["sembol"] for t in tickler] == ["A"]
+    assert motor.istatistik()["hata"] == 1
+
+
+def test_cikarilip_yeniden_eklenen_sembol_bir_kez_planlanir():
+    saat, saglayici = _Saat(), _Saglayici()
+    motor, _ = _motor(saglayici, saat, varsayilan_aralik=1.0)
+    motor.ekle("A")
+    motor.tur()
+    motor.cikar("A")
+    motor.ekle("A")
+    for adim in range(1, 11):
+        saat.simdi = float(adim)
+        motor.tur()
+    # Eski plan girdisi atlanır; saniyede bir istek, iki kat değil
+    assert len(saglayici.istekler) == 11
+    assert len(motor._plan) == 1
+
+
+def test_geride_kalinca_birikmis_turlar_calistirilmaz():
+    saat, saglayici = _Saat(), _Saglayici()
+    motor, _ = _motor(saglayici, saat, varsayilan_aralik=1.0)
+    motor.ekle("A")
+    motor.tur()
+    saat.simdi = 30.0
+    motor.tur()
+    assert motor.tur() == 1.0
+    assert len(saglayici.istekler) == 2
+
+
+def test_izleme_listesi_okunur(tmp_path):
+    dosya = tmp_path / "liste.txt"
+    dosya.write_text("# yorum\nTHYAO.IS\nGARAN.IS, 2.5  # hızlı\n\n", encoding="utf-8")
+    assert izleme_listesi_oku(str(dosya), varsayilan_aralik=5.0) == [("THYAO.IS", 5.0), ("GARAN.IS", 2.5)]
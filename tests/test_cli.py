@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from borsa_takip_projesi_database_ile import _arguman_ayristirici, _portfoy_ayristir
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _ortam(tmp_path):
+    ortam = dict(os.environ)
+    ortam.update({
+        "BORSA_SAGLAYICI": "sentetik",
+        "BORSA_DEPO": "yok",
+        "BORSA_ONBELLEK": str(tmp_path / "bilgi_onbellegi.json"),
+        "PYTHONPATH": KOK + os.pathsep + ortam.get("PYTHONPATH", ""),
+    })
+    return ortam
+
+
+def test_ice_aktarma_agir_modulleri_yuklemez(tmp_path):
+    kod = ("import sys, borsa_takip_projesi_database_ile; "
+           "print([m for m in ('pandas', 'numpy', 'matplotlib', 'yfinance', 'mysql') if m in sys.modules])")
+    sonuc = subprocess.run([sys.executable, "-c", kod], cwd=KOK, env=_ortam(tmp_path),
+                           capture_output=True, text=True, check=True)
+    assert sonuc.stdout.strip() == "[]"
+
+
+def test_quote_json_ve_onbellek(tmp_path):
+    komut = [sys.executable, os.path.join(KOK, "borsa_takip_projesi_database_ile.py"), "quote", "A.IS", "B.IS", "--json"]
+    sonuc = subprocess.run(komut, cwd=KOK, env=_ortam(tmp_path), capture_output=True, text=True, check=True)
+    veri = json.loads(sonuc.stdout)
+    assert set(veri) == {"A.IS", "B.IS"}
+    assert veri["A.IS"]["fiyat"] > 0
+    # Çıkışta yazılan önbellek ikinci çağrıyı aynı yanıtla karşılar
+    assert (tmp_path / "bilgi_onbellegi.json").exists()
+    ikinci = subprocess.run(komut, cwd=KOK, env=_ortam(tmp_path), capture_output=True, text=True, check=True)
+    assert json.loads(ikinci.stdout) == veri
+
+
+def test_ayristirici_ve_portfoy_girisi(capsys):
+    args = _arguman_ayristirici().parse_args(["backtest", "THYAO.IS", "--strateji", "rsi", "--param", "donem=14"])
+    assert args.strateji == "RSI" and args.param == ["donem=14"]
+    assert _arguman_ayristirici().parse_args([]).komut is None
+    with pytest.raises(SystemExit):
+        _arguman_ayristirici().parse_args(["quote"])
+    assert _portfoy_ayristir("A.IS:10, B.IS : 5,bozuk") == [("A.IS", 10), ("B.IS", 5)]
+    assert "bozuk" in capsys.readouterr().out
@@ -0,0 +1,52 @@
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from borsa_depolama import BosDepo, GomuluDepo, depo_olustur
+
+
+def test_bilinmeyen_depo_turu():
+    with pytest.raises(ValueError, match="Bilinmeyen depo türü"):
+        depo_olustur("redis")
+
+
+def test_gomulu_depo_pyarrow_yoksa_acikca_reddedilir(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)  # import pyarrow ImportError verir
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        depo_olustur("gomulu")
+
+
+def test_bos_depo_bos_sonuclar_doner():
+    depo = depo_olustur("yok")
+    assert isinstance(depo, BosDepo)
+    assert depo.fiyat_araligi("X") == (None, None)
+    assert depo.fiyat_oku("X").empty
+    assert depo.semboller_oku().empty
+
+
+def test_gomulu_depo_meta_ve_durum(tmp_path):
+    depo = GomuluDepo(kok=str(tmp_path))
+    depo.sembol_kaydet("X", {"longName": "X A.Ş.", "sector": "Banka", "marketCap": 10})
+    depo.sembol_kaydet("X", {"longName": "X Holding", "sector": "Banka", "marketCap": 12})
+    semboller = depo.semboller_oku()
+    assert semboller.loc["X", "name"] == "X Holding"
+    assert depo.durum_oku("is") is None
+    depo.durum_yaz("is", 42)
+    assert depo.durum_oku("is") == "42"
+    depo.kapat()
+
+
+def test_gomulu_depo_fiyatlari_yil_dosyalarina_yazar(tmp_path):
+    pytest.importorskip("pyarrow")
+    depo = GomuluDepo(kok=str(tmp_path))
+    index = pd.date_range("2024-12-30", periods=4, freq="D", tz="Europe/Istanbul")
+    df = pd.DataFrame({"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": [1.0, 2.0, 3.0, 4.0],
+                       "Volume": 100.0}, index=index)
+    depo.fiyat_kaydet("X", df)
+    depo.fiyat_kaydet("X", df.iloc[-1:] * 2)  # aynı zaman damgası güncellenir
+    assert sorted(p.name for p in (tmp_path / "prices" / "symbol=X").iterdir()) == ["2024.parquet", "2025.parquet"]
+    okunan = depo.fiyat_oku("X", start=datetime(2025, 1, 1), sutunlar=["Close"])
+    assert okunan["Close"].tolist() == [3.0, 8.0]
+    depo.kapat()
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from borsa_donusum import bar_kayitlari, fiyat_kayitlari, parcala
+
+
+def test_fiyat_kayitlari_saat_dilimini_atar_nan_yerine_none_yazar():
+    index = pd.DatetimeIndex(["2026-10-15 00:00", "2026-10-16 00:00"], tz="Europe/Istanbul")
+    df = pd.DataFrame({"Open": [1.0, 2.0], "High": [1.5, 2.5], "Low": [0.5, 1.5],
+                       "Close": [1.2, np.nan], "Volume": [100, 200]}, index=index)
+    kayitlar = list(fiyat_kayitlari("X", df))
+    assert kayitlar == [
+        ("X", datetime(2026, 10, 15), 1.0, 1.5, 0.5, 1.2, 100.0),
+        ("X", datetime(2026, 10, 16), 2.0, 2.5, 1.5, None, 200.0),
+    ]
+    assert all(type(deger) is float for deger in kayitlar[0][2:])
+
+
+def test_eksik_sutun_null_yazilir():
+    df = pd.DataFrame({"Close": [1.0]}, index=pd.DatetimeIndex(["2026-10-16 10:01"]))
+    assert list(bar_kayitlari("X", "1m", df)) == [
+        ("X", "1m", datetime(2026, 10, 16, 10, 1), None, None, None, 1.0, None, None),
+    ]
+
+
+def test_parcala_sinirli_listeler_verir():
+    assert [len(p) for p in parcala(range(12), boyut=5)] == [5, 5, 2]
+    assert list(parcala([], boyut=5)) == []
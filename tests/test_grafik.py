@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from borsa_grafik import grafik_imzasi, lttb, seyreltme_konumlari  # noqa: E402
+
+
+def _fiyatlar(n=300):
+    index = pd.date_range("2025-01-01", periods=n, freq="D")
+    kapanis = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, n))
+    return pd.DataFrame({"Open": kapanis, "High": kapanis + 1, "Low": kapanis - 1,
+                         "Close": kapanis, "Volume": 1000.0}, index=index)
+
+
+def test_lttb_uc_noktalari_korur():
+    y = np.sin(np.linspace(0, 20, 5000))
+    konumlar = lttb(np.arange(len(y)), y, 200)
+    assert len(konumlar) == 200
+    assert konumlar[0] == 0 and konumlar[-1] == len(y) - 1
+    assert np.all(np.diff(konumlar) > 0)
+
+
+def test_kisa_seri_seyreltilmez():
+    assert seyreltme_konumlari(_fiyatlar(100), max_nokta=200) is None
+    assert len(seyreltme_konumlari(_fiyatlar(300), max_nokta=200)) == 200
+
+
+def test_gun_ici_tazeleme_imzayi_degistirir():
+    data = _fiyatlar()
+    onceki = grafik_imzasi("X", "1y", data, [], "png", 2000)
+    tazelenmis = data.copy()
+    tazelenmis.iloc[-1, tazelenmis.columns.get_loc("Close")] += 1.0
+    assert grafik_imzasi("X", "1y", data.copy(), [], "png", 2000) == onceki
+    assert grafik_imzasi("X", "1y", tazelenmis, [], "png", 2000) != onceki
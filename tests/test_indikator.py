@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from borsa_indikator import CanliIndikatorler, bollinger, rsi, sma
+
+
+def _kapanislar(n=120, tohum=0):
+    rng = np.random.default_rng(tohum)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+
+def _tick(sembol, fiyat, zaman):
+    return {'sembol': sembol, 'fiyat': fiyat, 'zaman': zaman}
+
+
+def test_gun_ici_tickler_acik_bari_gunceller():
+    kapanis = _kapanislar()
+    gun = datetime(2026, 10, 16, 10, 0)
+    canli = CanliIndikatorler([("RSI", {"n": 14})])
+    canli.isit("X", kapanis, son_bar=gun)
+
+    rng = np.random.default_rng(1)
+    fiyat = kapanis[-1]
+    for i in range(20):
+        fiyat *= 1 + rng.normal(0, 0.003)
+        canli(_tick("X", fiyat, gun + timedelta(seconds=5 * i)))
+
+    beklenen = rsi(pd.Series(np.append(kapanis[:-1], fiyat)), 14).iloc[-1]
+    assert canli.deger("X", "RSI", n=14) == pytest.approx(beklenen)
+
+
+def test_gun_degisince_acik_bar_kapanir():
+    kapanis = _kapanislar()
+    gun = datetime(2026, 10, 16, 17, 0)
+    canli = CanliIndikatorler([("SMA", {"n": 20}), ("BB", {"n": 20})])
+    canli.isit("X", kapanis, son_bar=gun)
+    canli(_tick("X", 90.0, gun + timedelta(minutes=5)))
+    canli(_tick("X", 95.0, gun + timedelta(days=1)))
+
+    seri = pd.Series(np.append(kapanis[:-1], [90.0, 95.0]))
+    assert canli.deger("X", "SMA", n=20) == pytest.approx(sma(seri, 20).iloc[-1])
+    assert canli.deger("X", "BB", n=20)["ust"] == pytest.approx(bollinger(seri, 20).iloc[-1]["ust"])
+
+
+def test_son_bar_verilmezse_kapanislar_tamamlanmis_sayilir():
+    kapanis = _kapanislar()
+    canli = CanliIndikatorler([("RSI", {"n": 14})])
+    canli.isit("X", kapanis)
+    canli(_tick("X", 101.0, datetime(2026, 10, 16, 10, 0)))
+
+    beklenen = rsi(pd.Series(np.append(kapanis, 101.0)), 14).iloc[-1]
+    assert canli.deger("X", "RSI", n=14) == pytest.approx(beklenen)
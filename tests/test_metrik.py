@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from borsa_metrik import Metrikler, metrikler
+
+
+def _hatalar(m):
+    satirlar = [json.loads(s) for s in m.json_satirlari().splitlines()]
+    return {(s["islem"], s["sembol"]): s["adet"] for s in satirlar if s["tur"] == "hata"}
+
+
+def test_kapaliyken_hatalar_sayilir():
+    m = Metrikler(acik=False)
+    with pytest.raises(ValueError):
+        with m.zamanla("saglayici.info", "X"):
+            raise ValueError("yok")
+    assert _hatalar(m) == {("saglayici.info", "X"): 1}
+
+
+def test_ayni_hata_ayni_anahtarla_bir_kez_sayilir():
+    m = Metrikler(acik=True)
+    try:
+        with m.zamanla("db.fiyat_kaydet", "X"):
+            raise OSError("kopuk")
+    except OSError as e:
+        m.hata("db.fiyat_kaydet", "X", e)
+    assert _hatalar(m) == {("db.fiyat_kaydet", "X"): 1}
+
+
+@pytest.fixture
+def acik_metrikler():
+    onceki = metrikler.acik
+    metrikler.acik = True
+    metrikler.sifirla()
+    yield metrikler
+    metrikler.acik = onceki
+    metrikler.sifirla()
+
+
+def test_yazilamayan_tick_partisi_bir_kez_sayilir(tmp_path, acik_metrikler):
+    from borsa_depolama import BosDepo
+    from borsa_takip_projesi_database_ile import BorsaUygulamasi
+
+    class KopukDepo(BosDepo):
+        def tickleri_kaydet(self, records):
+            raise ConnectionError("depo kapalı")
+
+    uygulama = BorsaUygulamasi(saglayici=object(), depo=KopukDepo(),
+                               onbellek_dosyasi=str(tmp_path / "onbellek.json"),
+                               tasma_dosyasi=str(tmp_path / "tasma.jsonl"))
+    uygulama.tick_yazici.ekle("X", 1.0, 0.0)
+    uygulama.tick_yazici.kapat()
+    assert _hatalar(acik_metrikler) == {("tick_yazici.parti", None): 1}
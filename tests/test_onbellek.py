@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+from borsa_onbellek import BilgiOnbellegi, TTLOnbellek
+
+
+class _Saat:
+    def __init__(self):
+        self.simdi = 0.0
+
+    def __call__(self):
+        return self.simdi
+
+
+def test_sure_dolunca_girdi_duser():
+    saat = _Saat()
+    onbellek = TTLOnbellek(varsayilan_ttl=10, saat=saat)
+    onbellek.koy("a", 1)
+    saat.simdi = 9.9
+    assert onbellek.al("a") == (True, 1)
+    saat.simdi = 10.0
+    assert onbellek.al("a") == (False, None)
+    assert len(onbellek) == 0
+
+
+def test_lru_en_az_kullanilani_tahliye_eder():
+    onbellek = TTLOnbellek(max_boyut=2, varsayilan_ttl=60)
+    onbellek.koy("a", 1)
+    onbellek.koy("b", 2)
+    onbellek.al("a")
+    onbellek.koy("c", 3)
+    assert onbellek.al("b") == (False, None)
+    assert onbellek.al("a") == (True, 1)
+    assert onbellek.istatistik()["tahliye"] == 1
+
+
+def test_eszamanli_getir_tek_yukleme_yapar():
+    onbellek = TTLOnbellek(varsayilan_ttl=60)
+    cagri = []
+    baslangic = threading.Barrier(8)
+
+    def yukleyici(anahtar):
+        cagri.append(anahtar)
+        time.sleep(0.1)
+        return anahtar.upper()
+
+    sonuclar = []
+
+    def iste():
+        baslangic.wait()
+        sonuclar.append(onbellek.getir("x", yukleyici))
+
+    isler = [threading.Thread(target=iste) for _ in range(8)]
+    for t in isler:
+        t.start()
+    for t in isler:
+        t.join()
+    assert cagri == ["x"]
+    assert sonuclar == ["X"] * 8
+    assert onbellek.istatistik()["birlesen"] == 7
+
+
+def test_yukleme_hatasi_onbelleklenmez():
+    onbellek = TTLOnbellek(varsayilan_ttl=60)
+
+    def bozuk(anahtar):
+        raise LookupError(anahtar)
+
+    with pytest.raises(LookupError):
+        onbellek.getir("x", bozuk)
+    assert onbellek.getir("x", str.upper) == "X"
+
+
+def _info(sembol):
+    return {"longName": sembol, "sector": "Banka", "regularMarketPrice": 10.0}
+
+
+def test_bilgi_tek_saglayici_cagrisiyla_meta_ve_fiyat_doner():
+    onbellek = BilgiOnbellegi(_info)
+    bilgi = onbellek.bilgi("X")
+    assert bilgi["longName"] == "X" and bilgi["regularMarketPrice"] == 10.0
+    onbellek.bilgi("X")
+    onbellek.fiyat_bilgisi("X")
+    assert onbellek.saglayici_cagrisi == 1
+    onbellek.fiyat_bilgisi("X", taze=True)
+    assert onbellek.saglayici_cagrisi == 2
+
+
+def test_diske_kaydedilen_gecerli_girdiler_geri_yuklenir(tmp_path):
+    yol = str(tmp_path / "onbellek.json")
+    ilk = BilgiOnbellegi(_info)
+    ilk.bilgi("X")
+    ilk.kaydet(yol)
+
+    ikinci = BilgiOnbellegi(_info)
+    assert ikinci.yukle(yol) == 2
+    assert ikinci.bilgi("X")["longName"] == "X"
+    assert ikinci.saglayici_cagrisi == 0
+
+
+def test_sembol_yazilamazsa_sonraki_cagri_yeniden_dener(tmp_path):
+    from borsa_depolama import BosDepo
+    from borsa_takip_projesi_database_ile import BorsaUygulamasi
+
+    class Depo(BosDepo):
+        def __init__(self):
+            self.yazilan = []
+            self.hata = True
+
+        def kullanilabilir(self):
+            return True
+
+        def sembol_kaydet(self, symbol_code, info_dict):
+            if self.hata:
+                self.hata = False
+                raise ConnectionError("depo kapalı")
+            self.yazilan.append(symbol_code)
+
+    class Saglayici:
+        def info(self, sembol):
+            return _info(sembol)
+
+    depo = Depo()
+    uygulama = BorsaUygulamasi(saglayici=Saglayici(), depo=depo,
+                               onbellek_dosyasi=str(tmp_path / "onbellek.json"))
+    for _ in range(3):
+        assert uygulama.hisse_bilgileri("X")["fiyat"] == 10.0
+    assert depo.yazilan == ["X"]
+    assert uygulama.onbellek.saglayici_cagrisi == 1
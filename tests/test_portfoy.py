@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from borsa_portfoy import PortfoyMotoru, fiyat_paneli, maksimum_dusus, portfoy_metrikleri
+
+
+def _okuyucu(kapanislar):
+    def oku(sembol):
+        seri = kapanislar.get(sembol)
+        if seri is None:
+            return None
+        return pd.DataFrame({"Close": seri}, index=pd.date_range("2026-10-01", periods=len(seri)))
+    return oku
+
+
+def test_maksimum_dusus_zirveden_olculur():
+    # 1.0 → 1.1 → 0.88 → 0.968: zirve 1.1, dip 0.88
+    assert maksimum_dusus(np.array([0.1, -0.2, 0.1])) == pytest.approx(-0.2)
+    assert maksimum_dusus(np.array([])) == 0.0
+
+
+def test_metrikler_ve_beta():
+    getiriler = pd.Series([0.01, -0.02, 0.03, 0.0])
+    metrikler = portfoy_metrikleri(getiriler, getiriler * 2)
+    assert metrikler['toplam_getiri'] == pytest.approx(1.01 * 0.98 * 1.03 - 1)
+    assert metrikler['gun'] == 4
+    assert metrikler['beta'] == pytest.approx(0.5)
+    assert metrikler['endeks_korelasyonu'] == pytest.approx(1.0)
+    assert portfoy_metrikleri(pd.Series([], dtype=float)) == {}
+
+
+def test_panel_eksik_sembolu_atlar_ve_ileri_doldurur():
+    panel = fiyat_paneli(_okuyucu({"A": [1.0, np.nan, 3.0]}), ["A", "A", "YOK"])
+    assert list(panel.columns) == ["A"]
+    assert panel["A"].tolist() == [1.0, 1.0, 3.0]
+
+
+def test_alis_tarihinden_once_pozisyon_sayilmaz():
+    motor = PortfoyMotoru(_okuyucu({"A": [10.0, 11.0, 12.0, 12.0], "B": [5.0, 5.0, 10.0, 10.0]}), endeks="YOK")
+    sonuc = motor.analiz([("A", 2), ("B", 4, "2026-10-03")])
+    assert sonuc["deger_serisi"].tolist() == [20.0, 22.0, 64.0, 64.0]
+    # B'nin alış günü getirisi portföye yansımaz; yalnız A'nın %9.09'u sayılır
+    assert sonuc["getiri_serisi"].tolist() == pytest.approx([0.1, 1 / 11, 0.0])
+    assert "beta" not in sonuc["metrikler"]
+
+
+def test_fiyat_yoksa_none():
+    assert PortfoyMotoru(_okuyucu({})).analiz([("A", 1)]) is None
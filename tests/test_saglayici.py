@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from borsa_saglayici import (
+    KaydedenSaglayici, SaglayiciHatasi, TekrarSaglayici, YFinanceSaglayici, saglayici_olustur,
+)
+
+
+class _Kaynak:
+    def __init__(self):
+        self.sira = 0
+
+    def info(self, sembol):
+        self.sira += 1
+        return {"symbol": sembol, "regularMarketPrice": 10.0 + self.sira}
+
+    def history(self, sembol, period=None, start=None, end=None, interval="1d"):
+        index = pd.date_range("2026-09-01", periods=30, tz="Europe/Istanbul")
+        return pd.DataFrame({"Close": [float(i) for i in range(30)]}, index=index)
+
+
+def _hata_dizisi(saglayici, n=50):
+    sonuc = []
+    for _ in range(n):
+        try:
+            saglayici.info("A")
+            sonuc.append(True)
+        except SaglayiciHatasi:
+            sonuc.append(False)
+    return sonuc
+
+
+def test_ayni_tohum_ayni_hata_dizisi():
+    a = _hata_dizisi(TekrarSaglayici(hata_orani=0.3, tohum=7))
+    b = _hata_dizisi(TekrarSaglayici(hata_orani=0.3, tohum=7))
+    assert a == b
+    assert 0 < a.count(False) < len(a)
+    assert a != _hata_dizisi(TekrarSaglayici(hata_orani=0.3, tohum=8))
+
+
+def test_sentetik_veri_sembolden_turetilir():
+    a, b = TekrarSaglayici(tohum=1), TekrarSaglayici(tohum=2)
+    assert a.info("THYAO.IS") == b.info("THYAO.IS")
+    assert a.info("THYAO.IS") != a.info("GARAN.IS")
+    pd.testing.assert_frame_equal(a.history("X", period="1mo"), b.history("X", period="1mo"))
+    dakikalik = a.history("X", period="1d", interval="5m")
+    assert (dakikalik.index[1] - dakikalik.index[0]) == pd.Timedelta(minutes=5)
+
+
+def test_kayit_tekrar_oynatilir(tmp_path):
+    kaydeden = KaydedenSaglayici(_Kaynak(), str(tmp_path))
+    kaydeden.info("A")
+    kaydeden.info("A")
+    kayitli = kaydeden.history("A", period="1mo")
+
+    tekrar = TekrarSaglayici(str(tmp_path))
+    # info kayıtları sırayla, sona gelince baştan döner
+    fiyatlar = [tekrar.info("A")["regularMarketPrice"] for _ in range(3)]
+    assert fiyatlar == [11.0, 12.0, 11.0]
+    pd.testing.assert_frame_equal(tekrar.history("A", period="1mo"), kayitli)
+    # Aynı parametreli kayıt yoksa en uzun kayıt istenen aralığa kırpılır
+    assert len(tekrar.history("A", period="5d")) == 6
+    with pytest.raises(SaglayiciHatasi):
+        tekrar.info("YOK")
+
+
+def test_saglayici_olustur():
+    assert isinstance(saglayici_olustur("yfinance"), YFinanceSaglayici)
+    assert saglayici_olustur("sentetik").sentetik
+    with pytest.raises(ValueError):
+        saglayici_olustur("bilinmeyen")
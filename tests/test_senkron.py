@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from borsa_depolama import GomuluDepo  # noqa: E402
+from borsa_takip_projesi_database_ile import BorsaUygulamasi  # noqa: E402
+from borsa_takvim import period_baslangici  # noqa: E402
+
+
+class _Saglayici:
+    """Bugüne kadar her iş günü için bar üreten sahte sağlayıcı; `ilk_gun` listelenme tarihidir"""
+
+    def __init__(self, ilk_gun=None):
+        self.ilk_gun = ilk_gun
+        self.cagrilar = []
+
+    def history(self, sembol, period=None, start=None, **_):
+        self.cagrilar.append((period, start))
+        bugun = pd.Timestamp(datetime.now().date())
+        bas = pd.Timestamp(start) if start is not None else pd.Timestamp(period_baslangici(period, datetime.now()).date())
+        if self.ilk_gun is not None:
+            bas = max(bas, pd.Timestamp(self.ilk_gun))
+        gunler = pd.bdate_range(bas, bugun, tz="Europe/Istanbul", name="Date")
+        kapanis = 100 + np.arange(len(gunler), dtype=float)
+        return pd.DataFrame({"Open": kapanis, "High": kapanis + 1, "Low": kapanis - 1,
+                             "Close": kapanis, "Volume": 1000.0}, index=gunler)
+
+
+def _uygulama(tmp_path, saglayici, depo=None):
+    return BorsaUygulamasi(saglayici=saglayici, depo=depo or GomuluDepo(kok=str(tmp_path / "depo")),
+                           onbellek_dosyasi=str(tmp_path / "onbellek.json"))
+
+
+def test_ikinci_cagri_depodan_okunur(tmp_path):
+    saglayici = _Saglayici()
+    uygulama = _uygulama(tmp_path, saglayici)
+    ilk = uygulama.hisse_verisi_senkron("X", "1y")
+    ikinci = uygulama.hisse_verisi_senkron("X", "1y")
+    assert len(saglayici.cagrilar) == 1
+    assert len(ikinci) == len(ilk) > 200
+    uygulama.kapat()
+
+
+def test_daha_uzun_period_eksik_basi_tam_ceker(tmp_path):
+    saglayici = _Saglayici()
+    uygulama = _uygulama(tmp_path, saglayici)
+    uygulama.hisse_verisi_senkron("X", "1mo")
+    uzun = uygulama.hisse_verisi_senkron("X", "1y")
+    assert saglayici.cagrilar[-1] == ("1y", None)
+    assert uzun.index[0] < datetime.now() - timedelta(days=300)
+    uygulama.kapat()
+
+
+def test_yeni_listelenen_hisse_her_cagrida_yeniden_cekilmez(tmp_path):
+    saglayici = _Saglayici(ilk_gun=datetime.now().date() - timedelta(days=30))
+    uygulama = _uygulama(tmp_path, saglayici)
+    for _ in range(3):
+        df = uygulama.hisse_verisi_senkron("YENI", "1y")
+    assert len(saglayici.cagrilar) == 1
+    assert 15 <= len(df) <= 25
+    uygulama.kapat()
+
+
+def test_depoya_yazilamayan_veri_yine_doner(tmp_path):
+    class KopukDepo(GomuluDepo):
+        def fiyat_kaydet(self, symbol_code, df):
+            raise OSError("disk dolu")
+
+    saglayici = _Saglayici()
+    uygulama = _uygulama(tmp_path, saglayici, depo=KopukDepo(kok=str(tmp_path / "depo")))
+    df = uygulama.hisse_verisi_senkron("X", "1y")
+    assert len(df) > 200
+    uygulama.hisse_verisi_senkron("X", "1y")
+    assert len(saglayici.cagrilar) == 2  # yazılamadığı için sonraki çağrı yeniden dener
+    uygulama.kapat()
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from aiohttp.test_utils import TestClient, TestServer  # noqa: E402
+
+from borsa_depolama import BosDepo  # noqa: E402
+from borsa_saglayici import ServisSaglayici, TekrarSaglayici  # noqa: E402
+from borsa_servis import BorsaServisi, _abonelik_komutu  # noqa: E402
+from borsa_takip_projesi_database_ile import BorsaUygulamasi  # noqa: E402
+
+
+def test_abonelik_komutu_dogrulama():
+    assert _abonelik_komutu({"abone": [" A.IS "], "cik": []}) == [["A.IS"], []]
+    assert _abonelik_komutu({"cik": ["B.IS"]}) == [[], ["B.IS"]]
+    for hatali in (None, [], "A.IS", {"abone": "A.IS"}, {"abone": [1]}, {"cik": [" "]}):
+        assert _abonelik_komutu(hatali) == (None, None)
+
+
+def _servis(tmp_path, gecikme=0.0):
+    uygulama = BorsaUygulamasi(saglayici=TekrarSaglayici(sentetik=True, gecikme=gecikme), depo=BosDepo(),
+                               onbellek_dosyasi=str(tmp_path / "onbellek.json"),
+                               tasma_dosyasi=str(tmp_path / "tasma.jsonl"))
+    return BorsaServisi(uygulama, canli_aralik=0.2, isci=4)
+
+
+def _calistir(servis, senaryo):
+    async def ana():
+        async with TestClient(TestServer(servis.web_uygulamasi())) as istemci:
+            return await senaryo(istemci)
+    return asyncio.run(ana())
+
+
+def test_es_zamanli_istekler_tek_cagriya_iner(tmp_path):
+    servis = _servis(tmp_path, gecikme=0.2)
+
+    async def senaryo(istemci):
+        yanitlar = await asyncio.gather(*(istemci.get("/quote", params={"s": "A.IS"}) for _ in range(5)))
+        govdeler = [await y.json() for y in yanitlar]
+        bos = await istemci.get("/quote")
+        return govdeler, bos.status
+
+    govdeler, bos_durum = _calistir(servis, senaryo)
+    assert all(g == govdeler[0] for g in govdeler)
+    assert govdeler[0]["sonuc"]["A.IS"]["regularMarketPrice"] > 0
+    assert servis.uygulama.saglayici.cagri_sayisi == 1
+    assert servis.birlesen == 4
+    assert bos_durum == 400
+
+
+def test_gecmis_servis_saglayicisiyla_geri_kurulur(tmp_path):
+    servis = _servis(tmp_path)
+    yerel = TekrarSaglayici(sentetik=True)
+
+    async def senaryo(istemci):
+        adres = str(istemci.make_url("")).rstrip("/")
+        saglayici = ServisSaglayici(adres, zaman_asimi=10)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: saglayici.history("A.IS", period="5d", interval="5m"))
+
+    df = _calistir(servis, senaryo)
+    beklenen = yerel.history("A.IS", period="5d", interval="5m")
+    # ISO metni yalnız UTC farkını taşır; anlar ve değerler aynı kalır
+    assert (df.index == beklenen.index).all()
+    assert df.to_numpy() == pytest.approx(beklenen.to_numpy())
+    assert list(df.columns) == list(beklenen.columns)
+
+
+def test_websocket_abonelik_ve_hatali_mesaj(tmp_path):
+    servis = _servis(tmp_path)
+
+    async def senaryo(istemci):
+        async with istemci.ws_connect("/ws", params={"s": "A.IS"}) as ws:
+            tick = json.loads((await ws.receive(timeout=5)).data)
+            await ws.send_str("bozuk")
+            while True:
+                mesaj = json.loads((await ws.receive(timeout=5)).data)
+                if "hata" in mesaj:
+                    break
+            await ws.send_str(json.dumps({"cik": ["A.IS"]}))
+            await asyncio.sleep(0.05)
+            abone_sembol = servis.istatistik()['abone_sembol']
+        return tick, abone_sembol
+
+    tick, abone_sembol = _calistir(servis, senaryo)
+    assert tick['sembol'] == "A.IS" and tick['fiyat'] > 0
+    # Son abone çıkınca sembol yoklanmaz
+    assert abone_sembol == 0
@@ -0,0 +1,60 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from borsa_depolama import GomuluDepo
+from borsa_sikistirma import TickSikistirici, bar_araligi, hacim_artislari, tick_barlari
+
+
+def _ticklar(zamanlar, fiyatlar, hacimler):
+    return pd.DataFrame({"Price": fiyatlar, "Volume": hacimler}, index=pd.DatetimeIndex(zamanlar))
+
+
+def test_bar_hacmi_kumulatif_hacmin_artisidir():
+    bas = datetime(2026, 10, 16, 10, 0)
+    zamanlar = [bas + timedelta(seconds=20 * i) for i in range(6)]  # iki dakikalık bar
+    ticklar = _ticklar(zamanlar, [10, 11, 9, 10, 12, 11], [1000, 1100, 1250, 1300, 1300, 1450])
+    barlar = tick_barlari(ticklar, "min")
+    assert barlar["Volume"].tolist() == [250.0, 200.0]
+    assert barlar[["Open", "High", "Low", "Close"]].iloc[0].tolist() == [10, 11, 9, 9]
+    assert barlar["TickCount"].tolist() == [3, 3]
+
+
+def test_gun_basi_ve_hacimsiz_tickler():
+    zamanlar = [datetime(2026, 10, 15, 17, 59), datetime(2026, 10, 16, 10, 0),
+                datetime(2026, 10, 16, 10, 0, 30), datetime(2026, 10, 16, 10, 1)]
+    artis = hacim_artislari(pd.Series([5000.0, 200.0, np.nan, 260.0], index=pd.DatetimeIndex(zamanlar)))
+    # Yeni günün ilk tick'i önceki günün kümülatifinden fark almaz
+    assert artis.tolist() == [0.0, 0.0, 60.0]
+
+    barlar = tick_barlari(_ticklar(zamanlar[:1], [10.0], [np.nan]), "min")
+    assert np.isnan(barlar["Volume"].iloc[0])
+
+
+def test_sikistirma_hacmi_depoya_yazar(tmp_path):
+    depo = GomuluDepo(kok=str(tmp_path))
+    bas = datetime(2026, 10, 16, 11, 0)
+    # Saatin hemen öncesindeki tick, 11:00 barının ilk artışı için okunur
+    kayitlar = [("X", bas - timedelta(seconds=10), 10.0, 0.0, 900.0)]
+    kayitlar += [("X", bas + timedelta(seconds=15 * i), 10.0 + i, 0.0, 1000.0 + 50 * i) for i in range(8)]
+    depo.tickleri_kaydet(kayitlar)
+
+    TickSikistirici(depo, araliklar=("1m",)).sikistir()
+    barlar = depo.barlari_oku("X", bar_araligi("1m"), start=bas)
+    assert barlar["Volume"].tolist() == [250.0, 200.0]
+    depo.kapat()
+
+
+def test_eski_tick_tablosuna_hacim_sutunu_eklenir(tmp_path):
+    with sqlite3.connect(tmp_path / "borsa.sqlite") as baglanti:
+        baglanti.execute("CREATE TABLE live_ticks (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT, "
+                         "ts TEXT, price REAL, change_percent REAL)")
+        baglanti.execute("INSERT INTO live_ticks (symbol, ts, price, change_percent) "
+                         "VALUES ('X', '2026-10-16 10:00:00', 10.0, 0.0)")
+    depo = GomuluDepo(kok=str(tmp_path))
+    depo.tickleri_kaydet([("X", datetime(2026, 10, 16, 10, 0, 5), 10.5, 0.0, 300.0)])
+    ticklar = depo.tickleri_oku("X", datetime(2026, 10, 16), datetime(2026, 10, 17))
+    assert ticklar["Volume"].isna().tolist() == [True, False]
+    depo.kapat()
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from borsa_tarayici import TaramaHatasi, ifade_cevir, ozellikleri_hesapla, panel_olustur, tara
+
+SUTUNLAR = ("close", "volume", "ret_20d", "avg_volume_20", "rsi_14", "sector", "market_cap", "symbol")
+
+
+def test_okunabilir_ifade_ceviri():
+    assert (ifade_cevir("sector == Banks and 20d return > 5% and volume > 2x 20d avg", SUTUNLAR)
+            == "sector == 'Banks' and ret_20d > 5 and volume > 2 * avg_volume_20")
+    assert ifade_cevir("RSI < 30 or market cap >= 1.5B", SUTUNLAR) == "rsi_14 < 30 or market_cap >= 1500000000.0"
+    assert ifade_cevir("sector = Energy", SUTUNLAR) == "sector == 'Energy'"
+    assert ifade_cevir("symbol in [THYAO.IS, GARAN.IS]", SUTUNLAR) == "symbol in [ 'THYAO.IS' , 'GARAN.IS' ]"
+
+
+@pytest.mark.parametrize("ifade", [
+    "__import__('os').system('ls') > 0",
+    "close.__class__ > 1",
+    "close > 1; volume",
+    "close @ volume",
+    "bilinmeyen > 3",
+    "close > `volume`",
+    "",
+])
+def test_izin_verilmeyen_belirtecler_reddedilir(ifade):
+    with pytest.raises(TaramaHatasi):
+        ifade_cevir(ifade, SUTUNLAR)
+
+
+def _veriler():
+    index = pd.bdate_range("2025-01-01", periods=260)
+    veriler = {}
+    for i, sembol in enumerate(("A.IS", "B.IS", "C.IS")):
+        kapanis = 100 * (1 + 0.001 * (i - 1)) ** np.arange(260)
+        veriler[sembol] = pd.DataFrame({"Close": kapanis, "Volume": 1000.0 * (i + 1)}, index=index)
+    veriler["KISA.IS"] = veriler["A.IS"].tail(10)
+    veriler["BOS.IS"] = pd.DataFrame(columns=["Close", "Volume"])
+    return veriler
+
+
+def test_ozellikler_ve_tarama():
+    ozellikler = ozellikleri_hesapla(_veriler())
+    assert list(ozellikler.index) == ["A.IS", "B.IS", "C.IS", "KISA.IS"]
+    kapanis = _veriler()["C.IS"]["Close"]
+    assert ozellikler.loc["C.IS", "ret_20d"] == pytest.approx((kapanis.iloc[-1] / kapanis.iloc[-21] - 1) * 100)
+    # Penceresi dolmayan sembolün uzun vadeli özellikleri NaN
+    assert np.isnan(ozellikler.loc["KISA.IS", "ret_20d"]) and np.isnan(ozellikler.loc["KISA.IS", "rsi_14"])
+
+    meta = pd.DataFrame({"sector": ["Banks", "Energy", "Banks"]}, index=pd.Index(["A.IS", "B.IS", "C.IS"]))
+    panel = panel_olustur(ozellikler, meta)
+    assert panel.loc["A.IS", "rel_volume"] == pytest.approx(1.0)
+    sonuc = tara(panel, "sector == Banks", sirala="20d return", limit=1)
+    assert list(sonuc.index) == ["C.IS"]
+    # NaN anahtarlar sıralama yönünden bağımsız olarak sona düşer
+    assert list(tara(panel, sirala="ret_20d", artan=True).index) == ["A.IS", "B.IS", "C.IS", "KISA.IS"]
+    with pytest.raises(TaramaHatasi):
+        tara(panel, "close + 1")
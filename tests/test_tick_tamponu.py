@@ -0,0 +1,55 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from borsa_tick_tamponu import TickTamponu
+
+BAS = datetime(2026, 10, 16, 10, 0)
+
+
+def test_kayan_pencere_kaba_hesapla_ayni():
+    rng = random.Random(3)
+    tampon = TickTamponu(16)
+    fiyatlar, hacimler, kumulatif = [], [], 0
+    for i in range(100):  # halka birkaç kez döner
+        fiyat = round(100 + rng.gauss(0, 5), 2)
+        artis = rng.randrange(0, 50)
+        kumulatif += artis
+        tampon.ekle("A", BAS + timedelta(seconds=i), fiyat, kumulatif)
+        fiyatlar.append(fiyat)
+        hacimler.append(artis if i else 0)
+        pencere, hacim = fiyatlar[-16:], hacimler[-16:]
+        assert tampon.en_yuksek("A") == max(pencere)
+        assert tampon.en_dusuk("A") == min(pencere)
+        if sum(hacim):
+            assert tampon.vwap("A") == pytest.approx(sum(f * v for f, v in zip(pencere, hacim)) / sum(hacim))
+    assert tampon.tick_sayisi("A") == 16
+    assert tampon.son("A") == fiyatlar[-1]
+    assert tampon.ticklar("A")[1].tolist() == fiyatlar[-16:]
+
+
+def test_degisim_tampon_kapsamina_gore():
+    tampon = TickTamponu(8)
+    for i in range(12):
+        tampon.ekle("A", BAS + timedelta(seconds=10 * i), 100 + i)
+    # Son tick 110 s'de 111; 30 s önce (80 s) fiyat 108
+    assert tampon.degisim("A", 30) == pytest.approx((111 / 108 - 1) * 100)
+    # 100 s öncesi (10 s) halkadan düşmüştür
+    assert tampon.degisim("A", 100) is None
+    assert tampon.degisim("YOK", 30) is None
+
+
+def test_gun_degisiminde_hacim_sifirlanir_ve_ohlc():
+    tampon = TickTamponu()
+    tampon({'sembol': "A", 'zaman': BAS, 'fiyat': 10.0, 'hacim': 1000})
+    tampon({'sembol': "A", 'zaman': BAS + timedelta(seconds=30), 'fiyat': 12.0, 'hacim': 1100})
+    tampon({'sembol': "A", 'zaman': BAS + timedelta(seconds=70), 'fiyat': 11.0, 'hacim': 50})
+    tampon({'sembol': "A", 'zaman': BAS + timedelta(seconds=80), 'fiyat': None, 'hacim': 60})
+    barlar = tampon.ohlc("A", 60)
+    assert barlar["Open"].tolist() == [10.0, 11.0]
+    assert barlar["High"].tolist() == [12.0, 11.0]
+    # Kümülatif hacmin geriye gitmesi yeni gündür; o tick'in hacmi bilinmez
+    assert barlar["Volume"].tolist() == [100.0, 0.0]
+    assert barlar["TickCount"].tolist() == [2, 1]
+    assert tampon.ohlc("YOK").empty
@@ -0,0 +1,111 @@
+import json
+import os
+from datetime import datetime
+
+from borsa_tick_yazici import TickYazici
+
+ZAMAN = datetime(2026, 10, 16, 10, 0)
+
+
+class _Depo:
+    def __init__(self):
+        self.kayitlar = []
+        self.cagri = 0
+        self.kapali = False
+        self.hata_cagrisi = None  # bu sıradaki çağrı başarısız olur
+
+    def __call__(self, parti):
+        self.cagri += 1
+        if self.kapali or self.cagri == self.hata_cagrisi:
+            raise ConnectionError("depo kapalı")
+        self.kayitlar.extend(parti)
+
+
+def _semboller(depo):
+    return [k[0] for k in depo.kayitlar]
+
+
+def _yazici(depo, tmp_path, **secenekler):
+    # Büyük parti ve uzun aralık: arka plan iş parçacığı kapat() gelene kadar yazmaz
+    varsayilan = dict(max_kuyruk=3, parti_boyutu=1000, flush_araligi=60.0,
+                      tasma_dosyasi=str(tmp_path / "tasma" / "tick.jsonl"))
+    varsayilan.update(secenekler)
+    return TickYazici(depo, **varsayilan)
+
+
+def test_block_tum_tickleri_yazar(tmp_path):
+    depo = _Depo()
+    yazici = _yazici(depo, tmp_path, max_kuyruk=2, parti_boyutu=1, flush_araligi=0.01)
+    for i in range(20):
+        yazici.ekle(f"S{i}", 1.0, 0.0)
+    yazici.kapat()
+    assert _semboller(depo) == [f"S{i}" for i in range(20)]
+    assert yazici.atilan == 0
+
+
+def test_drop_oldest_en_eskiyi_atar(tmp_path):
+    depo = _Depo()
+    yazici = _yazici(depo, tmp_path, politika="drop_oldest")
+    for i in range(5):
+        yazici.ekle(f"S{i}", 1.0, 0.0)
+    yazici.kapat()
+    assert _semboller(depo) == ["S2", "S3", "S4"]
+    assert yazici.atilan == 2
+
+
+def test_spill_tasanlari_kapanista_geri_yukler(tmp_path):
+    depo = _Depo()
+    yazici = _yazici(depo, tmp_path, politika="spill")
+    for i in range(5):
+        yazici.ekle(f"S{i}", 1.0, 0.0)
+    assert yazici.tasan == 2
+    yazici.kapat()
+    assert sorted(_semboller(depo)) == [f"S{i}" for i in range(5)]
+    assert not os.path.exists(yazici.tasma_dosyasi)
+
+
+def _parti(adet, onek="S"):
+    return [(f"{onek}{i}", ZAMAN, 1.0, 0.0, 100.0 * i) for i in range(adet)]
+
+
+def test_depo_kapaliyken_geri_yukleme_ertelenir(tmp_path):
+    depo = _Depo()
+    yazici = _yazici(depo, tmp_path, politika="spill", ilk_bekleme=60.0)
+    depo.kapali = True
+    yazici._yaz(_parti(3))
+    assert yazici.tasan == 3
+    cagri = depo.cagri
+    yazici._tasmayi_geri_yukle()
+    assert depo.cagri == cagri  # geri çekilme süresinde dosyaya dokunulmaz
+
+    depo.kapali = False
+    yazici._yaz(_parti(1, "Y"))  # başarılı parti bekleme süresini sıfırlar
+    yazici._tasmayi_geri_yukle()
+    assert sorted(_semboller(depo)) == ["S0", "S1", "S2", "Y0"]
+    assert not os.path.exists(yazici.tasma_dosyasi)
+
+
+def test_yarida_kalan_geri_yukleme_yalnizca_yazilmayanlari_saklar(tmp_path):
+    depo = _Depo()
+    yazici = _yazici(depo, tmp_path, politika="spill", parti_boyutu=10, ilk_bekleme=0.0)
+    yazici._diske_tasir(_parti(45))
+    depo.hata_cagrisi = 3
+    yazici._tasmayi_geri_yukle()
+    assert len(depo.kayitlar) == 20
+    with open(yazici.tasma_dosyasi, encoding="utf-8") as f:
+        kalan = [json.loads(satir)[0] for satir in f]
+    assert kalan == [f"S{i}" for i in range(20, 45)]
+
+    yazici._tasmayi_geri_yukle()
+    assert _semboller(depo) == [f"S{i}" for i in range(45)]
+
+
+def test_hacimsiz_eski_tasma_satirlari_geri_yuklenir(tmp_path):
+    depo = _Depo()
+    yazici = _yazici(depo, tmp_path, politika="spill")
+    os.makedirs(os.path.dirname(yazici.tasma_dosyasi))
+    with open(yazici.tasma_dosyasi, "w", encoding="utf-8") as f:
+        f.write(json.dumps(["S0", ZAMAN.isoformat(), 1.0, 0.0]) + "\n")
+    yazici._diske_tasir(_parti(2)[1:])
+    yazici._tasmayi_geri_yukle()
+    assert depo.kayitlar == [("S0", ZAMAN, 1.0, 0.0, None), ("S1", ZAMAN, 1.0, 0.0, 100.0)]
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from borsa_projesi import BorsaUygulamasi
+from borsa_toplu_veri import TopluVeriCekici
+
+
+def test_semboller_paralel_cekilir_hatalar_ayrilir():
+    def cekici(sembol):
+        time.sleep(0.05)
+        if sembol == "HATA":
+            raise LookupError(sembol)
+        return sembol.lower()
+
+    toplu = TopluVeriCekici(cekici, max_isci=8)
+    try:
+        baslangic = time.perf_counter()
+        sonuclar, hatalar = toplu.getir(["A", "B", "HATA", "A", "C"])
+        sure = time.perf_counter() - baslangic
+    finally:
+        toplu.kapat()
+    assert sonuclar == {"A": "a", "B": "b", "C": "c"}
+    assert isinstance(hatalar["HATA"], LookupError)
+    assert sure < 0.15  # dört çağrı sırayla 0.2 sn sürerdi
+
+
+def test_kapat_is_parcaciklarini_durdurur():
+    onceki = set(threading.enumerate())
+    toplu = TopluVeriCekici(lambda s: s, max_isci=4)
+    toplu.getir(["A", "B"])
+    toplu.kapat()
+    assert not [t for t in threading.enumerate() if t not in onceki and t.name.startswith("toplu-veri")]
+
+
+class _Saglayici:
+    def info(self, sembol):
+        if sembol == "YENI.IS":
+            return {"regularMarketPrice": 5.0}  # longName, sector vb. yok
+        return {"longName": sembol, "sector": "Banka", "marketCap": 1,
+                "regularMarketPrice": 10.0, "regularMarketChangePercent": 1.5}
+
+
+def test_eksik_alanlar_hata_sayilmaz():
+    uygulama = BorsaUygulamasi(saglayici=_Saglayici())
+    try:
+        bilgiler = uygulama.hisse_bilgileri_toplu(["GARAN.IS", "YENI.IS"])
+    finally:
+        uygulama.kapat()
+    assert bilgiler["GARAN.IS"]["fiyat"] == 10.0
+    assert bilgiler["YENI.IS"] == {'isim': None, 'sektor': None, 'piyasa_degeri': None,
+                                   'fiyat': 5.0, 'değişim': None}
@@ -0,0 +1,141 @@
+import sqlite3
+import time
+
+import pytest
+
+from borsa_depolama import MySQLDepo
+from borsa_veritabani import BaglantiHavuzu, BaglantiYok, sqlite_havuzu
+
+
+def test_sql_hatasi_yeniden_denenmez_baglanti_korunur(tmp_path):
+    havuz = sqlite_havuzu(str(tmp_path / "t.db"), boyut=2)
+    deneme = []
+
+    def islem(imlec):
+        deneme.append(1)
+        imlec.execute("SELECT * FROM yok_tablo")
+
+    with pytest.raises(sqlite3.OperationalError):
+        havuz.calistir(islem)
+    assert len(deneme) == 1
+    assert havuz.istatistik()["atilan"] == 0
+    assert havuz.calistir(lambda imlec: imlec.execute("SELECT 1").fetchone()) == (1,)
+    havuz.kapat()
+
+
+def test_baglanamayinca_geri_cekilir_sonra_yeniden_baglanir(tmp_path):
+    yol = str(tmp_path / "t.db")
+    durum = {"kapali": True, "cagri": 0}
+
+    def fabrika():
+        durum["cagri"] += 1
+        if durum["kapali"]:
+            raise sqlite3.OperationalError("unable to open database file")
+        return sqlite3.connect(yol, check_same_thread=False)
+
+    havuz = BaglantiHavuzu(fabrika, ilk_bekleme=0.2, paramstyle="qmark")
+    with pytest.raises(sqlite3.OperationalError):
+        with havuz.baglanti():
+            pass
+    # Geri çekilme süresinde fabrika çağrılmadan hemen BaglantiYok döner
+    with pytest.raises(BaglantiYok):
+        with havuz.baglanti():
+            pass
+    assert durum["cagri"] == 1
+    assert not havuz.kullanilabilir()
+
+    durum["kapali"] = False
+    time.sleep(0.3)
+    assert havuz.isit()
+    assert havuz.istatistik()["yeniden_baglanma"] == 1
+    assert havuz.istatistik()["ardisik_hata"] == 0
+
+
+def test_kopmus_bosta_baglanti_atilir(tmp_path):
+    havuz = sqlite_havuzu(str(tmp_path / "t.db"), boyut=1)
+    havuz.saglik_araligi = 0.0
+    with havuz.baglanti() as baglanti:
+        ilk = baglanti
+    ilk.close()
+    with havuz.baglanti() as baglanti:
+        assert baglanti is not ilk
+        baglanti.execute("SELECT 1")
+    assert havuz.istatistik()["atilan"] == 1
+    assert havuz.istatistik()["acilan"] == 2
+
+
+def test_kurulum_hatasinda_baglanti_kapatilir_sonraki_baglantida_yenilenir():
+    acilanlar = []
+    kurulum_hatasi = [True]
+
+    def fabrika():
+        baglanti = sqlite3.connect(":memory:", check_same_thread=False)
+        acilanlar.append(baglanti)
+        return baglanti
+
+    def kurulum(baglanti):
+        if kurulum_hatasi.pop(0) if kurulum_hatasi else False:
+            raise sqlite3.OperationalError("database is locked")
+        baglanti.execute("CREATE TABLE t (x INTEGER)")
+
+    havuz = BaglantiHavuzu(fabrika, kurulum=kurulum, paramstyle="qmark")
+    with pytest.raises(sqlite3.OperationalError):
+        with havuz.baglanti():
+            pass
+    with pytest.raises(sqlite3.ProgrammingError):
+        acilanlar[0].execute("SELECT 1")
+    with havuz.baglanti() as baglanti:
+        baglanti.execute("SELECT * FROM t")
+    assert len(acilanlar) == 2
+
+
+class _SahteImlec:
+    def __init__(self, baglanti):
+        self.baglanti = baglanti
+
+    def execute(self, sorgu, parametreler=None):
+        if self.baglanti.hata:
+            raise ConnectionError("Lost connection to MySQL server")
+        self.baglanti.sorgular.append(" ".join(sorgu.split()))
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class _SahteBaglanti:
+    def __init__(self, hata):
+        self.hata = hata
+        self.sorgular = []
+
+    def cursor(self):
+        return _SahteImlec(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _SahteMySQLDepo(MySQLDepo):
+    def __init__(self, fabrika):
+        # mysql_havuzu yerine aynı kurulumla sahte bağlantı veren havuz
+        super().__init__(db=BaglantiHavuzu(fabrika, kurulum=self._ensure_tables))
+
+
+def test_mysql_tablo_kurulumu_basarisizsa_yeniden_denenir():
+    hatalar = [True, False]
+    baglantilar = []
+
+    def fabrika():
+        baglantilar.append(_SahteBaglanti(hatalar.pop(0) if hatalar else False))
+        return baglantilar[-1]
+
+    depo = _SahteMySQLDepo(fabrika)  # açılıştaki ısıtma kurulumda kopar
+    assert not baglantilar[0].sorgular
+    assert depo.db.isit()
+    assert len(baglantilar) == 2
+    assert any(s.startswith("CREATE TABLE IF NOT EXISTS symbols") for s in baglantilar[1].sorgular)